@@ -0,0 +1,372 @@
+"""TradeBatch class for holding many trades as columns of NumPy arrays.
+
+This module defines the `TradeBatch` class, a struct-of-arrays alternative to a list of trade entry
+objects. Every field is one typed NumPy array over all trades: ids and dates as integers and
+datetime64, amounts as float64, the enum fields as small integer codes, and the text fields
+(symbol, brokerage, account) as codes into a list of distinct labels. Strategies, a list per trade,
+are stored in compressed sparse row form. A batch converts to and from entry objects, so code that
+works on entries keeps working.
+
+Amounts that don't apply to a trade type are 0.0 (e.g. price_per_share of a dividend), the
+expiration date of non-option trades is NaT, and their option type code is `NO_OPTION_TYPE`.
+
+Classes:
+    TradeBatch: Trades stored as typed NumPy arrays with integer-coded enums and interned labels.
+"""
+from itertools import chain
+from typing import (
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+)
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_entry import TradeEntry
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.utilities.gc_pause import paused_gc
+
+# Enum members by code, the code of a member is its position in the enum
+SECURITY_TYPES: Tuple[SecurityType, ...] = tuple(SecurityType)
+ACTIONS: Tuple[Action, ...] = tuple(Action)
+SUB_ACTIONS: Tuple[SubAction, ...] = tuple(SubAction)
+OPTION_TYPES: Tuple[OptionType, ...] = tuple(OptionType)
+
+# Option type code of trades that are not options
+NO_OPTION_TYPE = -1
+
+# Entry class for each security type
+_ENTRY_CLASSES: Dict[SecurityType, Type[TradeEntry]] = {
+    SecurityType.STOCK: StockEntry,
+    SecurityType.ETF: StockEntry,
+    SecurityType.DIVIDEND: DividendEntry,
+    SecurityType.OPTION: OptionEntry,
+}
+
+
+def _codes_of(
+    members: Sequence
+) -> Dict:
+    """Returns the code of each enum member, keyed by member and by value."""
+    codes = {member: code for code, member in enumerate(members)}
+    codes.update({member.value: code for code, member in enumerate(members)})
+    return codes
+
+
+def _factorize(
+    values: Sequence[str]
+) -> Tuple[np.ndarray, List[str]]:
+    """Interns text values as int32 codes into a list of labels in order of first appearance."""
+    codes, labels = pd.factorize(pd.Series(values, dtype=object), sort=False)
+    return codes.astype(np.int32), [str(label) for label in labels]
+
+
+def _strategy_csr(
+    strategies: Sequence[List[str]]
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Stores a list of strategies per trade in compressed sparse row form.
+
+    Args:
+        strategies (Sequence[List[str]]): Strategy list of each trade.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, List[str]]: Row offsets (n + 1), strategy codes of all rows, and the
+            strategy labels.
+    """
+    indptr = np.zeros(len(strategies) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, strategies), dtype=np.int64, count=len(strategies)), out=indptr[1:])
+    indices, labels = _factorize(list(chain.from_iterable(strategies)))
+
+    return indptr, indices, labels
+
+
+class TradeBatch(BaseModel):
+    """Trades stored as typed NumPy arrays, one array per field.
+
+    Attributes:
+        trade_id (np.ndarray): int64 trade ids.
+        strategy_id (np.ndarray): int64 strategy ids.
+        brokerage_codes (np.ndarray): int32 codes into `brokerages`.
+        brokerages (List[str]): Distinct brokerages.
+        account_codes (np.ndarray): int32 codes into `accounts`.
+        accounts (List[str]): Distinct accounts.
+        strategy_indptr (np.ndarray): int64 offsets, the strategies of trade i are
+            `strategy_indices[strategy_indptr[i]:strategy_indptr[i + 1]]`.
+        strategy_indices (np.ndarray): int32 codes into `strategies`.
+        strategies (List[str]): Distinct strategies.
+        security (np.ndarray): int8 codes into `SECURITY_TYPES`.
+        trade_date (np.ndarray): datetime64[D] trade dates.
+        symbol_codes (np.ndarray): int32 codes into `symbols`.
+        symbols (List[str]): Distinct symbols in order of first appearance.
+        action (np.ndarray): int8 codes into `ACTIONS`.
+        sub_action (np.ndarray): int8 codes into `SUB_ACTIONS`.
+        quantity (np.ndarray): float64 quantities.
+        fees (np.ndarray): float64 fees.
+        price_per_share (np.ndarray): float64 share prices, 0.0 for trades without one.
+        dividend_amount (np.ndarray): float64 dividend amounts, 0.0 for trades without one.
+        expiration_date (np.ndarray): datetime64[D] expiration dates, NaT for trades without one.
+        strike (np.ndarray): float64 strikes, 0.0 for trades without one.
+        premium (np.ndarray): float64 premiums, 0.0 for trades without one.
+        option_type (np.ndarray): int8 codes into `OPTION_TYPES`, `NO_OPTION_TYPE` for trades that are not options.
+    """
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True,  # NumPy arrays
+        frozen=True,
+    )
+
+    trade_id: np.ndarray
+    strategy_id: np.ndarray
+    brokerage_codes: np.ndarray
+    brokerages: List[str]
+    account_codes: np.ndarray
+    accounts: List[str]
+    strategy_indptr: np.ndarray
+    strategy_indices: np.ndarray
+    strategies: List[str]
+    security: np.ndarray
+    trade_date: np.ndarray
+    symbol_codes: np.ndarray
+    symbols: List[str]
+    action: np.ndarray
+    sub_action: np.ndarray
+    quantity: np.ndarray
+    fees: np.ndarray
+    price_per_share: np.ndarray
+    dividend_amount: np.ndarray
+    expiration_date: np.ndarray
+    strike: np.ndarray
+    premium: np.ndarray
+    option_type: np.ndarray
+
+    def __len__(self) -> int:
+        """Returns the number of trades in the batch."""
+        return len(self.trade_id)
+
+    @classmethod
+    def from_entries(
+        cls,
+        trades: Sequence[Union[StockEntry, DividendEntry, OptionEntry]]
+    ) -> "TradeBatch":
+        """Builds a batch from trade entry objects.
+
+        Args:
+            trades (Sequence[Union[StockEntry, DividendEntry, OptionEntry]]): Trade entries.
+
+        Returns:
+            TradeBatch: The trades in the same order.
+        """
+        security_codes = _codes_of(SECURITY_TYPES)
+        action_codes = _codes_of(ACTIONS)
+        sub_action_codes = _codes_of(SUB_ACTIONS)
+        option_type_codes = _codes_of(OPTION_TYPES)
+        count = len(trades)
+
+        # Read the field values directly, getattr on a field the entry type lacks is slow in pydantic
+        records = [trade.__dict__ for trade in trades]
+
+        def values(field, default=None):
+            return [record.get(field, default) for record in records]
+
+        def column(field, dtype, default=None):
+            return np.array(values(field, default), dtype=dtype)
+
+        def codes(field, members):
+            return np.fromiter(map(members.__getitem__, values(field)), dtype=np.int8, count=count)
+
+        brokerage_codes, brokerages = _factorize(values("brokerage"))
+        account_codes, accounts = _factorize(values("account"))
+        symbol_codes, symbols = _factorize(values("symbol"))
+        strategy_indptr, strategy_indices, strategies = _strategy_csr(values("strategy"))
+
+        option_type_codes[None] = NO_OPTION_TYPE
+
+        return cls(
+            trade_id=column("trade_id", np.int64),
+            strategy_id=column("strategy_id", np.int64),
+            brokerage_codes=brokerage_codes,
+            brokerages=brokerages,
+            account_codes=account_codes,
+            accounts=accounts,
+            strategy_indptr=strategy_indptr,
+            strategy_indices=strategy_indices,
+            strategies=strategies,
+            security=codes("security", security_codes),
+            trade_date=column("trade_date", "datetime64[D]"),
+            symbol_codes=symbol_codes,
+            symbols=symbols,
+            action=codes("action", action_codes),
+            sub_action=codes("sub_action", sub_action_codes),
+            quantity=column("quantity", np.float64),
+            fees=column("fees", np.float64),
+            price_per_share=column("price_per_share", np.float64, 0.0),
+            dividend_amount=column("dividend_amount", np.float64, 0.0),
+            expiration_date=column("expiration_date", "datetime64[D]"),
+            strike=column("strike", np.float64, 0.0),
+            premium=column("premium", np.float64, 0.0),
+            option_type=codes("option_type", option_type_codes),
+        )
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pd.DataFrame
+    ) -> "TradeBatch":
+        """Builds a batch from a normalized trade frame without creating entry objects.
+
+        The frame must have the layout returned by `parse_trade_frame`: one row per valid trade,
+        enum values as strings, and the strategy as a normalized comma-joined string.
+
+        Args:
+            frame (pd.DataFrame): Normalized frame of valid trades.
+
+        Returns:
+            TradeBatch: The trades in frame order.
+        """
+        def codes(column, members, missing=None):
+            mapped = frame[column].map(_codes_of(members))
+            if missing is not None:
+                mapped = mapped.fillna(missing)
+            return mapped.to_numpy(dtype=np.int8)
+
+        def amounts(column):
+            return frame[column].fillna(0.0).to_numpy(dtype=np.float64)
+
+        def dates(column):
+            return frame[column].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+
+        brokerage_codes, brokerages = _factorize(frame["brokerage"].tolist())
+        account_codes, accounts = _factorize(frame["account"].tolist())
+        symbol_codes, symbols = _factorize(frame["symbol"].tolist())
+
+        # Split each distinct strategy string once
+        strategy_codes, strategy_texts = pd.factorize(frame["strategy"], sort=False)
+        split = [text.split(",") if text else [] for text in strategy_texts]
+        strategy_indptr, strategy_indices, strategies = _strategy_csr([split[code] for code in strategy_codes])
+
+        return cls(
+            trade_id=frame["trade_id"].to_numpy(dtype=np.int64),
+            strategy_id=frame["strategy_id"].to_numpy(dtype=np.int64),
+            brokerage_codes=brokerage_codes,
+            brokerages=brokerages,
+            account_codes=account_codes,
+            accounts=accounts,
+            strategy_indptr=strategy_indptr,
+            strategy_indices=strategy_indices,
+            strategies=strategies,
+            security=codes("security", SECURITY_TYPES),
+            trade_date=dates("trade_date"),
+            symbol_codes=symbol_codes,
+            symbols=symbols,
+            action=codes("action", ACTIONS),
+            sub_action=codes("sub_action", SUB_ACTIONS),
+            quantity=frame["quantity"].to_numpy(dtype=np.float64),
+            fees=frame["fees"].to_numpy(dtype=np.float64),
+            price_per_share=amounts("price_per_share"),
+            dividend_amount=amounts("dividend_amount"),
+            expiration_date=dates("expiration_date"),
+            strike=amounts("strike"),
+            premium=amounts("premium"),
+            option_type=codes("option_type", OPTION_TYPES, NO_OPTION_TYPE),
+        )
+
+    def take(
+        self,
+        indices: np.ndarray
+    ) -> "TradeBatch":
+        """Returns a batch with the trades at the given positions.
+
+        The label lists are shared with this batch, so codes keep their meaning.
+
+        Args:
+            indices (np.ndarray): Integer positions or a boolean mask.
+
+        Returns:
+            TradeBatch: The selected trades in the order of `indices`.
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+
+        # Gather the strategy rows of the selected trades
+        starts = self.strategy_indptr[indices]
+        lengths = self.strategy_indptr[indices + 1] - starts
+        strategy_indptr = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=strategy_indptr[1:])
+        positions = np.repeat(starts - strategy_indptr[:-1], lengths) + np.arange(strategy_indptr[-1])
+
+        fields = {
+            name: value[indices] if isinstance(value, np.ndarray) else value
+            for name, value in self.__dict__.items()
+        }
+        fields["strategy_indptr"] = strategy_indptr
+        fields["strategy_indices"] = self.strategy_indices[positions]
+
+        return type(self)(**fields)
+
+    def to_entries(self) -> List[Union[StockEntry, DividendEntry, OptionEntry]]:
+        """Builds trade entry objects from the batch.
+
+        The batch only holds values that passed entry validation, so the entries are created with
+        `TradeEntry.from_trusted_records`.
+
+        Returns:
+            List[Union[StockEntry, DividendEntry, OptionEntry]]: Trade entries in batch order.
+        """
+        if len(self) == 0:
+            return []
+
+        with paused_gc():
+            strategies = np.array(self.strategies, dtype=object)[self.strategy_indices].tolist()
+            indptr = self.strategy_indptr.tolist()
+            columns = {
+                "trade_id": self.trade_id.tolist(),
+                "strategy_id": self.strategy_id.tolist(),
+                "brokerage": np.array(self.brokerages, dtype=object)[self.brokerage_codes].tolist(),
+                "account": np.array(self.accounts, dtype=object)[self.account_codes].tolist(),
+                "strategy": [strategies[start:end] for start, end in zip(indptr[:-1], indptr[1:])],
+                "security": np.array(SECURITY_TYPES, dtype=object)[self.security].tolist(),
+                "trade_date": self.trade_date.tolist(),
+                "symbol": np.array(self.symbols, dtype=object)[self.symbol_codes].tolist(),
+                "action": np.array(ACTIONS, dtype=object)[self.action].tolist(),
+                "sub_action": np.array(SUB_ACTIONS, dtype=object)[self.sub_action].tolist(),
+                "quantity": self.quantity.tolist(),
+                "fees": self.fees.tolist(),
+                "price_per_share": self.price_per_share.tolist(),
+                "dividend_amount": self.dividend_amount.tolist(),
+                "expiration_date": self.expiration_date.tolist(),
+                "strike": self.strike.tolist(),
+                "premium": self.premium.tolist(),
+                # The extra None is picked by NO_OPTION_TYPE (-1)
+                "option_type": np.array(OPTION_TYPES + (None,), dtype=object)[self.option_type].tolist(),
+            }
+
+            # Build each entry type in one batch, then put the entries back in batch order
+            entry_classes = np.array([_ENTRY_CLASSES[security] for security in SECURITY_TYPES], dtype=object)
+            trade_classes = entry_classes[self.security]
+            trades: List[Union[StockEntry, DividendEntry, OptionEntry]] = [None] * len(self)
+            for entry_class in (StockEntry, DividendEntry, OptionEntry):
+                positions = np.flatnonzero(trade_classes == entry_class).tolist()
+                if not positions:
+                    continue
+
+                fields = list(entry_class.model_fields)
+                values = [[columns[field][position] for position in positions] for field in fields]
+                records = [dict(zip(fields, row)) for row in zip(*values)]
+                for position, trade in zip(positions, entry_class.from_trusted_records(records)):
+                    trades[position] = trade
+
+        return trades
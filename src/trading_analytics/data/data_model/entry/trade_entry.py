@@ -5,10 +5,19 @@ It includes fields for trade identification, strategy, security type, and other
 ensure data integrity and normalization. The class supports various security types (e.g., STOCK, ETF, DIVIDEND, OPTION)
 and trade actions, with specific validation logic to enforce valid combinations.
 
+Trades coming back from a known-good store (our own cache or database) were validated when they were
+first written. `TradeEntry.from_trusted` rebuilds them without running the validators; set the
+environment variable TRADING_ANALYTICS_VALIDATE_TRUSTED=1 (or call `set_trusted_validation(True)`)
+to validate them anyway while debugging.
+
 Classes:
     TradeEntry: A Pydantic model representing a trade entry with validation for fields like brokerage, account, strategy,
                 security type, trade date, symbol, action, sub-action, quantity, and fees.
+
+Functions:
+    set_trusted_validation: turns full validation of trusted entries on or off.
 """
+import os
 from datetime import (
     date,
     datetime,
@@ -20,6 +29,9 @@ from pydantic import (
     model_validator,
 )
 from typing import (
+    Any,
+    Dict,
+    Iterable,
     Union,
     List,
     Optional,
@@ -29,6 +41,32 @@ from trading_analytics.data.enum.security_type import SecurityType
 from trading_analytics.data.enum.trade_action import Action
 from trading_analytics.data.enum.sub_action import SubAction
 from trading_analytics.data.data_model.market.stock_data import CurrentStockData
+from trading_analytics.utilities.gc_pause import paused_gc
+
+# Define mapping of actions to type
+VALID_ACTION_MAP = {
+    SecurityType.STOCK: frozenset({Action.BUY, Action.SELL}),
+    SecurityType.ETF: frozenset({Action.BUY, Action.SELL}),
+    SecurityType.DIVIDEND: frozenset({Action.DIVIDEND}),
+    SecurityType.OPTION: frozenset({Action.BUY,
+                                    Action.OPTION_ASSIGNED, Action.OPTION_EXPIRED, Action.OPTION_EXERCISED,
+                                    Action.SELL})
+}
+
+# Debug switch for TradeEntry.from_trusted
+_validate_trusted = os.environ.get("TRADING_ANALYTICS_VALIDATE_TRUSTED", "0") not in ("", "0")
+
+
+def set_trusted_validation(
+    enabled: bool
+) -> None:
+    """Turns full validation of trusted entries on or off.
+
+    Args:
+        enabled (bool): If True, `TradeEntry.from_trusted` runs every validator like the normal constructor.
+    """
+    global _validate_trusted
+    _validate_trusted = enabled
 
 
 class TradeEntry(BaseModel):
@@ -60,6 +98,70 @@ class TradeEntry(BaseModel):
     quantity: float = Field(ge=0, frozen=True)
     fees: float = Field(ge=0, frozen=True)
 
+    @classmethod
+    def from_trusted(
+        cls,
+        data: Dict[str, Any]
+    ) -> "TradeEntry":
+        """Builds an entry from already-validated data without running the validators.
+
+        Only use this for data from a known-good store, e.g. trades read back from our own cache or
+        database that were validated when they were first written. `data` must hold every field of
+        the class, already in its final type (enums, `date`, `List[str]`, ...). The dict is used as the
+        entry's storage, so don't modify it afterwards.
+
+        When trusted validation is turned on (see `set_trusted_validation`), the normal constructor is
+        used instead and invalid data raises.
+
+        Args:
+            data (Dict[str, Any]): Field values by field name.
+
+        Returns:
+            TradeEntry: The entry, as an instance of the class this is called on.
+
+        Raises:
+            ValidationError: Only when trusted validation is turned on and the data is invalid.
+        """
+        return cls.from_trusted_records([data])[0]
+
+    @classmethod
+    def from_trusted_records(
+        cls,
+        records: Iterable[Dict[str, Any]]
+    ) -> List["TradeEntry"]:
+        """Builds entries from already-validated records without running the validators.
+
+        Same as `from_trusted` for many records at once.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Field values by field name, one dict per entry.
+
+        Returns:
+            List[TradeEntry]: The entries, as instances of the class this is called on.
+
+        Raises:
+            ValidationError: Only when trusted validation is turned on and a record is invalid.
+        """
+        if _validate_trusted:
+            return [cls(**record) for record in records]
+
+        # Every field is set, so the entries can share one fields set (adding to it is always a no-op)
+        fields_set = set(cls.model_fields)
+        new = cls.__new__
+        set_attribute = object.__setattr__
+        entries = []
+
+        with paused_gc():
+            for record in records:
+                entry = new(cls)
+                set_attribute(entry, "__dict__", record)
+                set_attribute(entry, "__pydantic_fields_set__", fields_set)
+                set_attribute(entry, "__pydantic_extra__", None)
+                set_attribute(entry, "__pydantic_private__", None)
+                entries.append(entry)
+
+        return entries
+
     # Process STOCK or ETF trades with BUY action
     @property
     def is_bought_stock_etf(self) -> bool:
@@ -322,7 +424,7 @@ class TradeEntry(BaseModel):
         raise ValueError(f"Trade sub action '{value}' is and invalid data type for trade sub action.")
 
     # Model Validator for mapping type to action
-    # Defines a valid_action_map mapping type to action
+    # Uses VALID_ACTION_MAP mapping type to action
     @model_validator(mode='after')
     def validate_action_type(self):
         """Ensures trade actions are valid for the specified trade type.
@@ -338,19 +440,9 @@ class TradeEntry(BaseModel):
         action = self.action
         security = self.security
 
-        # Define mapping of actions to type
-        valid_action_map = {
-            SecurityType.STOCK: {Action.BUY, Action.SELL},
-            SecurityType.ETF: {Action.BUY, Action.SELL},
-            SecurityType.DIVIDEND: {Action.DIVIDEND},
-            SecurityType.OPTION: {Action.BUY,
-                                  Action.OPTION_ASSIGNED, Action.OPTION_EXPIRED, Action.OPTION_EXERCISED,
-                                  Action.SELL}
-        }
-
-        valid_actions = valid_action_map.get(security, set())
+        valid_actions = VALID_ACTION_MAP.get(security, frozenset())
         if action not in valid_actions:
-            raise ValueError(f"Action '{action}' is not valid for security type, '{security}'. Valid actions: {valid_actions}")
+            raise ValueError(f"Action '{action}' is not valid for security type, '{security}'. Valid actions: {set(valid_actions)}")
 
         return self
 
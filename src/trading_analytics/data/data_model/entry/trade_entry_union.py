@@ -0,0 +1,236 @@
+"""Bulk validation of trade records through a discriminated union.
+
+This module defines `TradeEntryUnion`, a union of `StockEntry`, `DividendEntry`, and `OptionEntry`
+discriminated on the `security` field, and a `TypeAdapter` over a list of it. A whole list of
+dicts is validated in one pydantic-core call instead of one constructor call per trade. Before
+validation, the normalisation that has to be custom Python (brokerage upper-casing, strategy
+splitting, date parsing, enum lookups) is done once per distinct value of each column, so the
+per-field validators only see values that are already in their final form and take their fast
+paths.
+
+Functions:
+    normalize_strategy_column: normalizes strategy descriptions for a whole column at once.
+    validate_trade_records: validates a list of dicts into trade entries in one call.
+"""
+from datetime import datetime
+from enum import Enum
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+from pydantic import (
+    Discriminator,
+    Tag,
+    TypeAdapter,
+)
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+
+# Union tag for each security type
+_SECURITY_TAGS = {
+    SecurityType.STOCK.value: "stock",
+    SecurityType.ETF.value: "stock",
+    SecurityType.DIVIDEND.value: "dividend",
+    SecurityType.OPTION.value: "option",
+}
+
+# Enum fields that are looked up once per column
+_ENUM_FIELDS = {
+    "security": SecurityType,
+    "action": Action,
+    "sub_action": SubAction,
+    "option_type": OptionType,
+}
+
+
+def _security_tag(
+    value: Any
+) -> Optional[str]:
+    """Returns the union tag for a record or entry based on its security type.
+
+    Args:
+        value: A dict of trade fields or a trade entry.
+
+    Returns:
+        Optional[str]: 'stock', 'dividend', or 'option', or None if the security type is unknown.
+    """
+    if isinstance(value, dict):
+        security = value.get("security")
+    else:
+        security = getattr(value, "security", None)
+
+    # Normalized records hold SecurityType members, which hash and compare like their values
+    if not isinstance(security, str):
+        return None
+    tag = _SECURITY_TAGS.get(security)
+
+    return tag if tag is not None else _SECURITY_TAGS.get(security.upper())
+
+
+TradeEntryUnion = Annotated[
+    Union[
+        Annotated[StockEntry, Tag("stock")],
+        Annotated[DividendEntry, Tag("dividend")],
+        Annotated[OptionEntry, Tag("option")],
+    ],
+    Discriminator(
+        _security_tag,
+        custom_error_type="security_type",
+        custom_error_message="Security type must be STOCK, ETF, DIVIDEND, or OPTION",
+    ),
+]
+
+TRADE_ENTRY_LIST_ADAPTER = TypeAdapter(List[TradeEntryUnion])
+
+
+def normalize_strategy_column(
+    series: pd.Series
+) -> pd.Series:
+    """Normalizes strategy descriptions like `TradeEntry.parse_and_normalize_strategy`, for a whole column.
+
+    The result is a comma-joined string (lowercase, stripped, no empty items), which can be split
+    into the strategy list with `str.split(',')`.
+
+    Args:
+        series (pd.Series): Strategy descriptions as strings.
+
+    Returns:
+        pd.Series: Normalized comma-joined strategies.
+    """
+    return (
+        series.str.lower()
+        .str.replace(r"\s*,\s*", ",", regex=True)
+        .str.strip()
+        .str.replace(r",{2,}", ",", regex=True)
+        .str.strip(",")
+    )
+
+
+def _normalize_text_column(
+    values: List[Any],
+    normalize: Callable[[pd.Series], pd.Series]
+) -> List[Any]:
+    """Applies a string normalization to the distinct text values of a column.
+
+    Journal columns like brokerage, strategy, and the enum fields only have a handful of distinct
+    values, so the column is factorized and each distinct string is normalized once. Non-string
+    values are left unchanged so validation reports them as usual.
+
+    Args:
+        values (List[Any]): Column values.
+        normalize (Callable[[pd.Series], pd.Series]): Normalization applied to a Series of distinct strings.
+
+    Returns:
+        List[Any]: Normalized column values.
+    """
+    column = pd.Series(values, dtype=object)
+    is_text = (column.map(type) == str).to_numpy()
+    if not is_text.any():
+        return values
+
+    codes, uniques = pd.factorize(column[is_text])
+    normalized = np.empty(len(uniques), dtype=object)
+    for index, value in enumerate(normalize(pd.Series(uniques, dtype=object))):
+        normalized[index] = value
+    result = column.to_numpy(dtype=object, copy=True)
+    result[is_text] = normalized[codes]
+
+    return result.tolist()
+
+
+def _split_strategy(
+    series: pd.Series
+) -> pd.Series:
+    """Normalizes strategy strings and splits them into lists."""
+    return normalize_strategy_column(series).map(lambda strategy: strategy.split(",") if strategy else [])
+
+
+def _parse_date(
+    value: str
+) -> Any:
+    """Parses a 'YYYY-MM-DD' string like the entry date validators, other strings are returned unchanged."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return value
+
+
+def _enum_lookup(
+    enum: Type[Enum]
+) -> Callable[[pd.Series], pd.Series]:
+    """Returns a normalization that maps strings to enum members, case-insensitively."""
+    members = {member.value: member for member in enum}
+
+    def lookup(series: pd.Series) -> pd.Series:
+        found = series.str.upper().map(members)
+        return found.where(found.notna(), series)
+
+    return lookup
+
+
+def _normalize_columns(
+    records: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Normalizes the record fields that need custom Python, one column at a time.
+
+    Args:
+        records (List[Dict[str, Any]]): Trade records.
+
+    Returns:
+        List[Dict[str, Any]]: New records with normalized brokerage, strategy, date, and enum fields.
+    """
+    normalizations: Dict[str, Callable[[pd.Series], pd.Series]] = {
+        "brokerage": lambda series: series.str.upper(),
+        "strategy": _split_strategy,
+        "trade_date": lambda series: series.map(_parse_date),
+        "expiration_date": lambda series: series.map(_parse_date),
+    }
+    for field, enum in _ENUM_FIELDS.items():
+        normalizations[field] = _enum_lookup(enum)
+
+    normalized_records = [dict(record) for record in records]
+    for field, normalize in normalizations.items():
+        values = _normalize_text_column([record.get(field) for record in records], normalize)
+        for record, value in zip(normalized_records, values):
+            if field in record:
+                record[field] = value
+
+    return normalized_records
+
+
+def validate_trade_records(
+    records: List[Dict[str, Any]]
+) -> List[Union[StockEntry, DividendEntry, OptionEntry]]:
+    """Validates a list of trade records into trade entries in one pydantic-core call.
+
+    Each record is dispatched on its `security` field: STOCK and ETF become `StockEntry`, DIVIDEND
+    becomes `DividendEntry`, and OPTION becomes `OptionEntry`.
+
+    Args:
+        records (List[Dict[str, Any]]): Trade records with the entry field names (trade_id, security, ...).
+
+    Returns:
+        List[Union[StockEntry, DividendEntry, OptionEntry]]: Validated trade entries in record order.
+
+    Raises:
+        ValidationError: If any record is invalid. Errors are located by record index and field.
+    """
+    if not records:
+        return []
+
+    return TRADE_ENTRY_LIST_ADAPTER.validate_python(_normalize_columns(records))
@@ -0,0 +1,31 @@
+"""ContractStatus enumeration for the lifecycle state of an option contract.
+
+This module defines the `ContractStatus` enumeration, which specifies where an option contract is in
+its lifecycle using Python's `Enum` class.
+
+Classes:
+    ContractStatus: A string-based enumeration for option contract states (OPEN, CLOSED, EXPIRED, ASSIGNED,
+        EXERCISED, UNMATCHED).
+"""
+from enum import Enum
+
+# Enum for option contract states
+class ContractStatus(str, Enum):
+    """Enum class for option contract states.
+
+    A contract that was ended by several kinds of trades takes the state of the last one.
+
+    Attributes:
+        OPEN (str): Some contracts are still open.
+        CLOSED (str): All contracts were closed by an offsetting trade.
+        EXPIRED (str): The last contracts expired.
+        ASSIGNED (str): The last contracts were assigned.
+        EXERCISED (str): The last contracts were exercised.
+        UNMATCHED (str): More contracts were closed than opened.
+    """
+    OPEN = 'OPEN'
+    CLOSED = 'CLOSED'
+    EXPIRED = 'EXPIRED'
+    ASSIGNED = 'ASSIGNED'
+    EXERCISED = 'EXERCISED'
+    UNMATCHED = 'UNMATCHED'
@@ -0,0 +1,22 @@
+"""CostBasisMethod enumeration for valid lot matching methods.
+
+This module defines the `CostBasisMethod` enumeration, which specifies how shares that are sold or
+assigned away are matched against open lots using Python's `Enum` class.
+
+Classes:
+    CostBasisMethod: A string-based enumeration for lot matching methods (FIFO, LIFO, SPECIFIC_ID).
+"""
+from enum import Enum
+
+# Enum for valid lot matching methods
+class CostBasisMethod(str, Enum):
+    """Enum class for valid lot matching methods.
+
+    Attributes:
+        FIFO (str): Oldest open lots are closed first.
+        LIFO (str): Newest open lots are closed first.
+        SPECIFIC_ID (str): Lots chosen per closing trade are closed, remaining shares are closed FIFO.
+    """
+    FIFO = "FIFO"
+    LIFO = "LIFO"
+    SPECIFIC_ID = "SPECIFIC_ID"
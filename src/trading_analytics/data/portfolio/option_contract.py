@@ -0,0 +1,52 @@
+"""OptionContract class for representing the lifecycle of one option contract.
+
+This module defines the `OptionContract` class, a Pydantic model that represents the trades of one
+option contract (symbol, option type, strike, expiration date, and account) from opening to closing,
+with its realized profit, holding period, and status. It also defines the constants shared by the
+option calculations: the shares per contract and the tolerance below which a contract quantity is zero.
+
+Classes:
+    OptionContract: A model for the lifecycle and profit of one option contract.
+"""
+from datetime import date
+from typing import (
+    List,
+    Optional,
+)
+
+from pydantic import (
+    BaseModel,
+    Field,
+)
+
+from trading_analytics.data.enum.contract_status import ContractStatus
+from trading_analytics.data.enum.option_type import OptionType
+
+# Shares of the underlying per option contract
+CONTRACT_MULTIPLIER = 100
+
+# Contract quantities at or below this are treated as zero
+CONTRACT_QUANTITY_EPSILON = 1e-9
+
+
+class OptionContract(BaseModel):
+    symbol: str
+    option_type: OptionType
+    strike: float
+    expiration_date: date
+    account: str
+    is_short: bool = Field(default=False)
+    opened_quantity: float = Field(default=0.0)
+    closed_quantity: float = Field(default=0.0)
+    unmatched_quantity: float = Field(default=0.0)
+    realized_profit: float = Field(default=0.0)
+    opened_date: Optional[date] = Field(default=None)
+    closed_date: Optional[date] = Field(default=None)
+    holding_days: Optional[int] = Field(default=None)
+    status: ContractStatus = Field(default=ContractStatus.OPEN)
+    trade_ids: List[int] = Field(default_factory=list)
+
+    @property
+    def open_quantity(self) -> float:
+        """Contracts opened and not yet closed."""
+        return self.opened_quantity - self.closed_quantity
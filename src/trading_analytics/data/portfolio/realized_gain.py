@@ -0,0 +1,27 @@
+"""RealizedGain class for representing the gain realized by one closing trade.
+
+This module defines the `RealizedGain` class, a Pydantic model that represents the shares a trade
+sold or had assigned away, the proceeds, the cost basis of the lots they were matched against, and
+the realized gain.
+
+Classes:
+    RealizedGain: A model for the realized gain of one closing trade.
+"""
+from datetime import date
+from typing import List
+
+from pydantic import (
+    BaseModel,
+    Field,
+)
+
+class RealizedGain(BaseModel):
+    trade_id: int
+    symbol: str
+    account: str
+    trade_date: date
+    quantity: float = Field(default=0.0)
+    proceeds: float = Field(default=0.0)
+    cost_basis: float = Field(default=0.0)
+    gain: float = Field(default=0.0)
+    lot_trade_ids: List[int] = Field(default_factory=list)
@@ -0,0 +1,27 @@
+"""TaxLot class for representing shares still held from one acquisition.
+
+This module defines the `TaxLot` class, a Pydantic model that represents the open part of the
+shares acquired by one trade (a buy, an exercised call, or an assigned put) and their cost basis.
+
+Classes:
+    TaxLot: A model for the open shares and cost basis of one acquisition.
+"""
+from datetime import date
+
+from pydantic import (
+    BaseModel,
+    Field,
+)
+
+class TaxLot(BaseModel):
+    trade_id: int
+    symbol: str
+    account: str
+    trade_date: date
+    quantity: float = Field(default=0.0)
+    cost_per_share: float = Field(default=0.0)
+
+    @property
+    def cost_basis(self) -> float:
+        """Cost basis of the open shares."""
+        return self.quantity * self.cost_per_share
@@ -0,0 +1,218 @@
+"""As-of queries of per-symbol positions and profit.
+
+This module defines the `AsOfIndex` class, which answers "what were the positions and profit on a
+date" without going over the trade list again. When built, it computes each trade's effects once,
+sorts the trades by trade_date, and stores running per-symbol totals every `snapshot_interval`
+sorted trades. A query binary-searches the date, takes the nearest snapshot before it, and adds the
+few trades between the snapshot and the date. `totals` returns the result as an array; `positions`
+also builds a `SymbolResult` per symbol, which dominates the query time for many symbols.
+
+Results equal `calculate_qty_and_profit` over the trades up to the date, up to floating point
+rounding (the trades are summed in date order rather than journal order).
+
+Classes:
+    AsOfIndex: Sorted trade date index with periodic snapshots for as-of position queries.
+"""
+import logging
+from datetime import date
+from typing import (
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.portfolio.symbol_result import SymbolResult
+from trading_analytics.journal.core.vectorized_profit import (
+    compute_trade_effects,
+    log_trade_warnings,
+    symbol_groups,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default number of sorted trades between two snapshots
+SNAPSHOT_INTERVAL = 256
+
+
+class AsOfIndex:
+    """Sorted trade date index with periodic snapshots for as-of position queries.
+
+    The index is built once from the trades; it does not see trades added to the journal later.
+    """
+    def __init__(
+        self,
+        trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]],
+        snapshot_interval: int = SNAPSHOT_INTERVAL
+    ) -> None:
+        """Builds the index.
+
+        Args:
+            trades (Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]): Trades to
+                index, as a batch or as trade entries, in any date order.
+            snapshot_interval (int): Number of sorted trades between two snapshots. Smaller intervals make
+                queries faster and the index larger.
+
+        Raises:
+            ValueError: If snapshot_interval is not positive.
+        """
+        if snapshot_interval <= 0:
+            raise ValueError(f"Snapshot interval must be positive, got {snapshot_interval}")
+
+        batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+        self._interval = snapshot_interval
+
+        if len(batch) == 0:
+            self._symbols = []
+            self._dates = np.array([], dtype="datetime64[D]")
+            self._groups = np.array([], dtype=np.int64)
+            self._values = np.zeros((3, 0))
+            self._first_positions = np.array([], dtype=np.int64)
+            self._snapshots = np.zeros((1, 3, 0))
+            return
+
+        effects = compute_trade_effects(batch)
+        log_trade_warnings(batch, effects)
+        symbols, groups = symbol_groups(batch)
+        symbol_count = len(symbols)
+
+        # Trades sorted by date, trades on the same date stay in journal order
+        order = np.argsort(batch.trade_date, kind="stable")
+        self._symbols = list(symbols)
+        self._dates = batch.trade_date[order]
+        self._groups = groups[order].astype(np.int64)
+        self._values = np.stack([effects.profit, effects.stock_qty, effects.option_qty])[:, order]
+
+        # Sorted position of each symbol's first trade, to leave out symbols not traded yet
+        self._first_positions = np.full(symbol_count, len(batch), dtype=np.int64)
+        np.minimum.at(self._first_positions, self._groups, np.arange(len(batch)))
+
+        # Snapshot k holds the totals of the first k * snapshot_interval sorted trades
+        block_count = -(-len(batch) // snapshot_interval)
+        cells = (np.arange(len(batch)) // snapshot_interval) * symbol_count + self._groups
+        self._snapshots = np.zeros((block_count + 1, 3, symbol_count))
+        for row, values in enumerate(self._values):
+            blocks = np.bincount(cells, weights=values, minlength=block_count * symbol_count)
+            self._snapshots[1:, row] = np.cumsum(blocks.reshape(block_count, symbol_count), axis=0)
+
+    def __len__(self) -> int:
+        """Returns the number of indexed trades."""
+        return len(self._dates)
+
+    def _position(
+        self,
+        as_of: date
+    ) -> int:
+        """Returns the number of sorted trades on or before a date."""
+        return int(np.searchsorted(self._dates, np.datetime64(as_of, "D"), side="right"))
+
+    def _totals(
+        self,
+        position: int
+    ) -> np.ndarray:
+        """Returns the per-symbol totals of the first sorted trades.
+
+        Args:
+            position (int): Number of sorted trades to include.
+
+        Returns:
+            np.ndarray: Array of shape (3, number of symbols): profit, stock_qty, and option_qty.
+        """
+        snapshot = position // self._interval
+        start = snapshot * self._interval
+        totals = self._snapshots[snapshot].copy()
+        groups = self._groups[start:position]
+        for row, values in enumerate(self._values):
+            totals[row] += np.bincount(groups, weights=values[start:position], minlength=len(self._symbols))
+
+        return totals
+
+    def _traded(
+        self,
+        totals: np.ndarray,
+        position: int
+    ) -> Tuple[List[str], np.ndarray]:
+        """Keeps the symbols traded within the first sorted trades."""
+        traded = np.flatnonzero(self._first_positions < position)
+
+        return [self._symbols[index] for index in traded.tolist()], totals[:, traded]
+
+    @staticmethod
+    def _results(
+        symbols: List[str],
+        totals: np.ndarray
+    ) -> Dict[str, SymbolResult]:
+        """Builds a SymbolResult per symbol from totals as returned by `totals`."""
+        results = {}
+        for symbol, (profit, stock_qty, option_qty) in zip(symbols, totals.T.tolist()):
+            results[symbol] = SymbolResult(profit=profit, stock_qty=stock_qty, option_qty=option_qty)
+
+        return results
+
+    def totals(
+        self,
+        as_of: date
+    ) -> Tuple[List[str], np.ndarray]:
+        """Returns the profit, stock quantity, and option quantity by symbol at the end of a date, as an array.
+
+        This is the fast path of `positions`, without building a SymbolResult per symbol.
+
+        Args:
+            as_of (date): Date to query, trades on this date are included.
+
+        Returns:
+            Tuple[List[str], np.ndarray]: Symbols traded on or before the date, in order of first appearance
+                in all indexed trades, and an array of shape (3, number of symbols) with their profit,
+                stock_qty, and option_qty.
+        """
+        position = self._position(as_of)
+
+        return self._traded(self._totals(position), position)
+
+    def positions(
+        self,
+        as_of: date
+    ) -> Dict[str, SymbolResult]:
+        """Returns the profit, stock quantity, and option quantity by symbol at the end of a date.
+
+        Args:
+            as_of (date): Date to query, trades on this date are included.
+
+        Returns:
+            Dict[str, SymbolResult]: Totals of the symbols traded on or before the date, in order of first
+                appearance in all indexed trades.
+        """
+        return self._results(*self.totals(as_of))
+
+    def changes(
+        self,
+        start: date,
+        end: date
+    ) -> Dict[str, SymbolResult]:
+        """Returns the change in profit, stock quantity, and option quantity by symbol over a date range.
+
+        Args:
+            start (date): First date of the range, trades on this date are included.
+            end (date): Last date of the range, trades on this date are included.
+
+        Returns:
+            Dict[str, SymbolResult]: Changes of the symbols traded on or before the end date, in order of first
+                appearance in all indexed trades.
+
+        Raises:
+            ValueError: If end is before start.
+        """
+        if end < start:
+            raise ValueError(f"End date {end} is before start date {start}")
+
+        before = int(np.searchsorted(self._dates, np.datetime64(start, "D"), side="left"))
+        position = self._position(end)
+
+        return self._results(*self._traded(self._totals(position) - self._totals(before), position))
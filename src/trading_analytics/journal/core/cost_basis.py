@@ -0,0 +1,274 @@
+"""Lot-level cost basis with realized and unrealized gains.
+
+This module tracks the open lots of every symbol and account. Each trade that adds shares (a stock
+or ETF buy, an exercised call, or an assigned put) opens a lot at its price per share (the strike
+for options) plus fees. Each trade that removes shares (a sale or an assigned call) closes shares of
+open lots under a `CostBasisMethod` and realizes the difference between its proceeds, net of fees,
+and their cost basis. Trades are processed in trade date order, trades on the same date in journal
+order.
+
+Open lots are kept in a deque per symbol and account, so FIFO and LIFO close lots from either end.
+Lots closed by specific ID are only marked as empty and dropped when they reach an end of the deque.
+Every lot is opened and dropped once, so matching is linear in the number of trades.
+
+Classes:
+    CostBasisResult: Realized gains per closing trade and the remaining open lots.
+
+Functions:
+    calculate_cost_basis: matches closing trades against open lots.
+"""
+import logging
+from collections import deque
+from typing import (
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from pydantic import BaseModel
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import (
+    SECURITY_TYPES,
+    TradeBatch,
+)
+from trading_analytics.data.enum.cost_basis_method import CostBasisMethod
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.portfolio.realized_gain import RealizedGain
+from trading_analytics.data.portfolio.tax_lot import TaxLot
+from trading_analytics.journal.core.vectorized_profit import compute_trade_effects
+
+logger = logging.getLogger(__name__)
+
+# Share quantities below this are treated as zero, to ignore rounding left by fractional shares
+_EPSILON = 1e-9
+
+_OPTION = SECURITY_TYPES.index(SecurityType.OPTION)
+
+
+class CostBasisResult(BaseModel):
+    """Realized gains per closing trade and the remaining open lots.
+
+    Attributes:
+        realized (List[RealizedGain]): One entry per trade that removed shares, in processing order.
+        open_lots (List[TaxLot]): Lots with shares left, in order of acquisition.
+    """
+    realized: List[RealizedGain]
+    open_lots: List[TaxLot]
+
+    def realized_by_symbol(self) -> Dict[str, float]:
+        """Returns the total realized gain by symbol.
+
+        Returns:
+            Dict[str, float]: Sum of the realized gains, by symbol.
+        """
+        result = {}
+        for gain in self.realized:
+            result[gain.symbol] = result.get(gain.symbol, 0.0) + gain.gain
+
+        return result
+
+    def cost_basis_by_symbol(self) -> Dict[str, float]:
+        """Returns the average cost per share of the open lots, by symbol.
+
+        Unlike `calculate_original_buy_in`, shares that were sold don't count.
+
+        Returns:
+            Dict[str, float]: Cost basis of the open lots divided by their shares, by symbol.
+        """
+        costs = {}
+        quantities = {}
+        for lot in self.open_lots:
+            costs[lot.symbol] = costs.get(lot.symbol, 0.0) + lot.cost_basis
+            quantities[lot.symbol] = quantities.get(lot.symbol, 0.0) + lot.quantity
+
+        return {symbol: costs[symbol] / quantities[symbol] for symbol in costs}
+
+    def unrealized_by_symbol(
+        self,
+        prices: Mapping[str, float]
+    ) -> Dict[str, float]:
+        """Returns the unrealized gain of the open lots at given prices, by symbol.
+
+        Args:
+            prices (Mapping[str, float]): Current price per share, by symbol. Symbols without a price are left out.
+
+        Returns:
+            Dict[str, float]: Market value minus cost basis of the open lots, by symbol.
+        """
+        result = {}
+        for lot in self.open_lots:
+            if lot.symbol in prices:
+                gain = lot.quantity * prices[lot.symbol] - lot.cost_basis
+                result[lot.symbol] = result.get(lot.symbol, 0.0) + gain
+
+        return result
+
+
+def _close_shares(
+    lots: Deque[list],
+    lots_by_id: Dict[int, list],
+    quantity: float,
+    method: CostBasisMethod,
+    selected: Sequence[int],
+    trade_id: int
+) -> Tuple[float, float, List[int]]:
+    """Closes shares of open lots.
+
+    Args:
+        lots (Deque[list]): Open lots of the symbol and account, oldest first, as [trade_id, trade_date,
+            quantity, cost_per_share].
+        lots_by_id (Dict[int, list]): The same lots by trade_id.
+        quantity (float): Shares to close.
+        method (CostBasisMethod): Matching method.
+        selected (Sequence[int]): trade_ids of the lots to close first, for SPECIFIC_ID.
+        trade_id (int): trade_id of the closing trade, for warnings.
+
+    Returns:
+        Tuple[float, float, List[int]]: Shares closed, their cost basis, and the trade_ids of the lots used.
+    """
+    closed = 0.0
+    cost_basis = 0.0
+    lot_trade_ids = []
+
+    def take(lot: list) -> None:
+        nonlocal closed, cost_basis
+        shares = min(lot[2], quantity - closed)
+        lot[2] -= shares
+        if lot[2] <= _EPSILON:
+            lot[2] = 0.0
+        closed += shares
+        cost_basis += shares * lot[3]
+        lot_trade_ids.append(lot[0])
+
+    # Chosen lots first, they are only marked empty here and dropped lazily below
+    for lot_trade_id in selected:
+        lot = lots_by_id.get(lot_trade_id)
+        if lot is None or lot[2] <= 0.0:
+            logger.warning(f"Lot {lot_trade_id} selected by trade_id {trade_id} is not open, closing FIFO instead")
+            continue
+        take(lot)
+        if quantity - closed <= _EPSILON:
+            break
+
+    from_end = method == CostBasisMethod.LIFO
+    while quantity - closed > _EPSILON and lots:
+        lot = lots[-1] if from_end else lots[0]
+        if lot[2] > 0.0:
+            take(lot)
+        if lot[2] <= 0.0:
+            if from_end:
+                lots.pop()
+            else:
+                lots.popleft()
+            del lots_by_id[lot[0]]
+
+    return closed, cost_basis, lot_trade_ids
+
+
+def calculate_cost_basis(
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]],
+    method: CostBasisMethod = CostBasisMethod.FIFO,
+    lot_selection: Optional[Mapping[int, Sequence[int]]] = None
+) -> CostBasisResult:
+    """Matches closing trades against open lots.
+
+    Shares removed beyond the open shares of the symbol and account are logged as a warning and
+    left out of the realized gain.
+
+    Args:
+        trades (Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]): Trades to
+            process, as a batch or as trade entries, in any date order.
+        method (CostBasisMethod): How closed shares are matched against open lots.
+        lot_selection (Optional[Mapping[int, Sequence[int]]]): For SPECIFIC_ID, the trade_ids of the lots to close
+            by closing trade_id. Shares not covered by the chosen lots are closed FIFO.
+
+    Returns:
+        CostBasisResult: Realized gains per closing trade and the remaining open lots.
+    """
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0:
+        return CostBasisResult(realized=[], open_lots=[])
+    if method != CostBasisMethod.SPECIFIC_ID or lot_selection is None:
+        lot_selection = {}
+
+    effects = compute_trade_effects(batch)
+    changed = np.flatnonzero(effects.stock_qty != 0.0)
+    order = changed[np.argsort(batch.trade_date[changed], kind="stable")]
+
+    # Options change shares at the strike
+    prices = np.where(batch.security == _OPTION, batch.strike, batch.price_per_share)
+
+    trade_ids = batch.trade_id[order].tolist()
+    trade_dates = batch.trade_date[order].astype(object).tolist()
+    symbols = [batch.symbols[code] for code in batch.symbol_codes[order].tolist()]
+    accounts = [batch.accounts[code] for code in batch.account_codes[order].tolist()]
+    share_changes = effects.stock_qty[order].tolist()
+    share_prices = prices[order].tolist()
+    fees = batch.fees[order].tolist()
+
+    open_lots: Dict[Tuple[str, str], Deque[list]] = {}
+    lots_by_id: Dict[Tuple[str, str], Dict[int, list]] = {}
+    acquisition_order = []
+    realized = []
+    for trade_id, trade_date, symbol, account, change, price, fee in zip(
+        trade_ids, trade_dates, symbols, accounts, share_changes, share_prices, fees
+    ):
+        key = (symbol, account)
+        if key not in open_lots:
+            open_lots[key] = deque()
+            lots_by_id[key] = {}
+
+        # Shares added open a lot, fees are part of its cost
+        if change > 0:
+            lot = [trade_id, trade_date, change, (price * change + fee) / change]
+            open_lots[key].append(lot)
+            lots_by_id[key][trade_id] = lot
+            acquisition_order.append((key, lot))
+            continue
+
+        quantity = -change
+        closed, cost_basis, lot_trade_ids = _close_shares(
+            open_lots[key], lots_by_id[key], quantity, method, lot_selection.get(trade_id, ()), trade_id
+        )
+        if quantity - closed > _EPSILON:
+            logger.warning(
+                f"Only {closed} of {quantity} shares of {symbol} in account {account} were open for trade_id {trade_id}"
+            )
+
+        # Proceeds net of fees, for the shares that were matched
+        proceeds = (price * quantity - fee) / quantity * closed
+        realized.append(RealizedGain(
+            trade_id=trade_id,
+            symbol=symbol,
+            account=account,
+            trade_date=trade_date,
+            quantity=closed,
+            proceeds=proceeds,
+            cost_basis=cost_basis,
+            gain=proceeds - cost_basis,
+            lot_trade_ids=lot_trade_ids,
+        ))
+
+    remaining = [
+        TaxLot(
+            trade_id=lot[0],
+            symbol=key[0],
+            account=key[1],
+            trade_date=lot[1],
+            quantity=lot[2],
+            cost_per_share=lot[3],
+        )
+        for key, lot in acquisition_order
+        if lot[2] > 0.0
+    ]
+
+    return CostBasisResult(realized=realized, open_lots=remaining)
@@ -0,0 +1,229 @@
+"""Persisted portfolio engine state, so restarts only process new trades.
+
+This module saves the per-symbol totals of the portfolio engine to a JSON checkpoint, tagged with
+the number of trades processed, the last processed trade_id, and the fingerprint of those trades. On
+the next run the checkpoint is checked against the current trades: if the trades it covers are
+unchanged, its totals are loaded and only the later trades are folded in; otherwise it is stale
+(trades edited, removed, or reordered, or another checkpoint version) and the totals are rebuilt
+from the first trade. Either way the checkpoint is then updated.
+
+The fingerprint is `profit_cache.trades_fingerprints`, a hash of only the trade ids and the fields
+the engine reads. It is computed straight from the batch arrays or the entries' fields, for the
+covered trades and for all trades in one pass, so a warm start costs a hash of the journal plus the
+engine over the later trades. Entries are only converted to a batch for the later trades.
+
+Later trades are added to the loaded totals one by one in journal order, so the result is
+bit-identical to running the engine over all trades.
+
+Classes:
+    EngineCheckpoint: Engine totals after a number of trades, with the tags used to validate them.
+
+Functions:
+    load_engine_checkpoint: reads a checkpoint file.
+    save_engine_checkpoint: writes a checkpoint file.
+    run_portfolio_engine_checkpointed: runs the portfolio engine, starting from a checkpoint when it is still valid.
+"""
+import logging
+import os
+from typing import (
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+from pydantic import BaseModel
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.portfolio_engine import (
+    TOTAL_FIELDS,
+    PortfolioEngineResult,
+    result_from_totals,
+    trade_totals,
+)
+from trading_analytics.journal.core.profit_cache import trades_fingerprints
+from trading_analytics.journal.core.vectorized_profit import (
+    compute_trade_effects,
+    log_trade_warnings,
+    symbol_groups,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the checkpoint layout or the engine's calculations change, old checkpoints are then rebuilt
+CHECKPOINT_VERSION = 2
+
+
+class EngineCheckpoint(BaseModel):
+    """Engine totals after a number of trades, with the tags used to validate them.
+
+    Attributes:
+        version (int): Checkpoint version, see CHECKPOINT_VERSION.
+        trade_count (int): Number of trades processed, from the start of the journal.
+        last_trade_id (Optional[int]): trade_id of the last processed trade, None if no trades were processed.
+        trades_digest (str): Fingerprint of the processed trades, see `profit_cache.trades_fingerprints`.
+        symbols (List[str]): Symbols in order of first appearance.
+        totals (List[List[float]]): One row per name in TOTAL_FIELDS, one value per symbol.
+    """
+    version: int = CHECKPOINT_VERSION
+    trade_count: int
+    last_trade_id: Optional[int]
+    trades_digest: str
+    symbols: List[str]
+    totals: List[List[float]]
+
+
+def load_engine_checkpoint(
+    checkpoint_path: str
+) -> Optional[EngineCheckpoint]:
+    """Reads a checkpoint file.
+
+    Args:
+        checkpoint_path (str): Path of the checkpoint file.
+
+    Returns:
+        Optional[EngineCheckpoint]: The checkpoint, or None if it is missing, unreadable, or from another version.
+    """
+    if not os.path.exists(checkpoint_path):
+        return None
+
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as file:
+            checkpoint = EngineCheckpoint.model_validate_json(file.read())
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable engine checkpoint {checkpoint_path}. {e}")
+        return None
+
+    if checkpoint.version != CHECKPOINT_VERSION:
+        return None
+
+    return checkpoint
+
+
+def save_engine_checkpoint(
+    checkpoint_path: str,
+    checkpoint: EngineCheckpoint
+) -> None:
+    """Writes a checkpoint file.
+
+    The file is written to a temporary path first and then moved into place, so readers never see
+    a partially written checkpoint.
+
+    Args:
+        checkpoint_path (str): Path of the checkpoint file.
+        checkpoint (EngineCheckpoint): The checkpoint to write.
+    """
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(checkpoint.model_dump_json())
+    os.replace(temp_path, checkpoint_path)
+
+
+def _trade_id_at(
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]],
+    position: int
+) -> int:
+    """Returns the trade_id of the trade at a position, without converting the trades."""
+    if isinstance(trades, TradeBatch):
+        return int(trades.trade_id[position])
+
+    return trades[position].trade_id
+
+
+def _covers(
+    checkpoint: EngineCheckpoint,
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]
+) -> bool:
+    """Returns whether a checkpoint is well formed and ends at the same trade_id as the leading trades.
+
+    This only does the cheap checks, the fingerprint of the leading trades is compared afterwards.
+    """
+    count = checkpoint.trade_count
+    if count > len(trades) or len(checkpoint.totals) != len(TOTAL_FIELDS):
+        return False
+    if any(len(row) != len(checkpoint.symbols) for row in checkpoint.totals):
+        return False
+
+    last_trade_id = _trade_id_at(trades, count - 1) if count else None
+
+    return last_trade_id == checkpoint.last_trade_id
+
+
+def run_portfolio_engine_checkpointed(
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]],
+    checkpoint_path: str
+) -> PortfolioEngineResult:
+    """Runs the portfolio engine, starting from a checkpoint when it is still valid.
+
+    Only trades after the checkpoint are processed (and their warnings logged). A stale checkpoint
+    is rebuilt from the first trade. The checkpoint is updated to cover all trades; failing to write
+    it never fails the run.
+
+    Args:
+        trades (Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]): All trades of
+            the journal in journal order, as a batch or as trade entries.
+        checkpoint_path (str): Path of the checkpoint file.
+
+    Returns:
+        PortfolioEngineResult: The same result as `run_portfolio_engine` over all trades.
+    """
+    count = len(trades)
+
+    # Start from the checkpoint if the trades it covers are unchanged
+    checkpoint = load_engine_checkpoint(checkpoint_path)
+    valid = checkpoint is not None and _covers(checkpoint, trades)
+    if valid:
+        covered_fingerprint, fingerprint = trades_fingerprints(trades, [checkpoint.trade_count, count])
+        valid = covered_fingerprint == checkpoint.trades_digest
+    else:
+        fingerprint = trades_fingerprints(trades, [count])[0]
+    if valid:
+        start = checkpoint.trade_count
+        symbols = list(checkpoint.symbols)
+        totals = np.array(checkpoint.totals, dtype=np.float64).reshape(len(TOTAL_FIELDS), len(symbols))
+    else:
+        if checkpoint is not None:
+            logger.info(f"Engine checkpoint {checkpoint_path} does not match the trades, rebuilding")
+        start = 0
+        symbols = []
+        totals = np.zeros((len(TOTAL_FIELDS), 0))
+
+    # Fold in the later trades one by one, continuing the checkpoint's sums
+    if start < count:
+        if isinstance(trades, TradeBatch):
+            tail = trades.take(np.arange(start, count)) if start else trades
+        else:
+            tail = TradeBatch.from_entries(trades[start:])
+        effects = compute_trade_effects(tail)
+        log_trade_warnings(tail, effects)
+
+        tail_symbols, groups = symbol_groups(tail)
+        positions = {symbol: index for index, symbol in enumerate(symbols)}
+        for symbol in tail_symbols:
+            if symbol not in positions:
+                positions[symbol] = len(symbols)
+                symbols.append(symbol)
+        totals = np.concatenate([totals, np.zeros((len(TOTAL_FIELDS), len(symbols) - totals.shape[1]))], axis=1)
+
+        # add.at adds in trade order, so the sums continue exactly where the checkpoint stopped
+        trade_symbols = np.array([positions[symbol] for symbol in tail_symbols], dtype=np.int64)[groups]
+        for row, values in zip(totals, trade_totals(tail, effects)):
+            np.add.at(row, trade_symbols, values)
+
+    if not valid or start < count:
+        try:
+            save_engine_checkpoint(checkpoint_path, EngineCheckpoint(
+                trade_count=count,
+                last_trade_id=_trade_id_at(trades, count - 1) if count else None,
+                trades_digest=fingerprint,
+                symbols=symbols,
+                totals=totals.tolist(),
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to write engine checkpoint {checkpoint_path}. {e}")
+
+    return result_from_totals(symbols, totals.tolist())
@@ -0,0 +1,260 @@
+"""Exact integer arithmetic mode for profit and quantities.
+
+Float totals drift from broker statements by cents over many trades, since products like
+`quantity * premium * 100 - fees` are not exact in binary floating point. This module computes the
+same per-symbol profit, stock quantity, and option quantity as `calculate_qty_and_profit` in scaled
+int64 arithmetic instead:
+
+    - quantities, prices, dividends, premiums, and strikes are converted once, when the trades are
+      loaded, to integers in units of 1 / AMOUNT_SCALE, and fees to cents (see `ScaledTrades`),
+    - each trade's cash flow is computed exactly and rounded to cents, half away from zero, like a
+      broker statement line,
+    - the cents and scaled quantities are summed by symbol in integer arithmetic.
+
+Totals are then exact sums of cents. Amounts with more decimals than AMOUNT_SCALE allows are
+rounded on conversion, and values too large for int64 arithmetic raise a ValueError rather than
+overflow silently. Warnings for unexpected trades are logged like the float path.
+
+Classes:
+    ScaledTrades: Trade quantities and amounts as scaled int64 arrays.
+    ExactTotals: Per-symbol profit in cents and scaled quantities.
+
+Functions:
+    exact_totals: sums profit in cents and scaled quantities by symbol.
+    calculate_qty_and_profit_exact: calculates profit, stock quantity, and option quantity by symbol exactly.
+"""
+import logging
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+)
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.portfolio.symbol_result import SymbolResult
+from trading_analytics.journal.core.vectorized_profit import (
+    AMOUNT_FIELDS,
+    effect_coefficients,
+    log_warning_codes,
+    symbol_groups,
+)
+
+logger = logging.getLogger(__name__)
+
+# Quantities and amounts are stored in units of 1 / AMOUNT_SCALE
+AMOUNT_SCALE = 10_000
+CENTS_PER_DOLLAR = 100
+
+# Largest magnitude allowed for int64 intermediate values, with headroom below 2**63
+_INT64_LIMIT = 2 ** 62
+
+
+def _to_scaled(
+    values: np.ndarray,
+    scale: int,
+    name: str
+) -> np.ndarray:
+    """Converts float values to int64 in units of 1 / scale, rounding to the nearest unit.
+
+    Args:
+        values (np.ndarray): Float values.
+        scale (int): Units per 1.0.
+        name (str): Field name, for errors.
+
+    Returns:
+        np.ndarray: int64 scaled values.
+
+    Raises:
+        ValueError: If a value is not finite or too large for int64 arithmetic.
+    """
+    scaled = np.rint(values * scale)
+    if not np.all(np.isfinite(scaled)) or np.any(np.abs(scaled) >= _INT64_LIMIT):
+        raise ValueError(f"{name} has values that are not finite or too large for exact arithmetic")
+
+    return scaled.astype(np.int64)
+
+
+class ScaledTrades(BaseModel):
+    """Trade quantities and amounts as scaled int64 arrays.
+
+    Built once per batch, e.g. right after loading the trades, and reused by every exact calculation.
+
+    Attributes:
+        quantity (np.ndarray): Quantity of each trade, in units of 1 / AMOUNT_SCALE.
+        amounts (np.ndarray): Array of shape (len(AMOUNT_FIELDS), number of trades): each amount field in
+            units of 1 / AMOUNT_SCALE, in the row order of AMOUNT_FIELDS (row 0 is zero).
+        fees (np.ndarray): Fees of each trade, in cents.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    quantity: np.ndarray
+    amounts: np.ndarray
+    fees: np.ndarray
+
+    @classmethod
+    def from_batch(
+        cls,
+        batch: TradeBatch
+    ) -> "ScaledTrades":
+        """Converts the quantities and amounts of a batch.
+
+        Args:
+            batch (TradeBatch): Trades to convert.
+
+        Returns:
+            ScaledTrades: The scaled values.
+
+        Raises:
+            ValueError: If a value is not finite or too large for exact arithmetic.
+        """
+        amounts = np.zeros((len(AMOUNT_FIELDS), len(batch)), dtype=np.int64)
+        for row, field in enumerate(AMOUNT_FIELDS):
+            if field is not None:
+                amounts[row] = _to_scaled(getattr(batch, field), AMOUNT_SCALE, field)
+
+        return cls(
+            quantity=_to_scaled(batch.quantity, AMOUNT_SCALE, "quantity"),
+            amounts=amounts,
+            fees=_to_scaled(batch.fees, CENTS_PER_DOLLAR, "fees"),
+        )
+
+
+class ExactTotals(BaseModel):
+    """Per-symbol profit in cents and scaled quantities.
+
+    Attributes:
+        symbols (List[str]): Symbols in order of first appearance.
+        profit_cents (np.ndarray): int64 profit of each symbol, in cents.
+        stock_qty (np.ndarray): int64 stock quantity of each symbol, in units of 1 / AMOUNT_SCALE.
+        option_qty (np.ndarray): int64 option quantity of each symbol, in units of 1 / AMOUNT_SCALE.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    symbols: List[str]
+    profit_cents: np.ndarray
+    stock_qty: np.ndarray
+    option_qty: np.ndarray
+
+
+def _round_div(
+    values: np.ndarray,
+    divisor: int
+) -> np.ndarray:
+    """Divides int64 values, rounding half away from zero."""
+    magnitude = (np.abs(values) + divisor // 2) // divisor
+
+    return np.where(values < 0, -magnitude, magnitude)
+
+
+def _group_sum(
+    groups: np.ndarray,
+    group_count: int,
+    values: np.ndarray
+) -> np.ndarray:
+    """Sums int64 values by group in integer arithmetic."""
+    totals = np.zeros(group_count, dtype=np.int64)
+    np.add.at(totals, groups, values)
+
+    return totals
+
+
+def exact_totals(
+    batch: TradeBatch,
+    scaled: Optional[ScaledTrades] = None
+) -> ExactTotals:
+    """Sums profit in cents and scaled quantities by symbol.
+
+    Args:
+        batch (TradeBatch): Trades to process.
+        scaled (Optional[ScaledTrades]): The batch's values from `ScaledTrades.from_batch`. Converted here if
+            not given.
+
+    Returns:
+        ExactTotals: Per-symbol totals.
+
+    Raises:
+        ValueError: If a value or total is too large for exact arithmetic.
+    """
+    if scaled is None:
+        scaled = ScaledTrades.from_batch(batch)
+
+    coefficients = effect_coefficients(batch)
+    amount_field = coefficients["amount"]
+    cash_sign = coefficients["cash_sign"].astype(np.int64)
+    multiplier = coefficients["multiplier"].astype(np.int64)
+
+    # Cash in units of 1 / AMOUNT_SCALE ** 2, amounts not per unit count as one unit
+    units = np.where(coefficients["per_unit"], scaled.quantity, AMOUNT_SCALE)
+    amount = scaled.amounts[amount_field, np.arange(len(batch))]
+    magnitude = np.abs(units).astype(np.float64) * np.abs(amount) * multiplier
+    if np.any(magnitude >= _INT64_LIMIT):
+        raise ValueError("Trade amounts are too large for exact arithmetic")
+    cash = cash_sign * _round_div(units * amount * multiplier, AMOUNT_SCALE ** 2 // CENTS_PER_DOLLAR)
+    profit_cents = np.where(amount_field != 0, cash - scaled.fees, 0)
+
+    stock_qty = coefficients["stock_qty_per_unit"].astype(np.int64) * scaled.quantity
+    option_qty = coefficients["option_qty_per_unit"].astype(np.int64) * scaled.quantity
+
+    for name, values in (("profit", profit_cents), ("stock_qty", stock_qty), ("option_qty", option_qty)):
+        if np.abs(values).astype(np.float64).sum() >= _INT64_LIMIT:
+            raise ValueError(f"Total {name} is too large for exact arithmetic")
+
+    log_warning_codes(batch, coefficients["warning"])
+
+    symbols, groups = symbol_groups(batch)
+    return ExactTotals(
+        symbols=symbols,
+        profit_cents=_group_sum(groups, len(symbols), profit_cents),
+        stock_qty=_group_sum(groups, len(symbols), stock_qty),
+        option_qty=_group_sum(groups, len(symbols), option_qty),
+    )
+
+
+def calculate_qty_and_profit_exact(
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]],
+    scaled: Optional[ScaledTrades] = None
+) -> Dict[str, SymbolResult]:
+    """Calculates aggregated profit/loss, stock quantity, and option quantity by symbol exactly.
+
+    Args:
+        trades (Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]): Trades to
+            process, as a batch or as trade entries.
+        scaled (Optional[ScaledTrades]): The trades' values from `ScaledTrades.from_batch`, if already converted.
+
+    Returns:
+        Dict[str, SymbolResult]: Profit (the exact total in cents, as dollars), stock quantity, and option
+            quantity by symbol, in order of first appearance.
+
+    Raises:
+        ValueError: If a value or total is too large for exact arithmetic.
+    """
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0:
+        return {}
+
+    totals = exact_totals(batch, scaled)
+
+    return {
+        symbol: SymbolResult(
+            profit=profit_cents / CENTS_PER_DOLLAR,
+            stock_qty=stock_qty / AMOUNT_SCALE,
+            option_qty=option_qty / AMOUNT_SCALE,
+        )
+        for symbol, profit_cents, stock_qty, option_qty in zip(
+            totals.symbols,
+            totals.profit_cents.tolist(),
+            totals.stock_qty.tolist(),
+            totals.option_qty.tolist(),
+        )
+    }
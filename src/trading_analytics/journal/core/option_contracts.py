@@ -0,0 +1,191 @@
+"""Matching of option trades into contract lifecycles.
+
+This module pairs the opening trades of each option contract with the trades that end it: closing
+trades, expirations, assignments, and exercises. A contract is identified by symbol, option type,
+strike, expiration date, and account, and looked up in a dict as trades are processed in one pass in
+trade date order (trades on the same date in journal order). When a fully closed contract is opened
+again, a new lifecycle starts.
+
+The realized profit of a contract is its premium cash flow net of all fees: premiums received for
+sold contracts minus premiums paid for bought ones. The strike paid or received on assignment or
+exercise pays for shares, so it is left to the stock position.
+
+Functions:
+    match_option_contracts: groups option trades into contract lifecycles.
+"""
+import logging
+from datetime import date
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import (
+    ACTIONS,
+    NO_OPTION_TYPE,
+    OPTION_TYPES,
+    SECURITY_TYPES,
+    SUB_ACTIONS,
+    TradeBatch,
+)
+from trading_analytics.data.enum.contract_status import ContractStatus
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.data.portfolio.option_contract import (
+    CONTRACT_MULTIPLIER,
+    CONTRACT_QUANTITY_EPSILON,
+    OptionContract,
+)
+
+logger = logging.getLogger(__name__)
+
+_OPTION = SECURITY_TYPES.index(SecurityType.OPTION)
+_OPEN = SUB_ACTIONS.index(SubAction.OPEN)
+_SELL = ACTIONS.index(Action.SELL)
+
+# Status of a contract ended by each action, and the sign of its premium cash flow
+_ENDING_STATUS = {
+    ACTIONS.index(Action.BUY): ContractStatus.CLOSED,
+    ACTIONS.index(Action.SELL): ContractStatus.CLOSED,
+    ACTIONS.index(Action.OPTION_EXPIRED): ContractStatus.EXPIRED,
+    ACTIONS.index(Action.OPTION_ASSIGNED): ContractStatus.ASSIGNED,
+    ACTIONS.index(Action.OPTION_EXERCISED): ContractStatus.EXERCISED,
+}
+_PREMIUM_SIGN = {
+    ACTIONS.index(Action.BUY): -1.0,
+    _SELL: 1.0,
+}
+
+
+def _contract(
+    state: dict,
+    as_of: Optional[date]
+) -> OptionContract:
+    """Builds a contract from its matching state, setting its status and holding period.
+
+    Args:
+        state (dict): Contract fields collected while matching.
+        as_of (Optional[date]): Date to measure the holding period of open contracts to.
+
+    Returns:
+        OptionContract: The contract.
+    """
+    open_quantity = state["opened_quantity"] - state["closed_quantity"]
+    still_open = open_quantity > CONTRACT_QUANTITY_EPSILON
+    if state["unmatched_quantity"] > CONTRACT_QUANTITY_EPSILON:
+        state["status"] = ContractStatus.UNMATCHED
+    elif still_open:
+        state["status"] = ContractStatus.OPEN
+
+    end_date = as_of if still_open else state["closed_date"]
+    if state["opened_date"] is not None and end_date is not None:
+        state["holding_days"] = (end_date - state["opened_date"]).days
+
+    return OptionContract(**state)
+
+
+def match_option_contracts(
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]],
+    as_of: Optional[date] = None
+) -> List[OptionContract]:
+    """Groups option trades into contract lifecycles.
+
+    Contracts closed, expired, assigned, or exercised without being opened are flagged with the
+    UNMATCHED status and logged as a warning. Options without an option type are skipped.
+
+    Args:
+        trades (Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]): Trades to
+            process, as a batch or as trade entries, in any date order. Non-option trades are ignored.
+        as_of (Optional[date]): Date to measure the holding period of open contracts to. Without it, their
+            holding_days is None.
+
+    Returns:
+        List[OptionContract]: Contracts in order of their first trade.
+    """
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+
+    options = np.flatnonzero((batch.security == _OPTION) & (batch.option_type != NO_OPTION_TYPE))
+    order = options[np.argsort(batch.trade_date[options], kind="stable")]
+
+    rows = zip(
+        batch.trade_id[order].tolist(),
+        batch.trade_date[order].astype(object).tolist(),
+        batch.symbol_codes[order].tolist(),
+        batch.option_type[order].tolist(),
+        batch.strike[order].tolist(),
+        batch.expiration_date[order].astype(object).tolist(),
+        batch.account_codes[order].tolist(),
+        batch.action[order].tolist(),
+        batch.sub_action[order].tolist(),
+        batch.quantity[order].tolist(),
+        batch.premium[order].tolist(),
+        batch.fees[order].tolist(),
+    )
+
+    # Contracts are matched as plain dicts, setting pydantic model fields per trade is slow
+    states: List[dict] = []
+    current: Dict[Tuple, dict] = {}
+    for (trade_id, trade_date, symbol, option_type, strike, expiration_date, account, action, sub_action,
+         quantity, premium, fees) in rows:
+        key = (symbol, option_type, strike, expiration_date, account)
+        state = current.get(key)
+        opening = sub_action == _OPEN and action in _PREMIUM_SIGN
+
+        # A fully closed contract that is opened again starts a new lifecycle
+        if state is None or (
+            opening
+            and state["closed_quantity"] > 0
+            and state["opened_quantity"] - state["closed_quantity"] <= CONTRACT_QUANTITY_EPSILON
+        ):
+            state = current[key] = {
+                "symbol": batch.symbols[symbol],
+                "option_type": OPTION_TYPES[option_type],
+                "strike": strike,
+                "expiration_date": expiration_date,
+                "account": batch.accounts[account],
+                "is_short": opening and action == _SELL,
+                "opened_quantity": 0.0,
+                "closed_quantity": 0.0,
+                "unmatched_quantity": 0.0,
+                "realized_profit": 0.0,
+                "opened_date": None,
+                "closed_date": None,
+                "status": ContractStatus.OPEN,
+                "trade_ids": [],
+            }
+            states.append(state)
+
+        state["trade_ids"].append(trade_id)
+        state["realized_profit"] += _PREMIUM_SIGN.get(action, 0.0) * premium * quantity * CONTRACT_MULTIPLIER - fees
+
+        if opening:
+            state["opened_quantity"] += quantity
+            if state["opened_date"] is None:
+                state["opened_date"] = trade_date
+            continue
+
+        matched = min(quantity, max(state["opened_quantity"] - state["closed_quantity"], 0.0))
+        state["closed_quantity"] += matched
+        state["unmatched_quantity"] += quantity - matched
+        state["closed_date"] = trade_date
+        state["status"] = _ENDING_STATUS.get(action, ContractStatus.CLOSED)
+
+    contracts = [_contract(state, as_of) for state in states]
+    for contract in contracts:
+        if contract.status == ContractStatus.UNMATCHED:
+            logger.warning(
+                f"{contract.unmatched_quantity} {contract.symbol} {contract.option_type.value} {contract.strike} "
+                f"{contract.expiration_date} contracts in account {contract.account} were closed without being opened"
+            )
+
+    return contracts
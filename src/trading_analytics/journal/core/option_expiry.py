@@ -0,0 +1,136 @@
+"""Synthetic expiry of option contracts left open past their expiration date.
+
+A contract that expired worthless but was never journaled as OPTION EXPIRED keeps counting towards
+the option quantity of its symbol. This module finds those contracts and creates the missing
+OPTION EXPIRED trades for them.
+
+The option trades are matched into contracts in one pass (see `option_contracts`), the contracts
+are sorted by expiration date, and a binary search on the as-of date gives every contract that
+expired before it at once. Each expiry closes the contract's option quantity as counted by
+`calculate_qty_and_profit`, so after adding the expiries the option quantity of the expired
+contracts is zero. Expiries have no premium and no fees, so profit and buy-in are unchanged.
+
+Functions:
+    synthesize_expiries: creates OPTION EXPIRED trades for contracts still open after their expiration date.
+    apply_expiries: adds the synthetic expiries to the trades, or only logs them in dry-run mode.
+"""
+import logging
+from datetime import date
+from typing import (
+    List,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.data.portfolio.option_contract import CONTRACT_QUANTITY_EPSILON
+from trading_analytics.journal.core.option_contracts import match_option_contracts
+from trading_analytics.journal.core.vectorized_profit import compute_trade_effects
+
+logger = logging.getLogger(__name__)
+
+Trade = Union[StockEntry, DividendEntry, OptionEntry]
+
+
+def synthesize_expiries(
+    trades: Union[TradeBatch, Sequence[Trade]],
+    as_of: date
+) -> List[OptionEntry]:
+    """Creates OPTION EXPIRED trades for contracts still open after their expiration date.
+
+    Contracts expiring on the as-of date are still open. The expiries get new trade_ids after the
+    highest existing one, are dated on the expiration date, and take the strategy and brokerage of
+    the contract's last trade.
+
+    Args:
+        trades (Union[TradeBatch, Sequence[Trade]]): All trades of the journal, as a batch or as trade entries.
+        as_of (date): Date to check the expiration dates against.
+
+    Returns:
+        List[OptionEntry]: One expiry per contract that expired before as_of, by expiration date.
+    """
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0:
+        return []
+
+    contracts = match_option_contracts(batch)
+    if not contracts:
+        return []
+
+    # Contracts sorted by expiration date, the ones expired before as_of come first
+    expirations = np.array([contract.expiration_date for contract in contracts], dtype="datetime64[D]")
+    order = np.argsort(expirations, kind="stable")
+    expired_count = int(np.searchsorted(expirations[order], np.datetime64(as_of, "D"), side="left"))
+
+    effects = compute_trade_effects(batch)
+    rows = {trade_id: row for row, trade_id in enumerate(batch.trade_id.tolist())}
+    next_trade_id = int(batch.trade_id.max()) + 1
+
+    expiries = []
+    for index in order[:expired_count].tolist():
+        contract = contracts[index]
+        contract_rows = [rows[trade_id] for trade_id in contract.trade_ids]
+        open_quantity = float(effects.option_qty[contract_rows].sum())
+        if open_quantity <= CONTRACT_QUANTITY_EPSILON:
+            continue
+
+        last_row = contract_rows[-1]
+        strategy_start, strategy_end = batch.strategy_indptr[last_row:last_row + 2]
+        expiries.append(OptionEntry(
+            trade_id=next_trade_id,
+            strategy_id=int(batch.strategy_id[last_row]),
+            brokerage=batch.brokerages[batch.brokerage_codes[last_row]],
+            account=contract.account,
+            strategy=[batch.strategies[code] for code in batch.strategy_indices[strategy_start:strategy_end]],
+            security=SecurityType.OPTION,
+            trade_date=contract.expiration_date,
+            symbol=contract.symbol,
+            action=Action.OPTION_EXPIRED,
+            sub_action=SubAction.CLOSE,
+            quantity=open_quantity,
+            fees=0.0,
+            expiration_date=contract.expiration_date,
+            strike=contract.strike,
+            premium=0.0,
+            option_type=contract.option_type,
+        ))
+        next_trade_id += 1
+
+    return expiries
+
+
+def apply_expiries(
+    trades: Sequence[Trade],
+    as_of: date,
+    dry_run: bool = False
+) -> List[Trade]:
+    """Adds the synthetic expiries to the trades, or only logs them in dry-run mode.
+
+    Args:
+        trades (Sequence[Trade]): All trades of the journal.
+        as_of (date): Date to check the expiration dates against.
+        dry_run (bool): Whether to only log the expiries and return the trades unchanged.
+
+    Returns:
+        List[Trade]: The trades followed by the synthetic expiries, or just the trades in dry-run mode.
+    """
+    expiries = synthesize_expiries(trades, as_of)
+    for expiry in expiries:
+        logger.info(
+            f"{'Would expire' if dry_run else 'Expiring'} {expiry.quantity} {expiry.symbol} "
+            f"{expiry.option_type.value} {expiry.strike} {expiry.expiration_date} contracts "
+            f"in account {expiry.account}"
+        )
+
+    if dry_run:
+        return list(trades)
+
+    return list(trades) + expiries
@@ -0,0 +1,270 @@
+"""Black-Scholes valuation and Greeks of option contracts.
+
+This module values European options with the Black-Scholes model and computes their delta, gamma,
+theta, and vega. All contracts are valued in one call on arrays, without a loop over contracts. The
+normal distribution function uses the Abramowitz and Stegun approximation of erf (7.1.26, absolute
+error below 1.5e-7), since numpy has no erf.
+
+Nothing is fetched here: underlying prices are passed in, e.g. the current prices of the positions,
+and the risk-free rate and volatility are arguments or come from the TRADING_ANALYTICS_RISK_FREE_RATE
+and TRADING_ANALYTICS_VOLATILITY environment variables (annualized, as decimals), defaulting to
+DEFAULT_RISK_FREE_RATE and DEFAULT_VOLATILITY.
+
+Values are per share of the underlying; a contract covers CONTRACT_MULTIPLIER shares. Theta is per
+calendar day and vega per volatility point (0.01). Contracts at or past expiration are worth their
+intrinsic value and have no time value.
+
+Classes:
+    OptionValuation: Value and Greeks of open option contracts.
+
+Functions:
+    norm_cdf: standard normal cumulative distribution function.
+    black_scholes: computes Black-Scholes prices and Greeks for arrays of options.
+    value_option_contracts: values the open option contracts from underlying prices.
+"""
+import logging
+import os
+from datetime import date
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+)
+
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.portfolio.option_contract import (
+    CONTRACT_MULTIPLIER,
+    CONTRACT_QUANTITY_EPSILON,
+    OptionContract,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RISK_FREE_RATE = 0.04
+DEFAULT_VOLATILITY = 0.30
+
+DAYS_PER_YEAR = 365.0
+
+# Names of the values computed by `black_scholes`
+GREEKS = ("price", "delta", "gamma", "theta", "vega")
+
+# Coefficients of the Abramowitz and Stegun erf approximation 7.1.26
+_ERF_P = 0.3275911
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+
+
+def _setting(
+    name: str,
+    default: float
+) -> float:
+    """Returns a float setting from an environment variable, or the default."""
+    value = os.environ.get(name, "")
+    if value.strip():
+        try:
+            return float(value)
+        except ValueError:
+            logger.warning(f"Ignoring invalid {name} value '{value}'")
+
+    return default
+
+
+def norm_cdf(
+    x: np.ndarray
+) -> np.ndarray:
+    """Standard normal cumulative distribution function.
+
+    Args:
+        x (np.ndarray): Values.
+
+    Returns:
+        np.ndarray: P(Z <= x) for a standard normal Z, with absolute error below 1e-7.
+    """
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + _ERF_P * z)
+    polynomial = t * (_ERF_A[0] + t * (_ERF_A[1] + t * (_ERF_A[2] + t * (_ERF_A[3] + t * _ERF_A[4]))))
+    erf = 1.0 - polynomial * np.exp(-z * z)
+
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+def _norm_pdf(
+    x: np.ndarray
+) -> np.ndarray:
+    """Standard normal probability density function."""
+    return np.exp(-0.5 * x * x) / np.sqrt(2.0 * np.pi)
+
+
+def black_scholes(
+    spot: np.ndarray,
+    strike: np.ndarray,
+    years: np.ndarray,
+    rate: Union[float, np.ndarray],
+    volatility: Union[float, np.ndarray],
+    is_call: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Computes Black-Scholes prices and Greeks for arrays of options.
+
+    Arguments are broadcast against each other.
+
+    Args:
+        spot (np.ndarray): Underlying prices.
+        strike (np.ndarray): Strike prices.
+        years (np.ndarray): Time to expiration in years, at most zero for expired options.
+        rate (Union[float, np.ndarray]): Annualized continuously compounded risk-free rate.
+        volatility (Union[float, np.ndarray]): Annualized volatility of the underlying.
+        is_call (np.ndarray): True for calls, False for puts.
+
+    Returns:
+        Dict[str, np.ndarray]: Price, delta, gamma, theta (per day), and vega (per volatility point) per
+            share, by name in GREEKS.
+
+    Raises:
+        ValueError: If a volatility is not positive.
+    """
+    spot, strike, years, rate, volatility, is_call = np.broadcast_arrays(
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(years, dtype=np.float64),
+        np.asarray(rate, dtype=np.float64),
+        np.asarray(volatility, dtype=np.float64),
+        np.asarray(is_call, dtype=bool),
+    )
+    if np.any(volatility <= 0):
+        raise ValueError("Volatility must be positive")
+
+    # Expired options get a positive time to keep the formulas finite, and their intrinsic value below
+    live = years > 0
+    time = np.where(live, years, 1.0)
+    sqrt_time = np.sqrt(time)
+    discount = np.exp(-rate * time)
+    deviation = volatility * sqrt_time
+    d1 = (np.log(spot / strike) + (rate + 0.5 * volatility * volatility) * time) / deviation
+    d2 = d1 - deviation
+    sign = np.where(is_call, 1.0, -1.0)
+
+    # Calls use N(d1), N(d2), puts N(-d1), N(-d2)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+    pdf_d1 = _norm_pdf(d1)
+
+    price = sign * (spot * cdf_d1 - strike * discount * cdf_d2)
+    delta = sign * cdf_d1
+    gamma = pdf_d1 / (spot * deviation)
+    theta = (-spot * pdf_d1 * volatility / (2.0 * sqrt_time) - sign * rate * strike * discount * cdf_d2) / DAYS_PER_YEAR
+    vega = spot * pdf_d1 * sqrt_time / 100.0
+
+    in_the_money = sign * (spot - strike) > 0
+    return {
+        "price": np.where(live, price, np.maximum(sign * (spot - strike), 0.0)),
+        "delta": np.where(live, delta, np.where(in_the_money, sign, 0.0)),
+        "gamma": np.where(live, gamma, 0.0),
+        "theta": np.where(live, theta, 0.0),
+        "vega": np.where(live, vega, 0.0),
+    }
+
+
+class OptionValuation(BaseModel):
+    """Value and Greeks of open option contracts.
+
+    All arrays have one value per contract, per share of the underlying, for one long option.
+
+    Attributes:
+        contracts (List[OptionContract]): The valued contracts.
+        quantity (np.ndarray): Open contracts of each, negative for short contracts.
+        price (np.ndarray): Black-Scholes price, NaN without an underlying price.
+        delta (np.ndarray): Change of the price per 1.00 change of the underlying.
+        gamma (np.ndarray): Change of the delta per 1.00 change of the underlying.
+        theta (np.ndarray): Change of the price per calendar day.
+        vega (np.ndarray): Change of the price per volatility point.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    contracts: List[OptionContract]
+    quantity: np.ndarray
+    price: np.ndarray
+    delta: np.ndarray
+    gamma: np.ndarray
+    theta: np.ndarray
+    vega: np.ndarray
+
+    @property
+    def market_value(self) -> np.ndarray:
+        """Value of each open position, negative for short contracts."""
+        return self.quantity * CONTRACT_MULTIPLIER * self.price
+
+    def market_value_by_symbol(self) -> Dict[str, float]:
+        """Returns the value of the open contracts by symbol, in order of first appearance."""
+        result = {}
+        for contract, value in zip(self.contracts, self.market_value.tolist()):
+            result[contract.symbol] = result.get(contract.symbol, 0.0) + value
+
+        return result
+
+
+def value_option_contracts(
+    contracts: Sequence[OptionContract],
+    prices: Dict[str, float],
+    as_of: date,
+    rate: Optional[float] = None,
+    volatility: Optional[Union[float, Dict[str, float]]] = None
+) -> OptionValuation:
+    """Values the open option contracts from underlying prices.
+
+    Contracts without open quantity are left out. Contracts whose symbol has no price get NaN values,
+    logged as a warning.
+
+    Args:
+        contracts (Sequence[OptionContract]): Option contracts, e.g. from `match_option_contracts`.
+        prices (Dict[str, float]): Underlying price by symbol, e.g. the positions' current prices.
+        as_of (date): Valuation date.
+        rate (Optional[float]): Risk-free rate. Defaults to TRADING_ANALYTICS_RISK_FREE_RATE or
+            DEFAULT_RISK_FREE_RATE.
+        volatility (Optional[Union[float, Dict[str, float]]]): Volatility, or volatility by symbol. Defaults,
+            also for symbols missing from the dict, to TRADING_ANALYTICS_VOLATILITY or DEFAULT_VOLATILITY.
+
+    Returns:
+        OptionValuation: Value and Greeks of the open contracts, in input order.
+
+    Raises:
+        ValueError: If a volatility is not positive.
+    """
+    if rate is None:
+        rate = _setting("TRADING_ANALYTICS_RISK_FREE_RATE", DEFAULT_RISK_FREE_RATE)
+    default_volatility = _setting("TRADING_ANALYTICS_VOLATILITY", DEFAULT_VOLATILITY)
+    if volatility is None:
+        volatility = default_volatility
+
+    open_contracts = [contract for contract in contracts if contract.open_quantity > CONTRACT_QUANTITY_EPSILON]
+    for symbol in dict.fromkeys(contract.symbol for contract in open_contracts):
+        if symbol not in prices:
+            logger.warning(f"No underlying price for {symbol}, its option contracts are not valued")
+
+    spot = np.array([prices.get(contract.symbol, np.nan) for contract in open_contracts], dtype=np.float64)
+    strike = np.array([contract.strike for contract in open_contracts], dtype=np.float64)
+    expiration = np.array([contract.expiration_date for contract in open_contracts], dtype="datetime64[D]")
+    years = (expiration - np.datetime64(as_of, "D")).astype(np.float64) / DAYS_PER_YEAR
+    is_call = np.array([contract.option_type == OptionType.CALL for contract in open_contracts], dtype=bool)
+    if isinstance(volatility, dict):
+        volatility = np.array(
+            [volatility.get(contract.symbol, default_volatility) for contract in open_contracts],
+            dtype=np.float64
+        )
+
+    greeks = black_scholes(spot, strike, years, rate, volatility, is_call)
+
+    return OptionValuation(
+        contracts=open_contracts,
+        quantity=np.array([
+            -contract.open_quantity if contract.is_short else contract.open_quantity
+            for contract in open_contracts
+        ], dtype=np.float64),
+        **greeks,
+    )
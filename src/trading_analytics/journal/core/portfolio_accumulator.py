@@ -0,0 +1,303 @@
+"""Incremental portfolio state updated one trade at a time.
+
+This module defines the `PortfolioAccumulator` class, which keeps the per-symbol `SymbolResult`
+and `BuyInData` totals of the portfolio engine and updates them as trades are added or removed,
+without going over the whole history again. Adding a trade is a constant number of dict lookups and
+additions, so a live view can apply a new fill as soon as it arrives. The starting trades, or any
+other run of trades passed to `extend`, are computed as one batch.
+
+Each trade's values come from the same rule tables and formulas as the engine (`effect_values` and
+`buy_in_values`), so trades added in journal order give exactly the totals of `run_portfolio_engine`.
+The values are kept per trade_id. Removing or replacing a trade re-sums the values of its symbol's
+remaining trades in order instead of subtracting, so the totals stay exactly those of an engine run
+over the remaining trades, at a cost linear in the symbol's number of trades.
+
+Classes:
+    PortfolioAccumulator: Per-symbol portfolio totals with incremental add, remove, and replace.
+"""
+import logging
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.portfolio.buy_in_data import BuyInData
+from trading_analytics.data.portfolio.symbol_result import SymbolResult
+from trading_analytics.journal.core.portfolio_engine import (
+    TOTAL_FIELDS,
+    PortfolioEngineResult,
+    buy_in_coefficients,
+    buy_in_values,
+    trade_totals,
+)
+from trading_analytics.journal.core.vectorized_profit import (
+    AMOUNT_FIELDS,
+    compute_trade_effects,
+    effect_coefficients,
+    effect_values,
+    log_trade_warnings,
+    trade_codes,
+)
+
+logger = logging.getLogger(__name__)
+
+Trade = Union[StockEntry, DividendEntry, OptionEntry]
+
+
+class PortfolioAccumulator:
+    """Per-symbol portfolio totals with incremental add, remove, and replace.
+
+    The totals are kept as plain floats; `symbol_results`, `buy_in_data`, and `result` build the
+    pydantic models from them when asked.
+    """
+    def __init__(
+        self,
+        trades: Iterable[Trade] = ()
+    ) -> None:
+        """Creates an accumulator, optionally starting from some trades.
+
+        Args:
+            trades (Iterable[Trade]): Trades to add, in journal order.
+        """
+        # Per symbol: one value per name in TOTAL_FIELDS
+        self._totals: Dict[str, List[float]] = {}
+        # Per symbol: the values of each of its trades by trade_id, in the order they were added
+        self._trade_values: Dict[str, Dict[int, List[float]]] = {}
+        self._symbols: Dict[int, str] = {}
+        self._coefficients: Dict[Tuple, Tuple[Dict, Dict]] = {}
+
+        self.extend(trades)
+
+    def __len__(self) -> int:
+        """Returns the number of trades currently accumulated."""
+        return len(self._symbols)
+
+    def __contains__(
+        self,
+        trade_id: int
+    ) -> bool:
+        """Returns whether a trade with this trade_id is accumulated."""
+        return trade_id in self._symbols
+
+    @property
+    def symbol_results(self) -> Dict[str, SymbolResult]:
+        """Profit, stock quantity, and option quantity by symbol."""
+        return {
+            symbol: SymbolResult(profit=totals[0], stock_qty=totals[1], option_qty=totals[2])
+            for symbol, totals in self._totals.items()
+        }
+
+    @property
+    def buy_in_data(self) -> Dict[str, BuyInData]:
+        """Total cost, bought quantity, net option premiums, and dividends by symbol."""
+        return {
+            symbol: BuyInData(
+                total_cost=totals[3],
+                total_quantity=totals[4],
+                net_option_premiums=totals[5],
+                total_dividends=totals[6],
+            )
+            for symbol, totals in self._totals.items()
+        }
+
+    def _values(
+        self,
+        trade: Trade
+    ) -> List[float]:
+        """Returns a trade's contribution to each total, from the engine's rule tables and formulas.
+
+        Logs the same warning as the engine for unexpected trade types or actions.
+
+        Args:
+            trade (Trade): The trade.
+
+        Returns:
+            List[float]: One value per name in TOTAL_FIELDS.
+        """
+        # Read the fields directly, getattr on a field the entry type lacks is slow in pydantic
+        fields = trade.__dict__
+        key = (fields["security"], fields.get("option_type"), fields["action"], fields["sub_action"])
+        coefficients = self._coefficients.get(key)
+        if coefficients is None:
+            codes = trade_codes(*key)
+            coefficients = self._coefficients[key] = (effect_coefficients(codes), buy_in_coefficients(codes))
+        effect, buy_in = coefficients
+
+        if effect["warning"] == 1:
+            logger.warning(f"Unexpected action {trade.action} for trade_id {trade.trade_id}")
+        elif effect["warning"] == 2:
+            logger.warning(f"Unexpected security type {trade.security} for trade_id {trade.trade_id}")
+
+        quantity = fields["quantity"]
+        fees = fields["fees"]
+        amount_field = AMOUNT_FIELDS[effect["amount"]]
+        stock_qty, option_qty, profit = effect_values(
+            effect, quantity, fees, fields[amount_field] if amount_field else 0.0
+        )
+        values = (
+            profit,
+            stock_qty,
+            option_qty,
+            *buy_in_values(
+                buy_in,
+                quantity,
+                fees,
+                fields.get("price_per_share", 0.0),
+                fields.get("premium", 0.0),
+                fields.get("dividend_amount", 0.0),
+            ),
+        )
+
+        return [float(value) for value in values]
+
+    def _resum(
+        self,
+        symbol: str
+    ) -> None:
+        """Recomputes the totals of a symbol from its remaining trades, in the order they were added."""
+        trade_values = self._trade_values[symbol]
+        if not trade_values:
+            del self._trade_values[symbol]
+            del self._totals[symbol]
+            return
+
+        # Start from 0.0 and add, like the engine, so the totals stay bit-identical
+        totals = [0.0] * len(TOTAL_FIELDS)
+        for values in trade_values.values():
+            for index, value in enumerate(values):
+                totals[index] += value
+        self._totals[symbol] = totals
+
+    def _insert(
+        self,
+        trade: Trade,
+        values: List[float]
+    ) -> None:
+        """Adds a trade's values to the totals of its symbol and keeps them for later removal."""
+        symbol = trade.symbol
+        totals = self._totals.get(symbol)
+        if totals is None:
+            # Start from 0.0 and add, like the engine, so the totals stay bit-identical
+            totals = self._totals[symbol] = [0.0] * len(values)
+            self._trade_values[symbol] = {}
+        self._trade_values[symbol][trade.trade_id] = values
+        self._symbols[trade.trade_id] = symbol
+
+        for index, value in enumerate(values):
+            totals[index] += value
+
+    def add(
+        self,
+        trade: Trade
+    ) -> None:
+        """Adds a trade to the totals of its symbol.
+
+        Logs the same warning as the engine for unexpected trade types or actions.
+
+        Args:
+            trade (Trade): The trade to add.
+
+        Raises:
+            ValueError: If a trade with the same trade_id has already been added.
+        """
+        if trade.trade_id in self._symbols:
+            raise ValueError(f"Trade {trade.trade_id} has already been added")
+
+        self._insert(trade, self._values(trade))
+
+    def extend(
+        self,
+        trades: Iterable[Trade]
+    ) -> None:
+        """Adds trades in journal order, computing their values as one batch like the engine.
+
+        Args:
+            trades (Iterable[Trade]): Trades to add.
+
+        Raises:
+            ValueError: If a trade_id has already been added or repeats among the trades; nothing is added then.
+        """
+        trades = list(trades)
+        trade_ids = set()
+        for trade in trades:
+            if trade.trade_id in self._symbols or trade.trade_id in trade_ids:
+                raise ValueError(f"Trade {trade.trade_id} has already been added")
+            trade_ids.add(trade.trade_id)
+        if not trades:
+            return
+
+        batch = TradeBatch.from_entries(trades)
+        effects = compute_trade_effects(batch)
+        log_trade_warnings(batch, effects, logger)
+
+        for trade, values in zip(trades, trade_totals(batch, effects).T.tolist()):
+            self._insert(trade, values)
+
+    def remove(
+        self,
+        trade: Trade
+    ) -> None:
+        """Removes a previously added trade from the totals of its symbol.
+
+        The trade is found by its trade_id and removed with the values it was added with. When the
+        last trade of a symbol is removed, the symbol is dropped.
+
+        Args:
+            trade (Trade): The trade to remove.
+
+        Raises:
+            KeyError: If no trade with its trade_id has been added.
+        """
+        symbol = self._symbols.pop(trade.trade_id, None)
+        if symbol is None:
+            raise KeyError(f"Trade {trade.trade_id} has not been added")
+
+        del self._trade_values[symbol][trade.trade_id]
+        self._resum(symbol)
+
+    def replace(
+        self,
+        old_trade: Trade,
+        new_trade: Optional[Trade]
+    ) -> None:
+        """Applies an edited trade: removes the old version and adds the new one.
+
+        An edit that keeps the trade_id and symbol keeps the trade's place in the order of its symbol.
+
+        Args:
+            old_trade (Trade): The trade as it was added.
+            new_trade (Optional[Trade]): The edited trade, or None if it was deleted.
+
+        Raises:
+            KeyError: If no trade with the old trade's trade_id has been added.
+            ValueError: If the new trade has a different trade_id that has already been added.
+        """
+        symbol = self._symbols.get(old_trade.trade_id)
+        if (
+            new_trade is not None
+            and new_trade.trade_id == old_trade.trade_id
+            and new_trade.symbol == symbol
+        ):
+            self._trade_values[symbol][new_trade.trade_id] = self._values(new_trade)
+            self._resum(symbol)
+            return
+
+        self.remove(old_trade)
+        if new_trade is not None:
+            self.add(new_trade)
+
+    def result(self) -> PortfolioEngineResult:
+        """Returns a snapshot of the totals, in the form of a full engine run.
+
+        Returns:
+            PortfolioEngineResult: The per-symbol results and buy-in data.
+        """
+        return PortfolioEngineResult(symbol_results=self.symbol_results, buy_in_data=self.buy_in_data)
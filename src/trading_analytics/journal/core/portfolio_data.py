@@ -1,8 +1,10 @@
 # Imports
 import logging
+from datetime import date
 from typing import (
     List,
     Dict,
+    Optional,
     Union,
 )
 
@@ -12,28 +14,46 @@ from trading_analytics.data.data_model.entry.stock_entry import StockEntry
 from trading_analytics.journal.core.calculate_profit import SymbolResult
 from trading_analytics.utilities.csv.load_trades import load_trades_from_excel
 from trading_analytics.utilities.fetch_market_data import fetch_current_stock_price
-from trading_analytics.journal.core.calculate_profit import (
-    get_current_positions,
-    calculate_qty_and_profit,
-    calculate_adjusted_buy_in,
-    calculate_original_buy_in
+from trading_analytics.journal.core.calculate_profit import get_current_positions
+from trading_analytics.journal.core.engine_checkpoint import run_portfolio_engine_checkpointed
+from trading_analytics.journal.core.option_expiry import synthesize_expiries
+from trading_analytics.journal.core.portfolio_engine import (
+    PortfolioEngineResult,
+    run_portfolio_engine,
 )
 from trading_analytics.data.data_model.portfolio.position import Position
 
 logger = logging.getLogger(__name__)
 
 def load_and_process_portfolio_data(
-    file_path: str
+    file_path: str,
+    checkpoint_path: Optional[str] = None,
+    as_of: Optional[date] = None
 ) -> List[Position]:
-    """Load trades and return processed positions."""
+    """Load trades and return processed positions.
+
+    If a checkpoint path is given, the engine state is saved there, and the next load only
+    processes trades added since (see `engine_checkpoint`). If an as-of date is given, option
+    contracts still open after their expiration date are treated as expired (see `option_expiry`);
+    the expiries are not part of the checkpoint.
+    """
     try:
         # Load raw trades from Excel
         # Note: StockEntry, DividendEntry, OptionEntry all have the parent class TradeEntry.
         raw_trades: List[Union[StockEntry, DividendEntry, OptionEntry]] = load_trades_from_excel(file_path)
         print(f"Loaded {len(raw_trades)} raw trades from {file_path}")
 
-        # Calculate quantities and profits.
-        quantity_dict: Dict[str, SymbolResult] = calculate_qty_and_profit(raw_trades)
+        # Calculate quantities, profits, and buy-in data in one pass.
+        if checkpoint_path is not None:
+            engine_result: PortfolioEngineResult = run_portfolio_engine_checkpointed(raw_trades, checkpoint_path)
+        else:
+            engine_result: PortfolioEngineResult = run_portfolio_engine(raw_trades)
+        if as_of is not None:
+            expiries: List[OptionEntry] = synthesize_expiries(raw_trades, as_of)
+            if expiries:
+                engine_result = engine_result.combined(run_portfolio_engine(expiries))
+                print(f"Expired {len(expiries)} option contracts past their expiration date")
+        quantity_dict: Dict[str, SymbolResult] = engine_result.symbol_results
         print("Calculated quantities and profits")
 
         # Get current positions.
@@ -41,10 +61,13 @@ def load_and_process_portfolio_data(
         # that have non-zero stock or option quantity.
         current_positions: Dict[str, SymbolResult] = get_current_positions(quantity_dict)
 
+        # Buy-in of the current symbols, computed once and looked up per symbol
+        current_result = engine_result.for_symbols(current_positions.keys())
+        original_buy_in_dict = current_result.original_buy_in()
+        adjusted_buy_in_dict = current_result.adjusted_buy_in()
+
         # Process each position
         positions = []
-        current_symbols: List[str] = list(current_positions.keys())
-        current_trades = [trade for trade in raw_trades if trade.symbol in current_symbols]
 
         # Variables involving current data
         symbol: str
@@ -56,8 +79,6 @@ def load_and_process_portfolio_data(
                 current_stock_data = fetch_current_stock_price(symbol)
                 current_price = current_stock_data.current_price if current_stock_data else None
 
-            original_buy_in_dict = calculate_original_buy_in(current_trades)
-            adjusted_buy_in_dict = calculate_adjusted_buy_in(current_trades)
             original_buy_in = original_buy_in_dict.get(symbol)
             adjusted_buy_in = adjusted_buy_in_dict.get(symbol)
 
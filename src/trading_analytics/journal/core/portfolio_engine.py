@@ -0,0 +1,468 @@
+"""Single-pass portfolio engine.
+
+This module computes everything the journal needs per symbol in one pass over the trades: profit,
+stock quantity, and option quantity (like `calculate_qty_and_profit`), and the total cost, bought
+quantity, net option premiums, and dividends behind the original and adjusted buy-in. Each trade's
+values are computed once as arrays and summed by symbol, instead of walking the trade list once
+per calculation. An iterator of entries, e.g. from `iter_trades_from_excel`, is consumed in chunks
+of STREAM_CHUNK_SIZE, so the entries don't need to be held in memory at once.
+
+The functions in `calculate_profit` are views over this engine's result.
+
+The rules for the buy-in totals are defined once, in `buy_in_effect`, like `trade_effect` for
+profit and quantities, and evaluated into a table for every combination of enum codes. The same
+tables and formulas serve whole batches here and single trades in `portfolio_accumulator`.
+
+Classes:
+    PortfolioEngineResult: Per-symbol profit, quantities, and buy-in data from one engine run.
+    BuyInEffect: Which buy-in totals one kind of trade adds to.
+
+Functions:
+    buy_in_effect: returns the buy-in effect of a security, option type, action, and sub-action.
+    buy_in_coefficients: looks up the buy-in effect of every trade of a batch.
+    buy_in_values: computes the buy-in totals of trades from their buy-in coefficients.
+    trade_totals: computes each trade's contribution to every per-symbol total.
+    result_from_totals: builds an engine result from per-symbol totals.
+    run_portfolio_engine: computes per-symbol results and buy-in data in one pass over the trades.
+"""
+import logging
+from itertools import islice
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+)
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import (
+    ACTIONS,
+    OPTION_TYPES,
+    SECURITY_TYPES,
+    SUB_ACTIONS,
+    TradeBatch,
+)
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.data.portfolio.option_contract import CONTRACT_MULTIPLIER
+from trading_analytics.data.portfolio.buy_in_data import BuyInData
+from trading_analytics.data.portfolio.symbol_result import SymbolResult
+from trading_analytics.journal.core.vectorized_profit import (
+    TradeEffects,
+    compute_trade_effects,
+    group_sums,
+    log_trade_warnings,
+    rule_index,
+    symbol_groups,
+)
+
+logger = logging.getLogger(__name__)
+
+# Names of the per-symbol totals, in the row order of `trade_totals`
+TOTAL_FIELDS = (
+    "profit",
+    "stock_qty",
+    "option_qty",
+    "total_cost",
+    "total_quantity",
+    "net_option_premiums",
+    "total_dividends",
+)
+
+# Entries per batch when the engine consumes an iterator
+STREAM_CHUNK_SIZE = 10_000
+
+
+
+class PortfolioEngineResult(BaseModel):
+    """Per-symbol profit, quantities, and buy-in data from one engine run.
+
+    Both dicts have the same symbols, in order of first appearance in the trades.
+
+    Attributes:
+        symbol_results (Dict[str, SymbolResult]): Profit, stock quantity, and option quantity by symbol.
+        buy_in_data (Dict[str, BuyInData]): Total cost, bought quantity, net option premiums, and dividends by symbol.
+    """
+    symbol_results: Dict[str, SymbolResult]
+    buy_in_data: Dict[str, BuyInData]
+
+    def for_symbols(
+        self,
+        symbols: Iterable[str]
+    ) -> "PortfolioEngineResult":
+        """Returns the part of the result for some symbols.
+
+        Per-symbol values don't depend on other symbols' trades, so this equals running the engine on
+        just those symbols' trades.
+
+        Args:
+            symbols (Iterable[str]): Symbols to keep.
+
+        Returns:
+            PortfolioEngineResult: The results and buy-in data of the given symbols, in the original order.
+        """
+        keep = set(symbols)
+
+        return PortfolioEngineResult(
+            symbol_results={symbol: data for symbol, data in self.symbol_results.items() if symbol in keep},
+            buy_in_data={symbol: data for symbol, data in self.buy_in_data.items() if symbol in keep},
+        )
+
+    def combined(
+        self,
+        other: "PortfolioEngineResult"
+    ) -> "PortfolioEngineResult":
+        """Returns the result of this result's trades followed by another result's trades.
+
+        Args:
+            other (PortfolioEngineResult): Result of the later trades.
+
+        Returns:
+            PortfolioEngineResult: Per-symbol sums, with this result's symbols first and then the new symbols of
+                the other result.
+        """
+        symbols = list(self.symbol_results)
+        symbols += [symbol for symbol in other.symbol_results if symbol not in self.symbol_results]
+
+        totals = []
+        for field in TOTAL_FIELDS:
+            source = "symbol_results" if field in SymbolResult.model_fields else "buy_in_data"
+            first = getattr(self, source)
+            second = getattr(other, source)
+            totals.append([
+                (getattr(first[symbol], field) if symbol in first else 0.0)
+                + (getattr(second[symbol], field) if symbol in second else 0.0)
+                for symbol in symbols
+            ])
+
+        return result_from_totals(symbols, totals)
+
+    def original_buy_in(
+        self,
+        warning_logger: Optional[logging.Logger] = None
+    ) -> Dict[str, float]:
+        """Returns the average price per share paid for STOCK and ETF buys, by symbol.
+
+        Symbols without bought shares are left out and logged as a warning.
+
+        Args:
+            warning_logger (Optional[logging.Logger]): Logger for the warnings, defaults to this module's logger.
+
+        Returns:
+            Dict[str, float]: Total cost divided by total bought quantity, by symbol.
+        """
+        warning_logger = warning_logger or logger
+        result = {}
+        for symbol, data in self.buy_in_data.items():
+            if data.total_quantity > 0:
+                result[symbol] = data.total_cost / data.total_quantity
+            else:
+                warning_logger.warning(f"No valid buy quantity {data.total_quantity} for {symbol}")
+
+        return result
+
+    def adjusted_buy_in(self) -> Dict[str, float]:
+        """Returns the buy-in price per share net of option premiums and dividends, by symbol.
+
+        Symbols without bought shares are left out.
+
+        Returns:
+            Dict[str, float]: Total cost minus net option premiums and dividends, divided by total bought
+                quantity, by symbol.
+        """
+        result = {}
+        for symbol, data in self.buy_in_data.items():
+            if data.total_quantity > 0:
+                adjusted_cost = (
+                    data.total_cost
+                    - data.net_option_premiums
+                    - data.total_dividends
+                )
+                result[symbol] = adjusted_cost / data.total_quantity
+
+        return result
+
+
+class BuyInEffect(BaseModel):
+    """Which buy-in totals one kind of trade adds to.
+
+    For a trade with quantity q, fees f, price per share p, premium m, and dividend amount d:
+        total_cost = p * q + f and total_quantity = q, if `bought_shares`
+        net_option_premiums = premium_sign * m * q * CONTRACT_MULTIPLIER - f, if `premium_sign` is not 0
+        total_dividends = d - f, if `dividend`
+
+    Attributes:
+        bought_shares (bool): Whether the trade buys shares that make up the cost basis.
+        premium_sign (float): 1.0 for option premiums received, -1.0 for premiums paid, 0.0 for none.
+        dividend (bool): Whether the trade is a dividend.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    bought_shares: bool = False
+    premium_sign: float = 0.0
+    dividend: bool = False
+
+
+def buy_in_effect(
+    security: SecurityType,
+    option_type: Optional[OptionType],
+    action: Action,
+    sub_action: SubAction
+) -> BuyInEffect:
+    """Returns the buy-in effect of a security, option type, action, and sub-action.
+
+    This is the single definition of which trades count towards the original and adjusted buy-in.
+
+    Args:
+        security (SecurityType): Security type of the trade.
+        option_type (Optional[OptionType]): Option type, None for trades that are not options.
+        action (Action): Trade action.
+        sub_action (SubAction): Trade sub-action.
+
+    Returns:
+        BuyInEffect: The effect, adding to no total for trades that don't count.
+    """
+    # Stock/ETF buys make up the cost basis
+    if security in [SecurityType.STOCK, SecurityType.ETF]:
+        return BuyInEffect(bought_shares=action == Action.BUY)
+
+    # Premiums of calls and puts sold or bought to open or close
+    if security == SecurityType.OPTION:
+        if option_type is None or sub_action not in [SubAction.OPEN, SubAction.CLOSE]:
+            return BuyInEffect()
+        if action == Action.SELL:
+            return BuyInEffect(premium_sign=1.0)
+        if action == Action.BUY:
+            return BuyInEffect(premium_sign=-1.0)
+        return BuyInEffect()
+
+    # Dividends net of fees
+    return BuyInEffect(dividend=security == SecurityType.DIVIDEND)
+
+
+def _buy_in_table() -> Dict[str, np.ndarray]:
+    """Evaluates `buy_in_effect` for every combination of enum codes.
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays indexed like the `vectorized_profit` effect table (see `rule_index`).
+    """
+    shape = (len(SECURITY_TYPES), len(OPTION_TYPES) + 1, len(ACTIONS), len(SUB_ACTIONS))
+    table = {
+        "bought_shares": np.zeros(shape, dtype=bool),
+        "premium_sign": np.zeros(shape),
+        "dividend": np.zeros(shape, dtype=bool),
+    }
+
+    option_types = (None,) + OPTION_TYPES
+    for index in np.ndindex(*shape):
+        security, option_type, action, sub_action = index
+        effect = buy_in_effect(
+            SECURITY_TYPES[security], option_types[option_type], ACTIONS[action], SUB_ACTIONS[sub_action]
+        )
+        table["bought_shares"][index] = effect.bought_shares
+        table["premium_sign"][index] = effect.premium_sign
+        table["dividend"][index] = effect.dividend
+
+    return table
+
+
+_BUY_IN_TABLE = _buy_in_table()
+
+
+def buy_in_coefficients(
+    trades: Union[TradeBatch, Tuple[int, int, int, int]]
+) -> Dict[str, np.ndarray]:
+    """Looks up the `buy_in_effect` of every trade of a batch.
+
+    Args:
+        trades (Union[TradeBatch, Tuple[int, int, int, int]]): A batch, or the `trade_codes` of one kind of trade.
+
+    Returns:
+        Dict[str, np.ndarray]: One array per field of BuyInEffect, one value per trade (scalars for trade codes).
+    """
+    index = rule_index(trades)
+
+    return {name: table[index] for name, table in _BUY_IN_TABLE.items()}
+
+
+def buy_in_values(
+    coefficients: Dict[str, np.ndarray],
+    quantity: np.ndarray,
+    fees: np.ndarray,
+    price_per_share: np.ndarray,
+    premium: np.ndarray,
+    dividend_amount: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Computes the buy-in totals of trades from their buy-in coefficients.
+
+    Works on arrays of trades and on the scalars of one trade alike, with the same floating point
+    operations as the per-trade buy-in loops.
+
+    Args:
+        coefficients (Dict[str, np.ndarray]): Coefficients from `buy_in_coefficients`.
+        quantity (np.ndarray): Quantity of each trade.
+        fees (np.ndarray): Fees of each trade.
+        price_per_share (np.ndarray): Price per share of each trade, 0.0 if it has none.
+        premium (np.ndarray): Option premium of each trade, 0.0 if it has none.
+        dividend_amount (np.ndarray): Dividend amount of each trade, 0.0 if it has none.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: Total cost, bought quantity, net option
+            premiums, and dividends of each trade.
+    """
+    bought = coefficients["bought_shares"]
+    premium_sign = coefficients["premium_sign"]
+
+    return (
+        np.where(bought, price_per_share * quantity + fees, 0.0),
+        np.where(bought, quantity, 0.0),
+        np.where(premium_sign != 0, premium_sign * premium * quantity * CONTRACT_MULTIPLIER - fees, 0.0),
+        np.where(coefficients["dividend"], dividend_amount - fees, 0.0),
+    )
+
+
+def trade_totals(
+    batch: TradeBatch,
+    effects: TradeEffects
+) -> np.ndarray:
+    """Computes each trade's contribution to every per-symbol total.
+
+    Args:
+        batch (TradeBatch): Trades to process.
+        effects (TradeEffects): Their effects from `compute_trade_effects`.
+
+    Returns:
+        np.ndarray: Array of shape (len(TOTAL_FIELDS), len(batch)), one row per total.
+    """
+    buy_in = buy_in_values(
+        buy_in_coefficients(batch),
+        batch.quantity,
+        batch.fees,
+        batch.price_per_share,
+        batch.premium,
+        batch.dividend_amount,
+    )
+
+    return np.stack([effects.profit, effects.stock_qty, effects.option_qty, *buy_in])
+
+
+def result_from_totals(
+    symbols: Sequence[str],
+    totals: Sequence[Sequence[float]]
+) -> PortfolioEngineResult:
+    """Builds an engine result from per-symbol totals.
+
+    Args:
+        symbols (Sequence[str]): Symbols in result order.
+        totals (Sequence[Sequence[float]]): One row per name in TOTAL_FIELDS, one value per symbol.
+
+    Returns:
+        PortfolioEngineResult: Per-symbol results and buy-in data.
+    """
+    profit, stock_qty, option_qty, cost, bought_quantity, premiums, dividends = totals
+
+    symbol_results = {}
+    buy_in_data = {}
+    for index, symbol in enumerate(symbols):
+        symbol_results[symbol] = SymbolResult(
+            profit=profit[index],
+            stock_qty=stock_qty[index],
+            option_qty=option_qty[index],
+        )
+        buy_in_data[symbol] = BuyInData(
+            total_cost=cost[index],
+            total_quantity=bought_quantity[index],
+            net_option_premiums=premiums[index],
+            total_dividends=dividends[index],
+        )
+
+    return PortfolioEngineResult(symbol_results=symbol_results, buy_in_data=buy_in_data)
+
+
+def _run_streamed(
+    trades: Iterable[Union[StockEntry, DividendEntry, OptionEntry]],
+    warning_logger: Optional[logging.Logger]
+) -> PortfolioEngineResult:
+    """Runs the engine over an iterator of entries, one chunk of STREAM_CHUNK_SIZE entries at a time.
+
+    Only the per-trade totals of each chunk are kept, and they are summed once at the end in trade
+    order, so the result is the same as for all entries in one batch.
+
+    Args:
+        trades (Iterable[Union[StockEntry, DividendEntry, OptionEntry]]): Trade entries.
+        warning_logger (Optional[logging.Logger]): Logger for the per-trade warnings.
+
+    Returns:
+        PortfolioEngineResult: Per-symbol results and buy-in data.
+    """
+    symbols: Dict[str, int] = {}
+    groups = []
+    totals = []
+    iterator = iter(trades)
+    while chunk := list(islice(iterator, STREAM_CHUNK_SIZE)):
+        batch = TradeBatch.from_entries(chunk)
+        effects = compute_trade_effects(batch)
+        log_trade_warnings(batch, effects, warning_logger)
+
+        # Number the symbols in order of first appearance over all chunks
+        symbol_numbers = np.array(
+            [symbols.setdefault(symbol, len(symbols)) for symbol in batch.symbols],
+            dtype=np.int64
+        )
+        groups.append(symbol_numbers[batch.symbol_codes])
+        totals.append(trade_totals(batch, effects))
+
+    if not symbols:
+        return PortfolioEngineResult(symbol_results={}, buy_in_data={})
+
+    groups = np.concatenate(groups)
+    totals = np.concatenate(totals, axis=1)
+
+    return result_from_totals(list(symbols), [group_sums(groups, len(symbols), values) for values in totals])
+
+
+def run_portfolio_engine(
+    trades: Union[TradeBatch, Iterable[Union[StockEntry, DividendEntry, OptionEntry]]],
+    warning_logger: Optional[logging.Logger] = None
+) -> PortfolioEngineResult:
+    """Computes per-symbol results and buy-in data in one pass over the trades.
+
+    Values match the separate per-trade calculations exactly: each trade's values use the same
+    floating point operations and are summed in trade order. Warnings for unexpected trade types or
+    actions are logged once.
+
+    Args:
+        trades (Union[TradeBatch, Iterable[Union[StockEntry, DividendEntry, OptionEntry]]]): Trades to
+            process, as a batch, as trade entries, or as an iterator of trade entries.
+        warning_logger (Optional[logging.Logger]): Logger for the per-trade warnings, defaults to the
+            `vectorized_profit` logger.
+
+    Returns:
+        PortfolioEngineResult: Per-symbol results and buy-in data.
+    """
+    if not isinstance(trades, (TradeBatch, Sequence)):
+        return _run_streamed(trades, warning_logger)
+
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0:
+        return PortfolioEngineResult(symbol_results={}, buy_in_data={})
+
+    effects = compute_trade_effects(batch)
+    log_trade_warnings(batch, effects, warning_logger)
+
+    symbols, groups = symbol_groups(batch)
+    totals = [group_sums(groups, len(symbols), values) for values in trade_totals(batch, effects)]
+
+    return result_from_totals(symbols, totals)
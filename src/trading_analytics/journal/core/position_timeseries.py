@@ -0,0 +1,104 @@
+"""Daily per-symbol positions and cumulative profit over trade dates.
+
+This module turns the trades into daily series of stock quantity, option quantity, and cumulative
+profit (the same realized cash flow as `calculate_qty_and_profit`) for every symbol. Each trade's
+effects are computed once, bucketed by symbol and trade date, and the daily changes are turned into
+running totals with a cumulative sum along the dates. The value on a date includes all trades up to
+and including that date; the last date equals the final totals up to floating point rounding.
+
+Functions:
+    position_timeseries: computes daily per-symbol positions and cumulative profit.
+"""
+import logging
+from datetime import date
+from typing import (
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.vectorized_profit import (
+    compute_trade_effects,
+    log_trade_warnings,
+    symbol_groups,
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns of the frame returned by `position_timeseries`
+TIMESERIES_COLUMNS = ["date", "symbol", "stock_qty", "option_qty", "profit"]
+
+
+def position_timeseries(
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]],
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> pd.DataFrame:
+    """Computes daily per-symbol positions and cumulative profit.
+
+    Every symbol gets one row per calendar day from start to end. Trades before start are included
+    in the values of the first day; trades after end are left out.
+
+    Args:
+        trades (Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]): Trades to
+            process, as a batch or as trade entries, in any date order.
+        start (Optional[date]): First date of the series. Defaults to the earliest trade date.
+        end (Optional[date]): Last date of the series. Defaults to the latest trade date.
+
+    Returns:
+        pd.DataFrame: Columns TIMESERIES_COLUMNS: date (datetime64), symbol (categorical, in order of first
+            appearance in the trades), and stock_qty, option_qty, and cumulative profit as of the end of
+            that date. Sorted by symbol, then date.
+
+    Raises:
+        ValueError: If end is before start.
+    """
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0:
+        return pd.DataFrame({
+            "date": pd.Series(dtype="datetime64[ns]"),
+            "symbol": pd.Categorical([]),
+            "stock_qty": pd.Series(dtype=np.float64),
+            "option_qty": pd.Series(dtype=np.float64),
+            "profit": pd.Series(dtype=np.float64),
+        })
+
+    first_date = np.datetime64(start, "D") if start is not None else batch.trade_date.min()
+    last_date = np.datetime64(end, "D") if end is not None else batch.trade_date.max()
+    if last_date < first_date:
+        raise ValueError(f"End date {end} is before start date {start}")
+    day_count = int((last_date - first_date).astype(np.int64)) + 1
+
+    effects = compute_trade_effects(batch)
+    log_trade_warnings(batch, effects)
+    symbols, groups = symbol_groups(batch)
+
+    # Day of each trade in the series, earlier trades count on the first day
+    days = np.maximum((batch.trade_date - first_date).astype(np.int64), 0)
+    in_range = days < day_count
+    cells = groups[in_range].astype(np.int64) * day_count + days[in_range]
+
+    # Daily changes per symbol, then running totals along the days
+    size = len(symbols) * day_count
+    columns = {}
+    for name, values in (
+        ("stock_qty", effects.stock_qty),
+        ("option_qty", effects.option_qty),
+        ("profit", effects.profit),
+    ):
+        daily = np.bincount(cells, weights=values[in_range], minlength=size).reshape(len(symbols), day_count)
+        columns[name] = np.cumsum(daily, axis=1).ravel()
+
+    dates = first_date + np.arange(day_count)
+    return pd.DataFrame({
+        "date": np.tile(dates, len(symbols)).astype("datetime64[ns]"),
+        "symbol": pd.Categorical.from_codes(np.repeat(np.arange(len(symbols)), day_count), categories=symbols),
+        **columns,
+    })
@@ -0,0 +1,143 @@
+"""Portfolio P&L under a grid of price shocks.
+
+This module values the current positions under moves of the underlying prices, e.g. every move from
+-30% to +30% in steps of 0.5%. A shock of s moves a symbol's price from p to p * (1 + s). Shocks
+are either market-wide, one row of shocks applied to every symbol, or per symbol, one row per
+position.
+
+The P&L of a position under a shock is, like `Position.profit`, the shocked price minus the adjusted
+buy-in times the stock quantity, plus the value of its open option legs. Option legs are valued at
+intrinsic value, what they are worth at expiration, times CONTRACT_MULTIPLIER shares per contract: short legs count
+as a liability, long legs as an asset. The P&L matrix of all positions and shocks is computed in a
+few array operations, without a loop over positions or shocks.
+
+Classes:
+    ScenarioGrid: P&L of each position under each price shock.
+
+Functions:
+    price_shock_grid: computes the P&L of the current positions under a grid of price shocks.
+"""
+import logging
+from typing import (
+    List,
+    Optional,
+    Sequence,
+)
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+)
+
+from trading_analytics.data.data_model.portfolio.position import Position
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.portfolio.option_contract import (
+    CONTRACT_MULTIPLIER,
+    CONTRACT_QUANTITY_EPSILON,
+    OptionContract,
+)
+
+logger = logging.getLogger(__name__)
+
+# Moves from -30% to +30% in steps of 0.5%
+DEFAULT_SHOCKS = np.linspace(-0.30, 0.30, 121)
+
+
+class ScenarioGrid(BaseModel):
+    """P&L of each position under each price shock.
+
+    Attributes:
+        symbols (List[str]): Symbols of the priced positions, in input order.
+        shocks (np.ndarray): Price shocks, of shape (number of shocks,) if market-wide, or
+            (len(symbols), number of shocks) if per symbol.
+        pnl (np.ndarray): Array of shape (len(symbols), number of shocks): P&L of each position under each shock.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True, frozen=True)
+
+    symbols: List[str]
+    shocks: np.ndarray
+    pnl: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        """P&L of the whole portfolio under each shock."""
+        return self.pnl.sum(axis=0)
+
+
+def price_shock_grid(
+    positions: Sequence[Position],
+    shocks: Optional[np.ndarray] = None,
+    option_legs: Sequence[OptionContract] = ()
+) -> ScenarioGrid:
+    """Computes the P&L of the current positions under a grid of price shocks.
+
+    Positions without a current price can't be shocked and are left out, logged as a warning.
+    Positions without an adjusted buy-in, e.g. with only options, are valued from their current
+    price, so their stock P&L is just the move.
+
+    Args:
+        positions (Sequence[Position]): Current positions, e.g. from `load_and_process_portfolio_data`.
+        shocks (Optional[np.ndarray]): Relative price moves, of shape (number of shocks,) to apply to every
+            symbol, or (len(positions), number of shocks) with one row per position. Defaults to
+            DEFAULT_SHOCKS.
+        option_legs (Sequence[OptionContract]): Option contracts of the positions, e.g. from
+            `match_option_contracts`. Contracts without open quantity or without a priced position are ignored.
+
+    Returns:
+        ScenarioGrid: P&L of each priced position under each shock.
+
+    Raises:
+        ValueError: If the shocks don't have one row per position.
+    """
+    shocks = DEFAULT_SHOCKS if shocks is None else np.asarray(shocks, dtype=np.float64)
+    if shocks.ndim == 2 and shocks.shape[0] != len(positions):
+        raise ValueError(f"Expected one row of shocks per position ({len(positions)}), got {shocks.shape[0]}")
+    if shocks.ndim not in (1, 2):
+        raise ValueError(f"Shocks must have one or two dimensions, got {shocks.ndim}")
+
+    priced = [index for index, position in enumerate(positions) if position.current_price is not None]
+    for position in positions:
+        if position.current_price is None:
+            logger.warning(f"No current price for {position.symbol}, leaving it out of the scenarios")
+
+    symbols = [positions[index].symbol for index in priced]
+    prices = np.array([positions[index].current_price for index in priced], dtype=np.float64)
+    buy_in = np.array([
+        positions[index].adjusted_buy_in
+        if positions[index].adjusted_buy_in is not None
+        else positions[index].current_price
+        for index in priced
+    ], dtype=np.float64)
+    stock_qty = np.array([positions[index].stock_qty for index in priced], dtype=np.float64)
+    if shocks.ndim == 2:
+        shocks = shocks[priced]
+
+    # Shocked price of each position under each shock
+    shocked_prices = prices[:, None] * (1.0 + shocks)
+    pnl = (shocked_prices - buy_in[:, None]) * stock_qty[:, None]
+
+    # Intrinsic value of the open option legs, added to their position's row
+    rows_by_symbol = {symbol: row for row, symbol in enumerate(symbols)}
+    legs = [
+        contract for contract in option_legs
+        if contract.open_quantity > CONTRACT_QUANTITY_EPSILON and contract.symbol in rows_by_symbol
+    ]
+    if legs:
+        rows = np.array([rows_by_symbol[contract.symbol] for contract in legs], dtype=np.int64)
+        strikes = np.array([contract.strike for contract in legs], dtype=np.float64)[:, None]
+        is_call = np.array([contract.option_type == OptionType.CALL for contract in legs])[:, None]
+        contracts = np.array([
+            -contract.open_quantity if contract.is_short else contract.open_quantity
+            for contract in legs
+        ], dtype=np.float64)[:, None]
+
+        leg_prices = shocked_prices[rows]
+        intrinsic = np.where(
+            is_call,
+            np.maximum(leg_prices - strikes, 0.0),
+            np.maximum(strikes - leg_prices, 0.0)
+        )
+        np.add.at(pnl, rows, contracts * CONTRACT_MULTIPLIER * intrinsic)
+
+    return ScenarioGrid(symbols=symbols, shocks=shocks, pnl=pnl)
@@ -0,0 +1,324 @@
+"""Memoization of portfolio engine results by trade collection.
+
+This module defines the `ProfitCache` class, a bounded LRU cache of `PortfolioEngineResult`s keyed by
+a fingerprint of the trade collection, so repeated calculations over an unchanged journal reuse one
+engine run.
+
+The fingerprint is a hash of the content of the trades, in order: the trade_id and the fields the
+engine reads (`ENGINE_FIELDS`). It doesn't depend on which objects hold the trades, so loading the
+same journal again hits the cache, and the cache keeps no reference to the trades. Trades are
+hashed in chunks, a column at a time, entries and batches alike, so a trade or a batch array
+changed in place gives a new fingerprint too. `invalidate` drops results explicitly, e.g. after
+changing how trades are processed. The fingerprint of the leading trades of a journal also
+validates engine checkpoints (see `engine_checkpoint`).
+
+Classes:
+    ProfitCache: Bounded LRU cache of portfolio engine results by trade collection.
+
+Functions:
+    trades_fingerprints: returns the fingerprints of leading parts of a trade collection.
+"""
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import (
+    ACTIONS,
+    NO_OPTION_TYPE,
+    OPTION_TYPES,
+    SECURITY_TYPES,
+    SUB_ACTIONS,
+    TradeBatch,
+)
+from trading_analytics.data.portfolio.symbol_result import SymbolResult
+from trading_analytics.journal.core.portfolio_engine import (
+    PortfolioEngineResult,
+    run_portfolio_engine,
+)
+from trading_analytics.journal.core.vectorized_profit import AMOUNT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+Trades = Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]
+
+# Default number of trade collections to keep results for
+MAX_ENTRIES = 8
+
+# Enum fields the results depend on, hashed as their codes in TradeBatch
+_CODED_FIELDS = {
+    "security": SECURITY_TYPES,
+    "option_type": OPTION_TYPES,
+    "action": ACTIONS,
+    "sub_action": SUB_ACTIONS,
+}
+
+# Number fields the results depend on: the quantity, the fees, and every amount a cash flow can be based on
+_NUMBER_FIELDS = ("quantity", "fees", *(field for field in AMOUNT_FIELDS if field is not None))
+
+# Trade fields the results depend on besides the trade_id, changing any other field reuses the result
+ENGINE_FIELDS = ("symbol", *_CODED_FIELDS, *_NUMBER_FIELDS)
+
+# Trades hashed per chunk
+FINGERPRINT_CHUNK_SIZE = 10_000
+
+# Code of each enum member (and of its value) by field, for hashing entries like batches
+_FIELD_CODES: Dict[str, Dict] = {
+    name: {member: code for code, member in enumerate(members)}
+    for name, members in _CODED_FIELDS.items()
+}
+_FIELD_CODES["option_type"][None] = NO_OPTION_TYPE
+
+
+def _chunk_columns(
+    trades: Trades,
+    start: int,
+    stop: int
+) -> Tuple[List[np.ndarray], List[str]]:
+    """Returns the values hashed for trades start to stop.
+
+    Batches and entries give the same values for the same trades: symbols are numbered in order of
+    first appearance in the chunk, and enums are hashed as their batch codes.
+
+    Args:
+        trades (Trades): Trades, as a batch or as trade entries.
+        start (int): Position of the first trade.
+        stop (int): Position after the last trade.
+
+    Returns:
+        Tuple[List[np.ndarray], List[str]]: Arrays of trade ids, symbol numbers, enum codes, and number
+            fields, and the symbols by number.
+    """
+    if isinstance(trades, TradeBatch):
+        symbol_numbers, symbol_codes = pd.factorize(trades.symbol_codes[start:stop], sort=False)
+        symbols = [trades.symbols[code] for code in symbol_codes]
+        columns = [trades.trade_id[start:stop], symbol_numbers.astype(np.int64)]
+        columns += [getattr(trades, name)[start:stop].astype(np.int8, copy=False) for name in _CODED_FIELDS]
+        columns += [getattr(trades, name)[start:stop].astype(np.float64, copy=False) for name in _NUMBER_FIELDS]
+        return columns, symbols
+
+    # Read the field values directly, getattr on a field the entry type lacks is slow in pydantic
+    records = [trade.__dict__ for trade in trades[start:stop]]
+    symbol_numbers, symbols = pd.factorize(pd.Series([record["symbol"] for record in records], dtype=object))
+    columns = [
+        np.array([record["trade_id"] for record in records], dtype=np.int64),
+        symbol_numbers.astype(np.int64),
+    ]
+    columns += [
+        np.array([codes[record.get(name)] for record in records], dtype=np.int8)
+        for name, codes in _FIELD_CODES.items()
+    ]
+    columns += [np.array([record.get(name, 0.0) for record in records], dtype=np.float64) for name in _NUMBER_FIELDS]
+
+    return columns, [str(symbol) for symbol in symbols]
+
+
+def _update_digest(
+    digest: "hashlib._Hash",
+    trades: Trades,
+    start: int,
+    stop: int
+) -> None:
+    """Adds trades start to stop to a hash."""
+    columns, symbols = _chunk_columns(trades, start, stop)
+    for column in columns:
+        digest.update(np.ascontiguousarray(column))
+    digest.update("\x1f".join(symbols).encode("utf-8"))
+    digest.update(b"\x1e")
+
+
+def trades_fingerprints(
+    trades: Trades,
+    lengths: Sequence[int]
+) -> List[str]:
+    """Returns the fingerprints of leading parts of a trade collection, in one pass over the trades.
+
+    The fingerprint of the first n trades is a hash of their trade ids and `ENGINE_FIELDS`, in order,
+    computed in chunks of FINGERPRINT_CHUNK_SIZE trades. It is the same for a batch and for entries
+    with the same values, and it doesn't depend on which objects hold the trades.
+
+    Args:
+        trades (Trades): Trades, as a batch or as trade entries.
+        lengths (Sequence[int]): Numbers of leading trades to fingerprint.
+
+    Returns:
+        List[str]: The fingerprint of each length.
+
+    Raises:
+        ValueError: If a length is negative or more than the number of trades.
+    """
+    count = len(trades)
+    if any(length < 0 or length > count for length in lengths):
+        raise ValueError(f"Fingerprint lengths must be between 0 and {count}, got {list(lengths)}")
+
+    wanted = set(lengths)
+    fingerprints: Dict[int, str] = {}
+    digest = hashlib.sha256()
+    start = 0
+    while True:
+        if start in wanted:
+            fingerprints[start] = digest.hexdigest()
+        if start >= max(wanted, default=0):
+            break
+
+        stop = min(start + FINGERPRINT_CHUNK_SIZE, count)
+        # A length that ends inside this chunk is hashed on a copy, its last chunk is then partial
+        for length in wanted:
+            if start < length < stop:
+                partial = digest.copy()
+                _update_digest(partial, trades, start, length)
+                fingerprints[length] = partial.hexdigest()
+        _update_digest(digest, trades, start, stop)
+        start = stop
+
+    return [fingerprints[length] for length in lengths]
+
+
+class ProfitCache:
+    """Bounded LRU cache of portfolio engine results by trade collection.
+
+    Results are copied on the way out, so changing a returned result doesn't change the cache.
+    """
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES
+    ) -> None:
+        """Creates an empty cache.
+
+        Args:
+            max_entries (int): Number of trade collections to keep results for, the least recently used
+                is evicted first.
+
+        Raises:
+            ValueError: If max_entries is not positive.
+        """
+        if max_entries <= 0:
+            raise ValueError(f"Cache size must be positive, got {max_entries}")
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, PortfolioEngineResult]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns the number of cached trade collections."""
+        return len(self._entries)
+
+    @staticmethod
+    def fingerprint(
+        trades: Trades
+    ) -> str:
+        """Returns the fingerprint of a trade collection: a hash of its trades' content, in order.
+
+        Args:
+            trades (Trades): Trades, as a batch or as trade entries.
+
+        Returns:
+            str: The fingerprint, see `trades_fingerprints`.
+        """
+        return trades_fingerprints(trades, [len(trades)])[0]
+
+    def _result(
+        self,
+        trades: Trades
+    ) -> PortfolioEngineResult:
+        """Returns the cached engine result of a trade collection, running the engine on a miss."""
+        key = self.fingerprint(trades)
+        result = self._entries.get(key)
+        if result is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self._entries[key] = run_portfolio_engine(trades)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return result
+
+    def engine_result(
+        self,
+        trades: Trades
+    ) -> PortfolioEngineResult:
+        """Returns the engine result of a trade collection, running the engine if it is not cached.
+
+        Args:
+            trades (Trades): Trades, as a batch or as trade entries.
+
+        Returns:
+            PortfolioEngineResult: A copy of the result of `run_portfolio_engine` over the trades.
+        """
+        return self._result(trades).model_copy(deep=True)
+
+    def qty_and_profit(
+        self,
+        trades: Trades
+    ) -> Dict[str, SymbolResult]:
+        """Cached `calculate_qty_and_profit`.
+
+        Args:
+            trades (Trades): Trades, as a batch or as trade entries.
+
+        Returns:
+            Dict[str, SymbolResult]: Profit, stock quantity, and option quantity by symbol.
+        """
+        return {
+            symbol: result.model_copy()
+            for symbol, result in self._result(trades).symbol_results.items()
+        }
+
+    def original_buy_in(
+        self,
+        trades: Trades
+    ) -> Dict[str, float]:
+        """Cached `calculate_original_buy_in`.
+
+        Args:
+            trades (Trades): Trades, as a batch or as trade entries.
+
+        Returns:
+            Dict[str, float]: Original buy-in by symbol.
+        """
+        return self._result(trades).original_buy_in()
+
+    def adjusted_buy_in(
+        self,
+        trades: Trades
+    ) -> Dict[str, float]:
+        """Cached `calculate_adjusted_buy_in`.
+
+        Args:
+            trades (Trades): Trades, as a batch or as trade entries.
+
+        Returns:
+            Dict[str, float]: Adjusted buy-in by symbol.
+        """
+        return self._result(trades).adjusted_buy_in()
+
+    def invalidate(
+        self,
+        trades: Optional[Trades] = None
+    ) -> None:
+        """Drops the cached result of a trade collection, or all cached results.
+
+        Args:
+            trades (Optional[Trades]): Trades to drop the result of. Drops everything if None.
+        """
+        if trades is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(self.fingerprint(trades), None)
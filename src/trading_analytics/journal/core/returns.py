@@ -0,0 +1,232 @@
+"""Money-weighted (XIRR) and time-weighted returns.
+
+The money-weighted return of a group of trades, e.g. a symbol, strategy, or account, is the annual
+rate r that makes the net present value of its dated cash flows zero (XIRR):
+
+    sum(amount_i / (1 + r) ** (days_i / 365)) = 0
+
+where days_i counts from the group's first cash flow. Each trade's cash flow is its profit effect in
+`calculate_qty_and_profit`: stock buys and premiums paid are outflows, sales, premiums received, and
+dividends inflows, net of fees. Open positions need their current value as a final inflow, or the
+rate only reflects the cash flows so far.
+
+All groups are solved at once on arrays, with a safeguarded Newton method: each group's root is
+first bracketed on a grid of rates, taking the sign change nearest zero, and Newton steps that leave
+the bracket are replaced by bisection. Groups without a sign change, e.g. with only outflows, have
+no rate and get NaN.
+
+The time-weighted return chains the daily returns of a valuation series, with external cash flows
+taken out, so deposits and withdrawals don't count as performance.
+
+Functions:
+    solve_xirr: solves the XIRR of many cash flow series at once.
+    money_weighted_returns: computes the XIRR of the trades by a combination of dimensions.
+    time_weighted_return: chains the daily returns of a valuation series.
+"""
+import logging
+from datetime import date
+from typing import (
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.rollups import (
+    DIMENSIONS,
+    group_rows,
+)
+from trading_analytics.journal.core.vectorized_profit import (
+    compute_trade_effects,
+    log_trade_warnings,
+)
+
+logger = logging.getLogger(__name__)
+
+DAYS_PER_YEAR = 365.0
+
+# Rates the roots are bracketed on, from -99% to +10,000% a year
+_RATE_GRID = np.array([-0.99, -0.9, -0.75, -0.5, -0.25, -0.1, 0.0, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 100.0])
+
+Trades = Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]
+
+
+def _npv(
+    rates: np.ndarray,
+    groups: np.ndarray,
+    years: np.ndarray,
+    amounts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the net present value of each group at its rate, and its derivative by the rate."""
+    group_rates = rates[groups]
+    discounted = amounts * np.exp(-years * np.log1p(group_rates))
+    group_count = len(rates)
+
+    return (
+        np.bincount(groups, weights=discounted, minlength=group_count),
+        np.bincount(groups, weights=-years * discounted / (1.0 + group_rates), minlength=group_count),
+    )
+
+
+def solve_xirr(
+    groups: np.ndarray,
+    days: np.ndarray,
+    amounts: np.ndarray,
+    group_count: int,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100
+) -> np.ndarray:
+    """Solves the XIRR of many cash flow series at once.
+
+    Args:
+        groups (np.ndarray): Series of each cash flow, from 0 to group_count - 1.
+        days (np.ndarray): Day number of each cash flow, e.g. days since 1970-01-01.
+        amounts (np.ndarray): Amount of each cash flow, negative for outflows.
+        group_count (int): Number of series.
+        tolerance (float): Relative change of the rates at which to stop.
+        max_iterations (int): Most Newton or bisection steps.
+
+    Returns:
+        np.ndarray: Annual rate of each series, NaN for series without one.
+    """
+    groups = np.asarray(groups, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    amounts = np.asarray(amounts, dtype=np.float64)
+
+    # Years since the first cash flow of each series
+    first_day = np.full(group_count, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first_day, groups, days)
+    years = (days - first_day[groups]) / DAYS_PER_YEAR
+
+    # Bracket each root on the grid, taking the sign change nearest a rate of zero
+    grid_values = np.array([
+        _npv(np.full(group_count, rate), groups, years, amounts)[0]
+        for rate in _RATE_GRID
+    ])
+    signs = np.sign(grid_values)
+    changes = (signs[:-1] != signs[1:]) | (signs[:-1] == 0)
+    distance = np.abs(_RATE_GRID[:-1] + _RATE_GRID[1:])[:, None]
+    interval = np.argmin(np.where(changes, distance, np.inf), axis=0)
+    has_root = changes.any(axis=0)
+
+    columns = np.arange(group_count)
+    low = _RATE_GRID[interval]
+    high = _RATE_GRID[interval + 1]
+    value_low = grid_values[interval, columns]
+    rates = (low + high) / 2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_iterations):
+            value, derivative = _npv(rates, groups, years, amounts)
+
+            # Keep the root between low and high
+            below = np.sign(value) == np.sign(value_low)
+            low = np.where(below, rates, low)
+            value_low = np.where(below, value, value_low)
+            high = np.where(below, high, rates)
+
+            newton = rates - value / derivative
+            inside = np.isfinite(newton) & (newton > low) & (newton < high)
+            next_rates = np.where(inside, newton, (low + high) / 2)
+
+            converged = (np.abs(next_rates - rates) <= tolerance * (1.0 + np.abs(rates))) | (value == 0)
+            rates = np.where(value == 0, rates, next_rates)
+            if np.all(converged | ~has_root):
+                break
+
+    return np.where(has_root, rates, np.nan)
+
+
+def money_weighted_returns(
+    trades: Trades,
+    by: Sequence[str] = ("symbol",),
+    terminal_values: Optional[Dict[Tuple, float]] = None,
+    as_of: Optional[date] = None
+) -> Dict[Tuple, float]:
+    """Computes the XIRR of the trades by a combination of dimensions.
+
+    Args:
+        trades (Trades): Trades to compute the returns of, as a batch or as trade entries.
+        by (Sequence[str]): Dimensions to group by, some of DIMENSIONS (see `rollups`).
+        terminal_values (Optional[Dict[Tuple, float]]): Current value of the open positions of each group, keyed
+            like the result, e.g. {("AAPL",): 15000.0}. Added as an inflow on the as-of date.
+        as_of (Optional[date]): Date of the terminal values. Defaults to the last trade date.
+
+    Returns:
+        Dict[Tuple, float]: Annual rate by the tuple of dimension values, in order of first appearance. NaN for
+            groups without a rate.
+
+    Raises:
+        ValueError: If a dimension is unknown or repeated.
+    """
+    unknown = [dimension for dimension in by if dimension not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown return dimensions {unknown}, expected some of {list(DIMENSIONS)}")
+    if len(set(by)) != len(by):
+        raise ValueError(f"Repeated return dimension in {list(by)}")
+
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0:
+        return {}
+
+    effects = compute_trade_effects(batch)
+    log_trade_warnings(batch, effects)
+
+    rows, groups, group_keys = group_rows(batch, by)
+    days = batch.trade_date[rows].astype(np.int64)
+    amounts = effects.profit[rows]
+
+    if terminal_values:
+        group_of_key = {key: group for group, key in enumerate(group_keys)}
+        for key in terminal_values:
+            if key not in group_of_key:
+                logger.warning(f"Ignoring terminal value of {key}, which has no trades")
+        terminal = [(group_of_key[key], value) for key, value in terminal_values.items() if key in group_of_key]
+
+        terminal_day = np.datetime64(as_of, "D") if as_of is not None else batch.trade_date.max()
+        groups = np.concatenate([groups, np.array([group for group, _ in terminal], dtype=np.int64)])
+        days = np.concatenate([days, np.full(len(terminal), terminal_day.astype(np.int64))])
+        amounts = np.concatenate([amounts, np.array([value for _, value in terminal], dtype=np.float64)])
+
+    rates = solve_xirr(groups, days, amounts, len(group_keys))
+
+    return dict(zip(group_keys, rates.tolist()))
+
+
+def time_weighted_return(
+    values: Union[pd.Series, pd.DataFrame],
+    flows: Optional[Union[pd.Series, pd.DataFrame]] = None
+) -> Union[float, pd.Series]:
+    """Chains the daily returns of a valuation series.
+
+    The return of each day is (value - flow) / previous value - 1, with the day's external flow
+    (deposits positive, withdrawals negative) included in its closing value. Days after a zero or
+    missing value don't count.
+
+    Args:
+        values (Union[pd.Series, pd.DataFrame]): Closing value by date, or one column per portfolio.
+        flows (Optional[Union[pd.Series, pd.DataFrame]]): External cash flows by date, like the values. Dates
+            without flows count as zero.
+
+    Returns:
+        Union[float, pd.Series]: Total return over the series, or one per column.
+    """
+    values = values.sort_index()
+    if flows is None:
+        flows = 0.0
+    else:
+        flows = flows.reindex(values.index).fillna(0.0)
+
+    previous = values.shift(1)
+    growth = ((values - flows) / previous).where(previous > 0, 1.0)
+    total = growth.prod() - 1.0
+
+    return float(total) if isinstance(values, pd.Series) else total
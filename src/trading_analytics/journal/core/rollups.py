@@ -0,0 +1,235 @@
+"""Profit and quantity rollups over any combination of trade dimensions.
+
+This module aggregates the per-trade profit, stock quantity, and option quantity of the portfolio
+engine by any combination of symbol, strategy, strategy_id, account, and brokerage. Each trade's
+effects are computed once; every requested grouping is then a grouped sum over integer keys.
+
+A trade can have several strategies. For groupings that include the strategy, the trade counts
+towards each of its strategies: the strategy lists are expanded through the batch's sparse
+strategy index (one row per trade and strategy, pointing back at the trade) instead of copying
+trades. Trades without a strategy are grouped under None. Because of this, strategy totals can add
+up to more than the portfolio total.
+
+Functions:
+    group_rows: assigns the aggregation rows of a batch to groups by a combination of dimensions.
+    rollup: aggregates profit and quantities by a combination of dimensions.
+    rollups: aggregates profit and quantities for several combinations of dimensions at once.
+"""
+import logging
+from typing import (
+    Any,
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.portfolio.symbol_result import SymbolResult
+from trading_analytics.journal.core.vectorized_profit import (
+    TradeEffects,
+    compute_trade_effects,
+    group_sums,
+    log_trade_warnings,
+)
+
+logger = logging.getLogger(__name__)
+
+# Dimensions trades can be grouped by
+DIMENSIONS = ("symbol", "strategy", "strategy_id", "account", "brokerage")
+
+Trades = Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]
+
+
+def _rows(
+    batch: TradeBatch,
+    explode_strategies: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the trade of each aggregation row, and its strategy code if strategies are expanded.
+
+    Args:
+        batch (TradeBatch): Trades to group.
+        explode_strategies (bool): Whether to make one row per trade and strategy.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Trade position of each row, and strategy code of each row (-1 for trades
+            without a strategy, or for every row if strategies are not expanded).
+    """
+    if not explode_strategies:
+        return np.arange(len(batch)), np.full(len(batch), -1, dtype=np.int64)
+
+    # Trades without a strategy still get one row
+    lengths = np.diff(batch.strategy_indptr)
+    row_counts = np.maximum(lengths, 1)
+    trades = np.repeat(np.arange(len(batch)), row_counts)
+    strategy_codes = np.full(len(trades), -1, dtype=np.int64)
+    strategy_codes[np.repeat(lengths > 0, row_counts)] = batch.strategy_indices
+
+    return trades, strategy_codes
+
+
+def _dimension_codes(
+    batch: TradeBatch,
+    dimension: str,
+    trades: np.ndarray,
+    strategy_codes: np.ndarray
+) -> Tuple[np.ndarray, List[Any]]:
+    """Returns the code of each aggregation row for one dimension, and the value of each code.
+
+    Args:
+        batch (TradeBatch): Trades to group.
+        dimension (str): One of DIMENSIONS.
+        trades (np.ndarray): Trade position of each row.
+        strategy_codes (np.ndarray): Strategy code of each row.
+
+    Returns:
+        Tuple[np.ndarray, List[Any]]: Non-negative code of each row, and the dimension value of each code.
+    """
+    if dimension == "symbol":
+        return batch.symbol_codes[trades], list(batch.symbols)
+    if dimension == "account":
+        return batch.account_codes[trades], list(batch.accounts)
+    if dimension == "brokerage":
+        return batch.brokerage_codes[trades], list(batch.brokerages)
+    if dimension == "strategy_id":
+        codes, values = pd.factorize(batch.strategy_id[trades], sort=False)
+        return codes, values.tolist()
+
+    # Shift so trades without a strategy (-1) get code 0
+    return strategy_codes + 1, [None] + list(batch.strategies)
+
+
+def group_rows(
+    batch: TradeBatch,
+    by: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray, List[Tuple]]:
+    """Assigns the aggregation rows of a batch to groups by a combination of dimensions.
+
+    There is one row per trade, or per trade and strategy if the strategy is one of the dimensions.
+
+    Args:
+        batch (TradeBatch): Trades to group.
+        by (Sequence[str]): Dimensions to group by, some of DIMENSIONS.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, List[Tuple]]: Trade position of each row, group of each row, and the tuple
+            of dimension values of each group, in order of first appearance.
+    """
+    trades, strategy_codes = _rows(batch, "strategy" in by)
+
+    # Combine the dimension codes of each row into one integer key
+    key = np.zeros(len(trades), dtype=np.int64)
+    dimension_values = []
+    for dimension in by:
+        codes, values = _dimension_codes(batch, dimension, trades, strategy_codes)
+        key = key * max(len(values), 1) + codes
+        dimension_values.append(values)
+    groups, keys = pd.factorize(key, sort=False)
+
+    # Decode each group's key back into dimension values
+    group_codes = []
+    remaining = np.asarray(keys, dtype=np.int64)
+    for values in reversed(dimension_values):
+        radix = max(len(values), 1)
+        group_codes.append((remaining % radix).tolist())
+        remaining = remaining // radix
+    group_codes.reverse()
+
+    group_keys = [
+        tuple(values[codes[index]] for values, codes in zip(dimension_values, group_codes))
+        for index in range(len(keys))
+    ]
+
+    return trades, groups, group_keys
+
+
+def _grouped(
+    batch: TradeBatch,
+    effects: TradeEffects,
+    by: Sequence[str]
+) -> Dict[Tuple, SymbolResult]:
+    """Aggregates already computed trade effects by a combination of dimensions.
+
+    Args:
+        batch (TradeBatch): Trades to group.
+        effects (TradeEffects): Their effects from `compute_trade_effects`.
+        by (Sequence[str]): Dimensions to group by.
+
+    Returns:
+        Dict[Tuple, SymbolResult]: Totals keyed by the tuple of dimension values, in order of first appearance.
+    """
+    trades, groups, group_keys = group_rows(batch, by)
+
+    totals = [
+        group_sums(groups, len(group_keys), values[trades])
+        for values in (effects.profit, effects.stock_qty, effects.option_qty)
+    ]
+
+    return {
+        group_key: SymbolResult(profit=profit, stock_qty=stock_qty, option_qty=option_qty)
+        for group_key, profit, stock_qty, option_qty in zip(group_keys, *totals)
+    }
+
+
+def rollups(
+    trades: Trades,
+    groupings: Sequence[Sequence[str]]
+) -> Dict[Tuple[str, ...], Dict[Tuple, SymbolResult]]:
+    """Aggregates profit and quantities for several combinations of dimensions at once.
+
+    The trade effects are computed once and shared by every grouping. Grouping by ("symbol",) gives
+    the same totals as `calculate_qty_and_profit`, keyed by 1-tuples.
+
+    Args:
+        trades (Trades): Trades to aggregate, as a batch or as trade entries.
+        groupings (Sequence[Sequence[str]]): Combinations of DIMENSIONS, e.g. [("strategy",), ("account", "symbol")].
+            An empty combination gives the portfolio total under the key ().
+
+    Returns:
+        Dict[Tuple[str, ...], Dict[Tuple, SymbolResult]]: For each grouping, the totals keyed by the tuple of
+            dimension values, in order of first appearance.
+
+    Raises:
+        ValueError: If a grouping has an unknown or repeated dimension.
+    """
+    for by in groupings:
+        unknown = [dimension for dimension in by if dimension not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown rollup dimensions {unknown}, expected some of {list(DIMENSIONS)}")
+        if len(set(by)) != len(by):
+            raise ValueError(f"Repeated rollup dimension in {list(by)}")
+
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0:
+        return {tuple(by): {} for by in groupings}
+
+    effects = compute_trade_effects(batch)
+    log_trade_warnings(batch, effects)
+
+    return {tuple(by): _grouped(batch, effects, by) for by in groupings}
+
+
+def rollup(
+    trades: Trades,
+    by: Sequence[str]
+) -> Dict[Tuple, SymbolResult]:
+    """Aggregates profit and quantities by a combination of dimensions.
+
+    Args:
+        trades (Trades): Trades to aggregate, as a batch or as trade entries.
+        by (Sequence[str]): Dimensions to group by, some of DIMENSIONS.
+
+    Returns:
+        Dict[Tuple, SymbolResult]: Totals keyed by the tuple of dimension values, in order of first appearance.
+
+    Raises:
+        ValueError: If a dimension is unknown or repeated.
+    """
+    return rollups(trades, [by])[tuple(by)]
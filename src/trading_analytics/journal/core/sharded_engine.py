@@ -0,0 +1,138 @@
+"""Portfolio engine run in parallel over shards of symbols.
+
+Per-symbol totals only depend on the trades of that symbol, so the trades can be split by symbol
+and the parts run independently. This module assigns each symbol to one of N shards by a CRC32
+hash of its name, runs the portfolio engine on each shard in a process pool, and merges the
+per-shard results. Within a shard the trades keep their journal order, so the merged result is
+identical to `run_portfolio_engine` over all trades, including the symbol order. Warnings for
+unexpected trades are logged by the worker processes.
+
+The default worker count comes from the TRADING_ANALYTICS_ENGINE_WORKERS environment variable,
+or the number of CPUs. With one worker or one shard the engine runs in the calling process.
+
+Functions:
+    shard_of_symbols: assigns symbols to shards by a stable hash of their name.
+    run_portfolio_engine_sharded: runs the portfolio engine over symbol shards in a process pool.
+"""
+import logging
+import os
+import zlib
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+)
+from typing import (
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.portfolio_engine import (
+    PortfolioEngineResult,
+    run_portfolio_engine,
+)
+from trading_analytics.journal.core.vectorized_profit import symbol_groups
+
+logger = logging.getLogger(__name__)
+
+
+def _default_workers() -> int:
+    """Returns the worker count from TRADING_ANALYTICS_ENGINE_WORKERS, or the number of CPUs."""
+    value = os.environ.get("TRADING_ANALYTICS_ENGINE_WORKERS", "")
+    if value.strip():
+        try:
+            return max(int(value), 1)
+        except ValueError:
+            logger.warning(f"Ignoring invalid TRADING_ANALYTICS_ENGINE_WORKERS value '{value}'")
+
+    return os.cpu_count() or 1
+
+
+def shard_of_symbols(
+    symbols: Sequence[str],
+    shard_count: int
+) -> np.ndarray:
+    """Assigns symbols to shards by a stable hash of their name.
+
+    CRC32 is used instead of `hash`, which differs between processes, so a symbol always lands in
+    the same shard.
+
+    Args:
+        symbols (Sequence[str]): Symbols to assign.
+        shard_count (int): Number of shards.
+
+    Returns:
+        np.ndarray: Shard of each symbol, from 0 to shard_count - 1.
+    """
+    return np.array([zlib.crc32(symbol.encode("utf-8")) % shard_count for symbol in symbols], dtype=np.int64)
+
+
+def run_portfolio_engine_sharded(
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]],
+    workers: Optional[int] = None,
+    shard_count: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> PortfolioEngineResult:
+    """Runs the portfolio engine over symbol shards in a process pool.
+
+    Args:
+        trades (Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]): Trades to
+            process, as a batch or as trade entries.
+        workers (Optional[int]): Number of worker processes. Defaults to TRADING_ANALYTICS_ENGINE_WORKERS or
+            the number of CPUs. Ignored if an executor is given.
+        shard_count (Optional[int]): Number of shards. Defaults to the number of workers.
+        executor (Optional[Executor]): Pool to run the shards in, e.g. to share one pool across portfolios.
+            A pool is created and shut down per call if not given.
+
+    Returns:
+        PortfolioEngineResult: The same result as `run_portfolio_engine` over all trades.
+
+    Raises:
+        ValueError: If workers or shard_count is not positive.
+    """
+    if workers is None:
+        workers = _default_workers()
+    if workers <= 0:
+        raise ValueError(f"Worker count must be positive, got {workers}")
+    if shard_count is None:
+        shard_count = workers
+    if shard_count <= 0:
+        raise ValueError(f"Shard count must be positive, got {shard_count}")
+
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0 or shard_count == 1 or (workers == 1 and executor is None):
+        return run_portfolio_engine(batch)
+
+    # Shard of each trade, from the shard of its symbol
+    trade_shards = shard_of_symbols(batch.symbols, shard_count)[batch.symbol_codes]
+    shards: List[TradeBatch] = [
+        batch.take(trade_shards == shard)
+        for shard in range(shard_count)
+        if np.any(trade_shards == shard)
+    ]
+
+    if executor is not None:
+        shard_results = list(executor.map(run_portfolio_engine, shards))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as pool:
+            shard_results = list(pool.map(run_portfolio_engine, shards))
+
+    # Symbols are disjoint across shards, put them back in order of first appearance in all trades
+    symbol_results = {}
+    buy_in_data = {}
+    for result in shard_results:
+        symbol_results.update(result.symbol_results)
+        buy_in_data.update(result.buy_in_data)
+    symbols, _ = symbol_groups(batch)
+
+    return PortfolioEngineResult(
+        symbol_results={symbol: symbol_results[symbol] for symbol in symbols},
+        buy_in_data={symbol: buy_in_data[symbol] for symbol in symbols},
+    )
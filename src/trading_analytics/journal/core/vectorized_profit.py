@@ -0,0 +1,463 @@
+"""Vectorized calculation of trading profits and quantities.
+
+This module computes the same per-symbol profit, stock quantity, and option quantity as
+`calculate_profit.calculate_qty_and_profit`, but on whole NumPy arrays. The if/elif chain of the
+per-trade loop is written once, in `trade_effect`, as a rule mapping a (security, option type,
+action, sub-action) combination to coefficients: shares and contracts per unit of quantity, the
+sign and multiplier of the cash flow, which amount field the cash flow is based on, and whether
+fees are charged. The rule is evaluated for every combination of enum codes up front, so the
+trades are processed with one table lookup and a few array operations, and the per-symbol totals
+with grouped sums.
+
+Results match the per-trade loop exactly: the per-trade values are computed with the same floating
+point operations, totals are summed in trade order, symbols appear in order of first appearance,
+and the same warnings are logged for combinations the loop does not handle.
+
+Classes:
+    TradeEffect: Coefficients for the effect of one kind of trade on quantities and cash.
+    TradeEffects: Per-trade stock quantity, option quantity, and profit arrays.
+
+Functions:
+    trade_effect: returns the effect coefficients for a security, option type, action, and sub-action.
+    trade_codes: returns the index of one kind of trade into the rule tables.
+    rule_index: returns the index of every trade of a batch into the rule tables.
+    effect_coefficients: looks up the effect coefficients of every trade of a batch.
+    effect_values: computes stock quantity, option quantity, and profit from effect coefficients.
+    compute_trade_effects: computes the per-trade effects of a batch of trades.
+    log_trade_warnings: logs the per-trade loop's warnings for unexpected combinations.
+    log_warning_codes: logs the per-trade loop's warnings from per-trade warning codes.
+    symbol_groups: numbers the symbols of a batch in order of first appearance.
+    group_sums: sums values by group in trade order.
+    calculate_qty_and_profit_vectorized: calculates profit, stock quantity, and option quantity by symbol.
+"""
+import logging
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+)
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import (
+    ACTIONS,
+    OPTION_TYPES,
+    SECURITY_TYPES,
+    SUB_ACTIONS,
+    TradeBatch,
+)
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.data.portfolio.option_contract import CONTRACT_MULTIPLIER
+from trading_analytics.data.portfolio.symbol_result import SymbolResult
+
+logger = logging.getLogger(__name__)
+
+# Amount fields a cash flow can be based on, index 0 means the trade has no cash flow
+AMOUNT_FIELDS = [None, "price_per_share", "dividend_amount", "premium", "strike"]
+
+
+class TradeEffect(BaseModel):
+    """Coefficients for the effect of one kind of trade on quantities and cash.
+
+    For a trade with quantity q, fees f and amount a (the field named by `amount`):
+        stock_qty = stock_qty_per_unit * q
+        option_qty = option_qty_per_unit * q
+        profit = cash_sign * (q * a * multiplier) - f, or cash_sign * a - f if `per_unit` is False
+
+    Attributes:
+        stock_qty_per_unit (float): Shares gained per unit of quantity.
+        option_qty_per_unit (float): Contracts gained per unit of quantity.
+        amount (Optional[str]): Amount field of the cash flow, None if the trade has no cash flow (and no fees).
+        cash_sign (float): 1.0 for cash received, -1.0 for cash paid.
+        multiplier (float): Shares per unit of quantity the amount applies to (CONTRACT_MULTIPLIER for
+            option contracts).
+        per_unit (bool): Whether the amount is per unit of quantity (False for dividends).
+        warning (Optional[str]): 'action' or 'security' if the combination is unexpected and a warning is logged.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    stock_qty_per_unit: float = 0.0
+    option_qty_per_unit: float = 0.0
+    amount: Optional[str] = None
+    cash_sign: float = 0.0
+    multiplier: float = 1.0
+    per_unit: bool = True
+    warning: Optional[str] = None
+
+
+def trade_effect(
+    security: SecurityType,
+    option_type: Optional[OptionType],
+    action: Action,
+    sub_action: SubAction
+) -> TradeEffect:
+    """Returns the effect coefficients for a security, option type, action, and sub-action.
+
+    This is the single definition of how each kind of trade changes quantities and profit.
+
+    Args:
+        security (SecurityType): Security type of the trade.
+        option_type (Optional[OptionType]): Option type, None for trades that are not options.
+        action (Action): Trade action.
+        sub_action (SubAction): Trade sub-action.
+
+    Returns:
+        TradeEffect: The coefficients, all zero for combinations that don't change anything.
+    """
+    opening = sub_action == SubAction.OPEN
+    closing = sub_action == SubAction.CLOSE
+
+    # Stock/ETF is only bought or sold
+    if security in [SecurityType.STOCK, SecurityType.ETF]:
+        if action == Action.BUY:
+            return TradeEffect(stock_qty_per_unit=1.0, amount="price_per_share", cash_sign=-1.0)
+        if action == Action.SELL:
+            return TradeEffect(stock_qty_per_unit=-1.0, amount="price_per_share", cash_sign=1.0)
+        return TradeEffect(warning="action")
+
+    # Dividend amount is the total received
+    if security == SecurityType.DIVIDEND:
+        return TradeEffect(amount="dividend_amount", cash_sign=1.0, per_unit=False)
+
+    if security == SecurityType.OPTION:
+        if option_type == OptionType.CALL:
+            if action == Action.SELL and (opening or closing):
+                return TradeEffect(option_qty_per_unit=1.0 if opening else -1.0, amount="premium",
+                                   cash_sign=1.0, multiplier=CONTRACT_MULTIPLIER)
+            if action == Action.BUY and (opening or closing):
+                return TradeEffect(option_qty_per_unit=1.0 if opening else -1.0, amount="premium",
+                                   cash_sign=-1.0, multiplier=CONTRACT_MULTIPLIER)
+            if action == Action.OPTION_EXPIRED:
+                return TradeEffect(option_qty_per_unit=-1.0)
+            if action == Action.OPTION_ASSIGNED:
+                return TradeEffect(stock_qty_per_unit=-CONTRACT_MULTIPLIER, option_qty_per_unit=-1.0,
+                                   amount="strike", cash_sign=1.0, multiplier=CONTRACT_MULTIPLIER)
+            if action == Action.OPTION_EXERCISED:
+                return TradeEffect(stock_qty_per_unit=CONTRACT_MULTIPLIER, option_qty_per_unit=-1.0,
+                                   amount="strike", cash_sign=-1.0, multiplier=CONTRACT_MULTIPLIER)
+            return TradeEffect(warning="action")
+
+        if option_type == OptionType.PUT:
+            if action == Action.BUY and opening:
+                return TradeEffect(option_qty_per_unit=1.0, amount="premium", cash_sign=-1.0,
+                                   multiplier=CONTRACT_MULTIPLIER)
+            if action == Action.SELL and closing:
+                return TradeEffect(option_qty_per_unit=-1.0, amount="premium", cash_sign=1.0,
+                                   multiplier=CONTRACT_MULTIPLIER)
+            if action == Action.OPTION_EXPIRED:
+                return TradeEffect(option_qty_per_unit=-1.0)
+            if action == Action.OPTION_ASSIGNED:
+                return TradeEffect(stock_qty_per_unit=CONTRACT_MULTIPLIER, option_qty_per_unit=-1.0,
+                                   amount="strike", cash_sign=-1.0, multiplier=CONTRACT_MULTIPLIER)
+            return TradeEffect(warning="action")
+
+        # Options without an option type are skipped silently, like the per-trade loop
+        return TradeEffect()
+
+    return TradeEffect(warning="security")
+
+
+def _effect_table() -> Dict[str, np.ndarray]:
+    """Evaluates `trade_effect` for every combination of enum codes.
+
+    Returns:
+        Dict[str, np.ndarray]: Arrays indexed by [security, option_type + 1, action, sub_action] codes, the
+            option type is shifted so NO_OPTION_TYPE (-1) is index 0.
+    """
+    shape = (len(SECURITY_TYPES), len(OPTION_TYPES) + 1, len(ACTIONS), len(SUB_ACTIONS))
+    table = {
+        "stock_qty_per_unit": np.zeros(shape),
+        "option_qty_per_unit": np.zeros(shape),
+        "amount": np.zeros(shape, dtype=np.int8),
+        "cash_sign": np.zeros(shape),
+        "multiplier": np.ones(shape),
+        "per_unit": np.ones(shape, dtype=bool),
+        "warning": np.zeros(shape, dtype=np.int8),
+    }
+    warnings = {None: 0, "action": 1, "security": 2}
+
+    option_types = (None,) + OPTION_TYPES
+    for index in np.ndindex(*shape):
+        security, option_type, action, sub_action = index
+        effect = trade_effect(
+            SECURITY_TYPES[security], option_types[option_type], ACTIONS[action], SUB_ACTIONS[sub_action]
+        )
+        table["stock_qty_per_unit"][index] = effect.stock_qty_per_unit
+        table["option_qty_per_unit"][index] = effect.option_qty_per_unit
+        table["amount"][index] = AMOUNT_FIELDS.index(effect.amount)
+        table["cash_sign"][index] = effect.cash_sign
+        table["multiplier"][index] = effect.multiplier
+        table["per_unit"][index] = effect.per_unit
+        table["warning"][index] = warnings[effect.warning]
+
+    return table
+
+
+_EFFECT_TABLE = _effect_table()
+
+
+class TradeEffects(BaseModel):
+    """Per-trade stock quantity, option quantity, and profit arrays.
+
+    Attributes:
+        stock_qty (np.ndarray): Shares gained by each trade.
+        option_qty (np.ndarray): Contracts gained by each trade.
+        profit (np.ndarray): Cash received (positive) or paid (negative) by each trade, net of fees.
+        warning (np.ndarray): int8 warning kind of each trade, 0 for none, 1 for an unexpected action,
+            2 for an unexpected security type.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    stock_qty: np.ndarray
+    option_qty: np.ndarray
+    profit: np.ndarray
+    warning: np.ndarray
+
+
+def trade_codes(
+    security: SecurityType,
+    option_type: Optional[OptionType],
+    action: Action,
+    sub_action: SubAction
+) -> Tuple[int, int, int, int]:
+    """Returns the index of one kind of trade into the rule tables, like `rule_index` for a batch.
+
+    Args:
+        security (SecurityType): Security type of the trade.
+        option_type (Optional[OptionType]): Option type, None for trades that are not options.
+        action (Action): Trade action.
+        sub_action (SubAction): Trade sub-action.
+
+    Returns:
+        Tuple[int, int, int, int]: Security, option type + 1, action, and sub-action codes.
+    """
+    return (
+        SECURITY_TYPES.index(security),
+        0 if option_type is None else OPTION_TYPES.index(option_type) + 1,
+        ACTIONS.index(action),
+        SUB_ACTIONS.index(sub_action),
+    )
+
+
+def rule_index(
+    trades: Union[TradeBatch, Tuple[int, int, int, int]]
+) -> Tuple:
+    """Returns the index of every trade of a batch into the rule tables.
+
+    Args:
+        trades (Union[TradeBatch, Tuple[int, int, int, int]]): A batch, or the `trade_codes` of one kind of trade.
+
+    Returns:
+        Tuple: Security, option type + 1, action, and sub-action codes, as arrays for a batch.
+    """
+    if isinstance(trades, tuple):
+        return trades
+
+    return trades.security, trades.option_type + 1, trades.action, trades.sub_action
+
+
+def effect_coefficients(
+    trades: Union[TradeBatch, Tuple[int, int, int, int]]
+) -> Dict[str, np.ndarray]:
+    """Looks up the `trade_effect` coefficients of every trade of a batch.
+
+    Args:
+        trades (Union[TradeBatch, Tuple[int, int, int, int]]): A batch, or the `trade_codes` of one kind of trade.
+
+    Returns:
+        Dict[str, np.ndarray]: One array per coefficient, one value per trade (scalars for trade codes).
+            'amount' is the index into AMOUNT_FIELDS, and 'warning' is 0 for none, 1 for an unexpected
+            action, 2 for an unexpected security type.
+    """
+    index = rule_index(trades)
+
+    return {name: table[index] for name, table in _EFFECT_TABLE.items()}
+
+
+def effect_values(
+    coefficients: Dict[str, np.ndarray],
+    quantity: np.ndarray,
+    fees: np.ndarray,
+    amount: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Computes stock quantity, option quantity, and profit from effect coefficients.
+
+    Works on arrays of trades and on the scalars of one trade alike, with the same floating point
+    operations as the per-trade loop.
+
+    Args:
+        coefficients (Dict[str, np.ndarray]): Coefficients from `effect_coefficients`.
+        quantity (np.ndarray): Quantity of each trade.
+        fees (np.ndarray): Fees of each trade.
+        amount (np.ndarray): Value of each trade's amount field, see AMOUNT_FIELDS.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Stock quantity, option quantity, and profit of each trade.
+    """
+    units = np.where(coefficients["per_unit"], quantity, 1.0)
+    cash = coefficients["cash_sign"] * (units * amount * coefficients["multiplier"])
+    profit = np.where(coefficients["amount"] != 0, cash - fees, 0.0)
+
+    return (
+        coefficients["stock_qty_per_unit"] * quantity,
+        coefficients["option_qty_per_unit"] * quantity,
+        profit,
+    )
+
+
+def compute_trade_effects(
+    batch: TradeBatch
+) -> TradeEffects:
+    """Computes the per-trade effects of a batch of trades.
+
+    Args:
+        batch (TradeBatch): Trades to process.
+
+    Returns:
+        TradeEffects: Stock quantity, option quantity, and profit of each trade.
+    """
+    coefficients = effect_coefficients(batch)
+
+    # Pick each trade's amount
+    amounts = np.stack([
+        np.zeros(len(batch)),
+        batch.price_per_share,
+        batch.dividend_amount,
+        batch.premium,
+        batch.strike,
+    ])
+    amount = amounts[coefficients["amount"], np.arange(len(batch))]
+    stock_qty, option_qty, profit = effect_values(coefficients, batch.quantity, batch.fees, amount)
+
+    return TradeEffects(
+        stock_qty=stock_qty,
+        option_qty=option_qty,
+        profit=profit,
+        warning=coefficients["warning"],
+    )
+
+
+def log_trade_warnings(
+    batch: TradeBatch,
+    effects: TradeEffects,
+    warning_logger: Optional[logging.Logger] = None
+) -> None:
+    """Logs the warnings of the per-trade loop for trades with unexpected combinations, in trade order.
+
+    Args:
+        batch (TradeBatch): Trades the effects were computed for.
+        effects (TradeEffects): Per-trade effects from `compute_trade_effects`.
+        warning_logger (Optional[logging.Logger]): Logger to log to, defaults to this module's logger.
+    """
+    log_warning_codes(batch, effects.warning, warning_logger)
+
+
+def log_warning_codes(
+    batch: TradeBatch,
+    warning: np.ndarray,
+    warning_logger: Optional[logging.Logger] = None
+) -> None:
+    """Logs the warnings of the per-trade loop for per-trade warning codes, in trade order.
+
+    Args:
+        batch (TradeBatch): Trades the warning codes belong to.
+        warning (np.ndarray): Warning code of each trade, see `effect_coefficients`.
+        warning_logger (Optional[logging.Logger]): Logger to log to, defaults to this module's logger.
+    """
+    warning_logger = warning_logger or logger
+    for position in np.flatnonzero(warning).tolist():
+        trade_id = int(batch.trade_id[position])
+        if warning[position] == 1:
+            warning_logger.warning(f"Unexpected action {ACTIONS[batch.action[position]]} for trade_id {trade_id}")
+        else:
+            warning_logger.warning(
+                f"Unexpected security type {SECURITY_TYPES[batch.security[position]]} for trade_id {trade_id}"
+            )
+
+
+def symbol_groups(
+    batch: TradeBatch
+) -> Tuple[List[str], np.ndarray]:
+    """Numbers the symbols of a batch in order of first appearance.
+
+    A batch from `TradeBatch.take` can have labels that none of its trades use, so the symbol codes
+    are renumbered to the symbols that appear.
+
+    Args:
+        batch (TradeBatch): Trades to group.
+
+    Returns:
+        Tuple[List[str], np.ndarray]: The symbols in order of first appearance, and the group of each trade
+            (an index into that list).
+    """
+    symbol_codes, first_positions = np.unique(batch.symbol_codes, return_index=True)
+    symbol_codes = symbol_codes[np.argsort(first_positions, kind="stable")]
+    renumber = np.empty(len(batch.symbols), dtype=np.int64)
+    renumber[symbol_codes] = np.arange(len(symbol_codes))
+
+    return [batch.symbols[code] for code in symbol_codes.tolist()], renumber[batch.symbol_codes]
+
+
+def group_sums(
+    groups: np.ndarray,
+    group_count: int,
+    values: np.ndarray
+) -> List[float]:
+    """Sums values by group, adding them in trade order like the per-trade loop.
+
+    Args:
+        groups (np.ndarray): Group of each trade.
+        group_count (int): Number of groups.
+        values (np.ndarray): Value of each trade.
+
+    Returns:
+        List[float]: Total of each group.
+    """
+    return np.bincount(groups, weights=values, minlength=group_count).tolist()
+
+
+def calculate_qty_and_profit_vectorized(
+    trades: Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]
+) -> Dict[str, SymbolResult]:
+    """Calculates aggregated profit/loss, stock quantity, and option quantity by symbol.
+
+    Gives exactly the same result as `calculate_profit.calculate_qty_and_profit` and logs the same
+    warnings for unexpected trade types or actions.
+
+    Args:
+        trades (Union[TradeBatch, Sequence[Union[StockEntry, DividendEntry, OptionEntry]]]): Trades to
+            process, as a batch or as trade entries.
+
+    Returns:
+        Dict[str, SymbolResult]: Profit, stock quantity, and option quantity by symbol, in order of first appearance.
+    """
+    batch = trades if isinstance(trades, TradeBatch) else TradeBatch.from_entries(trades)
+    if len(batch) == 0:
+        return {}
+
+    effects = compute_trade_effects(batch)
+    log_trade_warnings(batch, effects)
+
+    symbols, groups = symbol_groups(batch)
+    totals = [
+        group_sums(groups, len(symbols), values)
+        for values in (effects.profit, effects.stock_qty, effects.option_qty)
+    ]
+
+    return {
+        symbol: SymbolResult(profit=profit, stock_qty=stock_qty, option_qty=option_qty)
+        for symbol, profit, stock_qty, option_qty in zip(symbols, *totals)
+    }
@@ -0,0 +1,241 @@
+"""Incremental loading of an append-only trade journal.
+
+This module defines the `IncrementalTradeLoader` class, which remembers how many rows of an Excel
+journal it has already ingested, the highest trade_id among them, and a hash of those rows. On each
+refresh only the rows appended since the last refresh are parsed and validated, and just those new
+trades are handed back for downstream aggregation. If an earlier row was edited, removed, or the
+new rows are not newer than the last seen trade_id, the loader falls back to a full reload.
+
+The workbook is streamed in openpyxl read-only mode, like `iter_trade_chunks_from_excel`. An xlsx
+sheet can't be read from a given row without scanning the rows before it, so the ingested rows are
+streamed too, but they are only hashed: they are never put in a DataFrame, parsed, or validated.
+The hash is computed from the cell values themselves (None, numbers as floats, dates in ISO format,
+text), so it doesn't depend on the type pandas would infer for a column.
+
+Classes:
+    IncrementalLoadResult: The trades added by a refresh and whether a full reload was needed.
+    IncrementalTradeLoader: Loads an Excel journal, re-parsing only rows appended since the last refresh.
+"""
+import hashlib
+import logging
+from datetime import (
+    date,
+    datetime,
+    time,
+)
+from typing import (
+    Any,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from pydantic import BaseModel
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.utilities.csv.trade_frame import (
+    frame_to_entries,
+    parse_trade_frame,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalLoadResult(BaseModel):
+    """The outcome of one `IncrementalTradeLoader.refresh`.
+
+    Built with `model_construct`, the trades are already validated.
+
+    Attributes:
+        new_trades (List[Union[StockEntry, DividendEntry, OptionEntry]]): Trades added by this refresh. After a
+            full reload this is every trade in the journal.
+        full_reload (bool): Whether the whole journal was parsed again (first load or an earlier row changed).
+    """
+    new_trades: List[Union[StockEntry, DividendEntry, OptionEntry]]
+    full_reload: bool
+
+
+def _normalized_value(
+    value: Any
+) -> str:
+    """Returns a cell value as text that only depends on the value, not on how it is typed.
+
+    Args:
+        value (Any): Cell value from openpyxl.
+
+    Returns:
+        str: Empty for empty cells, numbers as floats, dates and times in ISO format, other values as text.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+
+    return str(value)
+
+
+def _update_digest(
+    digest: "hashlib._Hash",
+    row: Iterable[Any]
+) -> None:
+    """Adds one row of normalized cell values to a hash."""
+    digest.update("\x1f".join(_normalized_value(value) for value in row).encode("utf-8"))
+    digest.update(b"\x1e")
+
+
+def _parse_rows(
+    header: Sequence[Any],
+    rows: List[tuple]
+) -> tuple:
+    """Parses and validates raw rows without logging their errors.
+
+    Args:
+        header (Sequence[Any]): Column names.
+        rows (List[tuple]): Raw rows.
+
+    Returns:
+        tuple: The trade entries of the valid rows, and the errors of the invalid rows.
+    """
+    # Empty cells are None in openpyxl and NaN in pandas, use NaN so both readers agree
+    df = pd.DataFrame(rows, columns=list(header))
+    frame, errors = parse_trade_frame(df.where(df.notna(), np.nan), log_errors=False)
+
+    return frame_to_entries(frame), errors
+
+
+class IncrementalTradeLoader:
+    """Loads an Excel journal, re-parsing only rows appended since the last refresh.
+
+    Attributes:
+        file_path (str): Path to the Excel journal.
+        trades (List[Union[StockEntry, DividendEntry, OptionEntry]]): All trades loaded so far.
+        row_count (int): Number of journal rows already ingested (valid or not).
+        last_trade_id (Optional[int]): Highest trade_id among the ingested trades.
+    """
+    def __init__(
+        self,
+        file_path: str
+    ) -> None:
+        """Creates a loader that has not read the journal yet.
+
+        Args:
+            file_path (str): Path to the Excel journal.
+        """
+        self.file_path = file_path
+        self.trades: List[Union[StockEntry, DividendEntry, OptionEntry]] = []
+        self.row_count = 0
+        self.last_trade_id: Optional[int] = None
+        self._rows_digest: Optional[str] = None
+
+    def refresh(self) -> IncrementalLoadResult:
+        """Reads the journal and ingests the rows appended since the last refresh.
+
+        The rows ingested before are hashed while streaming the sheet and compared with the stored
+        hash. If they are unchanged, only the new tail is parsed and validated; otherwise everything
+        is parsed again.
+
+        Returns:
+            IncrementalLoadResult: The new trades and whether a full reload happened.
+
+        Raises:
+            Exception: If the Excel file cannot be read (e.g., file not found, invalid format).
+            KeyError: If a required column is missing.
+            ValueError: If the common fields of a new row cannot be parsed.
+        """
+        try:
+            workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        except Exception as e:
+            logger.error(f"Failed to read Excel file {self.file_path}. {e}")
+            raise e
+
+        # Hash the ingested rows and keep only the rows after them, plus the ingested ones in case of a reload
+        digest = hashlib.sha256()
+        ingested_rows: List[tuple] = []
+        new_rows: List[tuple] = []
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None) or ()
+            _update_digest(digest, header)
+
+            # Skip blank rows like pandas does
+            rows = (row for row in rows if any(value is not None for value in row))
+            for row in rows:
+                if len(ingested_rows) < self.row_count:
+                    _update_digest(digest, row)
+                    ingested_rows.append(row)
+                else:
+                    new_rows.append(row)
+        finally:
+            workbook.close()
+
+        # Only append when the rows we already have are untouched
+        reason = None
+        if self._rows_digest is None:
+            reason = "first load"
+        elif len(ingested_rows) < self.row_count:
+            reason = f"Rows were removed from {self.file_path}"
+        elif digest.hexdigest() != self._rows_digest:
+            reason = f"Earlier rows changed in {self.file_path}"
+
+        new_trades: List[Union[StockEntry, DividendEntry, OptionEntry]] = []
+        errors: List[str] = []
+        if reason is None and new_rows:
+            try:
+                new_trades, errors = _parse_rows(header, new_rows)
+            except (KeyError, ValueError, TypeError) as e:
+                logger.error(f"Failed to parse new rows of {self.file_path}. {e}")
+                raise e
+
+            # New rows must come after the last seen trade, otherwise the journal was rearranged
+            if self.last_trade_id is not None and any(trade.trade_id <= self.last_trade_id for trade in new_trades):
+                reason = f"New rows in {self.file_path} are not newer than trade_id {self.last_trade_id}"
+
+        full_reload = reason is not None
+        if full_reload:
+            if self._rows_digest is not None:
+                logger.info(f"{reason}, reloading the full journal")
+            try:
+                new_trades, errors = _parse_rows(header, ingested_rows + new_rows)
+            except (KeyError, ValueError, TypeError) as e:
+                logger.error(f"Failed to parse {self.file_path}. {e}")
+                raise e
+            self.trades = list(new_trades)
+            self.last_trade_id = None
+        else:
+            self.trades.extend(new_trades)
+
+        for error in errors:
+            logger.error(error)
+
+        for row in new_rows:
+            _update_digest(digest, row)
+        if full_reload:
+            # The digest so far only covers the rows ingested before
+            digest = hashlib.sha256()
+            _update_digest(digest, header)
+            for row in ingested_rows + new_rows:
+                _update_digest(digest, row)
+
+        self.row_count = len(ingested_rows) + len(new_rows)
+        self.last_trade_id = max(
+            [trade.trade_id for trade in new_trades]
+            + ([self.last_trade_id] if self.last_trade_id is not None else []),
+            default=None
+        )
+        self._rows_digest = digest.hexdigest()
+
+        return IncrementalLoadResult.model_construct(
+            new_trades=new_trades,
+            full_reload=full_reload
+        )
@@ -1,115 +1,367 @@
-"""Loads trade entries from an Excel file into a list of trade objects.
+"""Loads trade entries from Excel or CSV files into a list of trade objects.
 
-This module defines a function to read trade data from an Excel file and convert it into
-a list of `StockEntry`, `DividendEntry`, or `OptionEntry` objects based on the security type.
-It handles data parsing, validation, and error logging for robust processing of trade records.
+This module defines functions to read trade data from an Excel file, a set of CSV exports, or a JSON
+export and convert it into a list of `StockEntry`, `DividendEntry`, or `OptionEntry` objects based on the
+security type. Parsing and validation are done on whole columns (see `trade_frame`), with the same
+per-row error logging as validating one row at a time. JSON records are validated in one call through
+the discriminated union of the entry types (see `trade_entry_union`). Parsed journals are cached in the
+user cache directory (see `trade_cache`).
 
 Functions:
     load_trades_from_excel: Reads trade data from an Excel file and returns a list of trade entries.
+    load_trade_batch_from_excel: Reads trade data from an Excel file into a TradeBatch.
+    iter_trade_chunks_from_excel: Streams trade entries from an Excel file in fixed-size chunks.
+    iter_trades_from_excel: Streams trade entries from an Excel file one at a time.
+    load_trades_from_csv: Reads trade data from CSV files matching a glob, parsing files in parallel.
+    load_trades_from_json: Reads trade records from a JSON file and validates them in one call.
 """
+import glob
+import itertools
+import json
+import numpy as np
 import pandas as pd
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from openpyxl import load_workbook
+from pydantic import ValidationError
 from typing import (
+    Any,
+    Dict,
+    Iterator,
     List,
+    Optional,
+    Tuple,
     Union,
 )
 
 from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
-from trading_analytics.data.enum.option_type import OptionType
-from trading_analytics.data.enum.security_type import SecurityType
-from trading_analytics.data.enum.sub_action import SubAction
-from trading_analytics.data.enum.trade_action import Action
 from trading_analytics.data.data_model.entry.stock_entry import StockEntry
 from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.data_model.entry.trade_entry_union import validate_trade_records
+from trading_analytics.utilities.csv.trade_cache import (
+    cache_path_for,
+    file_fingerprint,
+    load_trade_cache,
+    save_trade_cache,
+)
+from trading_analytics.utilities.csv.trade_frame import (
+    frame_to_entries,
+    parse_trade_frame,
+)
 
 # Configure logging to a file
 logger = logging.getLogger(__name__)
 
+def _load_trade_frame_from_excel(
+    file_path: str,
+    use_cache: bool,
+    cache_dir: Optional[str]
+) -> pd.DataFrame:
+    """Reads and validates an Excel journal into a normalized frame, going through the trade cache.
+
+    Args:
+        file_path (str): Path to the Excel file containing trade data.
+        use_cache (bool): Whether to read and write the trade cache.
+        cache_dir (Optional[str]): Directory for the cache file, defaults to the user cache directory
+            (see `trade_cache.default_cache_dir`).
+
+    Returns:
+        pd.DataFrame: Normalized frame of the valid rows.
+
+    Raises:
+        Exception: If the Excel file cannot be read (e.g., file not found, invalid format).
+        KeyError: If a required column is missing.
+        ValueError: If the common fields of a row cannot be parsed.
+    """
+    # Check cache for an unchanged workbook
+    fingerprint = None
+    cache_path = None
+    if use_cache:
+        try:
+            fingerprint = file_fingerprint(file_path)
+            cache_path = cache_path_for(file_path, cache_dir)
+            cached = load_trade_cache(cache_path, fingerprint)
+        except OSError as e:
+            logger.warning(f"Trade cache unavailable for {file_path}. {e}")
+            cached = None
+
+        if cached is not None:
+            frame, errors = cached
+            for error in errors:
+                logger.error(error)
+
+            return frame
+
+    # Read excel file
+    try:
+        df = pd.read_excel(file_path)
+    except Exception as e:
+        logger.error(f"Failed to read Excel file {file_path}. {e}")
+        raise e
+
+    # Parse and validate whole columns
+    frame, errors = parse_trade_frame(df)
+
+    # Cache failures never fail the load
+    if cache_path is not None:
+        try:
+            save_trade_cache(cache_path, fingerprint, frame, errors)
+        except Exception as e:
+            logger.warning(f"Failed to write trade cache {cache_path}. {e}")
+
+    return frame
+
+
 def load_trades_from_excel(
-    file_path: str
+    file_path: str,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None
 ) -> List[Union[StockEntry, DividendEntry, OptionEntry]]:
     """Loads trade entries from an Excel file into a list of trade objects.
 
         Reads an Excel file using pandas and converts each row into a `StockEntry`, `DividendEntry`,
         or `OptionEntry` based on the security type. Validates and parses common fields for all trade
-        types and specific fields for each security type, logging errors for invalid rows without
-        raising exceptions unless the file cannot be read.
+        types and specific fields for each security type as whole columns, logging errors for invalid
+        rows without raising exceptions unless the file cannot be read or a row's common fields cannot
+        be parsed.
+
+        The validated trades are cached in a `.npz` file keyed by the workbook's size,
+        modification time, and content hash. An unchanged workbook is loaded from the cache (row
+        errors are logged again), any edit invalidates it.
 
         Args:
             file_path (str): Path to the Excel file containing trade data.
+            use_cache (bool): Whether to read and write the trade cache.
+            cache_dir (Optional[str]): Directory for the cache file, defaults to the user cache directory
+                (see `trade_cache.default_cache_dir`).
 
         Returns:
             List[Union[StockEntry, DividendEntry, OptionEntry]]: A list of parsed trade entry objects.
 
         Raises:
             Exception: If the Excel file cannot be read (e.g., file not found, invalid format).
+            KeyError: If a required column is missing.
+            ValueError: If the common fields of a row cannot be parsed.
     """
-    # Read excel file
+    return frame_to_entries(_load_trade_frame_from_excel(file_path, use_cache, cache_dir))
+
+
+def load_trade_batch_from_excel(
+    file_path: str,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None
+) -> TradeBatch:
+    """Loads trades from an Excel file into a `TradeBatch` without creating entry objects.
+
+    Reads, validates, and caches the workbook like `load_trades_from_excel`.
+
+    Args:
+        file_path (str): Path to the Excel file containing trade data.
+        use_cache (bool): Whether to read and write the trade cache.
+        cache_dir (Optional[str]): Directory for the cache file, defaults to the user cache directory
+            (see `trade_cache.default_cache_dir`).
+
+    Returns:
+        TradeBatch: The valid trades as NumPy arrays.
+
+    Raises:
+        Exception: If the Excel file cannot be read (e.g., file not found, invalid format).
+        KeyError: If a required column is missing.
+        ValueError: If the common fields of a row cannot be parsed.
+    """
+    return TradeBatch.from_frame(_load_trade_frame_from_excel(file_path, use_cache, cache_dir))
+
+
+def iter_trade_chunks_from_excel(
+    file_path: str,
+    chunk_size: int = 10_000
+) -> Iterator[List[Union[StockEntry, DividendEntry, OptionEntry]]]:
+    """Streams trade entries from an Excel file in fixed-size chunks.
+
+    Opens the workbook in openpyxl read-only mode and reads `chunk_size` rows at a time from the
+    first sheet, so memory stays flat no matter how many rows the file has. Each chunk is parsed and
+    validated like `load_trades_from_excel` and yielded before the next rows are read. Invalid rows
+    are logged and skipped, so a chunk can be shorter than `chunk_size`.
+
+    Args:
+        file_path (str): Path to the Excel file containing trade data.
+        chunk_size (int): Number of rows read from the file per chunk.
+
+    Yields:
+        List[Union[StockEntry, DividendEntry, OptionEntry]]: The parsed trade entries of each chunk.
+
+    Raises:
+        Exception: If the Excel file cannot be read (e.g., file not found, invalid format).
+        KeyError: If a required column is missing.
+        ValueError: If chunk_size is not positive, or the common fields of a row cannot be parsed.
+            Chunks before the failing row have already been yielded.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    # Open workbook in read-only mode, rows are streamed from the file
     try:
-        df = pd.read_excel(file_path)
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
     except Exception as e:
         logger.error(f"Failed to read Excel file {file_path}. {e}")
         raise e
 
-    # Assign values from csv rows to a Series
-    trades = []
-    row: pd.Series
-    for _, row in df.iterrows():
-        try:
-            common_fields = {
-                "trade_id": int(str(row["trade_id"])),
-                "strategy_id": int(str(row["strategy_id"])),
-                "brokerage": str(row["brokerage"]),
-                "account": str(row["account"]),
-                "strategy": str(row["strategy"]),
-                "security": SecurityType(row["security_type"]),
-                "trade_date": pd.to_datetime(row["trade_date"]).date(),
-                "symbol": str(row["symbol"]),
-                "action": Action(row["action"]),
-                "sub_action": SubAction(row["sub_action"]),
-                "quantity": float(str(row["quantity"])),
-                "fees": float(str(row["fees"])),
-            }
-        except (KeyError, ValueError, TypeError) as e:
-            logger.error(f"Failed to parse row for (trade_id={row.get('trade_id', 'unknown')}): {e}")
-            raise e
-
-        # Create appropriate entry based on security type
-        try:
-            # Stock or ETF, assign price_per_share
-            if common_fields['security'] in [SecurityType.STOCK, SecurityType.ETF]:
-                trade = StockEntry(
-                    **common_fields,
-                    price_per_share=float(row.get("price_per_share", 0.0))
-                )
-
-            # Dividend, assign dividend_amount
-            elif common_fields['security'] == SecurityType.DIVIDEND:
-                trade = DividendEntry(
-                    **common_fields,
-                    dividend_amount=float(row.get("dividend_amount", 0.0))
-                )
-
-            # Option, assign expiration date, strike, premium, option_type
-            elif common_fields['security'] == SecurityType.OPTION:
-                try:
-                    trade = OptionEntry(
-                        **common_fields,
-                        expiration_date=pd.to_datetime(row["expiration_date"]).date() if not pd.isna(row.get("expiration_date")) else None,
-                        strike=float(row.get("strike", 0.0)),
-                        premium=float(row.get("premium", 0.0)),
-                        option_type=OptionType[row["option_type"].upper()] if row.get("option_type") else None
-                    )
-                except Exception as e:
-                    raise ValueError(f"Failed to parse row for (trade_id={row.get('trade_id')}): {e}")
-            else:
-                logger.error(f"Invalid security type for (trade_id={row['trade_id']}): {common_fields['security']}")
-                continue
-
-            trades.append(trade)
-
-        except (KeyError, ValueError, TypeError) as e:
-            logger.error(f"Error creating trade entry for (trade_id={row['trade_id']}): {e}")
-            continue
-
-    return trades
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        # Skip blank rows like pandas does
+        rows = (row for row in rows if any(value is not None for value in row))
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                return
+
+            # Empty cells are None in openpyxl and NaN in pandas, use NaN so both readers agree
+            df = pd.DataFrame(chunk, columns=header)
+            frame, _ = parse_trade_frame(df.where(df.notna(), np.nan))
+            yield frame_to_entries(frame)
+
+    finally:
+        workbook.close()
+
+
+def iter_trades_from_excel(
+    file_path: str,
+    chunk_size: int = 10_000
+) -> Iterator[Union[StockEntry, DividendEntry, OptionEntry]]:
+    """Streams trade entries from an Excel file one at a time.
+
+    Flattens `iter_trade_chunks_from_excel`, so consumers such as `calculate_qty_and_profit`
+    can start working while the rest of the file is still being read.
+
+    Args:
+        file_path (str): Path to the Excel file containing trade data.
+        chunk_size (int): Number of rows read from the file per chunk.
+
+    Yields:
+        Union[StockEntry, DividendEntry, OptionEntry]: The parsed trade entries in file order.
+    """
+    for chunk in iter_trade_chunks_from_excel(file_path, chunk_size):
+        yield from chunk
+
+
+def _parse_csv_file(
+    file_path: str
+) -> Tuple[pd.DataFrame, List[str]]:
+    """Reads and validates one CSV export, runs in a worker process.
+
+    Row errors are returned instead of logged so the parent process reports them in file order.
+
+    Args:
+        file_path (str): Path to the CSV file.
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: The normalized frame of valid rows and the row error messages.
+    """
+    # Keep account as text so leading zeros survive
+    df = pd.read_csv(file_path, dtype={"account": str})
+
+    return parse_trade_frame(df, log_errors=False)
+
+
+def load_trades_from_csv(
+    pattern: str,
+    max_workers: Optional[int] = None
+) -> List[Union[StockEntry, DividendEntry, OptionEntry]]:
+    """Loads trade entries from all CSV files matching a glob pattern.
+
+    Each file must have the same columns as the Excel journal. Files are parsed and validated in
+    parallel across worker processes, then merged and sorted by trade_date and trade_id. The sort
+    is stable, so trades with the same date and id keep their file order.
+
+    Args:
+        pattern (str): Glob pattern of the CSV files (e.g. 'exports/*.csv').
+        max_workers (Optional[int]): Number of worker processes, defaults to the number of CPUs.
+            With one worker or one file, files are parsed in this process.
+
+    Returns:
+        List[Union[StockEntry, DividendEntry, OptionEntry]]: Parsed trade entries from all files.
+
+    Raises:
+        FileNotFoundError: If no file matches the pattern.
+        Exception: If a CSV file cannot be read.
+        KeyError: If a required column is missing.
+        ValueError: If the common fields of a row cannot be parsed.
+    """
+    file_paths = sorted(glob.glob(pattern))
+    if not file_paths:
+        raise FileNotFoundError(f"No CSV files match {pattern}")
+
+    # Parse files in worker processes, results come back in file order
+    try:
+        if max_workers == 1 or len(file_paths) == 1:
+            results = [_parse_csv_file(file_path) for file_path in file_paths]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(_parse_csv_file, file_paths))
+    except Exception as e:
+        logger.error(f"Failed to load CSV files {pattern}. {e}")
+        raise e
+
+    for _, errors in results:
+        for error in errors:
+            logger.error(error)
+
+    # Merge in stable trade_date/trade_id order
+    frames = [frame for frame, _ in results if not frame.empty]
+    if not frames:
+        return []
+    frame = pd.concat(frames, ignore_index=True)
+    frame = frame.sort_values(["trade_date", "trade_id"], kind="mergesort", ignore_index=True)
+
+    return frame_to_entries(frame)
+
+
+def load_trades_from_json(
+    file_path: str
+) -> List[Union[StockEntry, DividendEntry, OptionEntry]]:
+    """Loads trade entries from a JSON file holding a list of trade records.
+
+    Each record has the entry field names (trade_id, security, trade_date as 'YYYY-MM-DD', ...). All
+    records are validated in one `validate_trade_records` call. Invalid records are logged and
+    skipped like invalid journal rows, and the remaining records are validated in a second call.
+
+    Args:
+        file_path (str): Path to the JSON file.
+
+    Returns:
+        List[Union[StockEntry, DividendEntry, OptionEntry]]: Trade entries of the valid records, in file order.
+
+    Raises:
+        Exception: If the JSON file cannot be read or parsed.
+        ValueError: If the file does not hold a list of records.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            records: List[Dict[str, Any]] = json.load(file)
+    except Exception as e:
+        logger.error(f"Failed to read JSON file {file_path}. {e}")
+        raise e
+
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        raise ValueError(f"JSON file {file_path} must hold a list of trade records")
+
+    try:
+        return validate_trade_records(records)
+    except ValidationError as e:
+        # Errors are located by record index, group them per record
+        errors: Dict[int, List[str]] = {}
+        for error in e.errors():
+            field = ".".join(str(part) for part in error["loc"][2:])
+            errors.setdefault(error["loc"][0], []).append(f"{field}: {error['msg']}" if field else error["msg"])
+
+    for index, messages in sorted(errors.items()):
+        logger.error(
+            f"Error creating trade entry for (trade_id={records[index].get('trade_id')}): {'; '.join(messages)}"
+        )
+
+    return validate_trade_records([record for index, record in enumerate(records) if index not in errors])
@@ -0,0 +1,195 @@
+"""Binary cache of a parsed trade journal.
+
+This module stores the normalized frame produced by `parse_trade_frame` as a NumPy `.npz` file,
+keyed by the workbook's size, modification time, and content hash. Loading an unchanged journal
+from the cache skips reading and validating the workbook; any edit changes the fingerprint and
+invalidates the cache automatically.
+
+Cache files go to the user's cache directory, not next to the journals: the
+TRADING_ANALYTICS_CACHE_DIR environment variable, or a trading_analytics folder in the platform's
+cache location (LOCALAPPDATA on Windows, XDG_CACHE_HOME or ~/.cache elsewhere). Each journal's
+cache file is named after the journal and a hash of its absolute path, so journals with the same
+name in different folders don't share a cache.
+
+Functions:
+    file_fingerprint: returns the size, modification time, and content hash of a file.
+    default_cache_dir: returns the directory cache files are written to by default.
+    cache_path_for: returns the cache path for a journal.
+    save_trade_cache: writes a normalized trade frame and its row errors to a cache file.
+    load_trade_cache: reads a normalized trade frame from a cache file if its fingerprint matches.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from trading_analytics.utilities.csv.trade_frame import NORMALIZED_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Bump when the layout of the cached frame changes, old caches are then ignored
+CACHE_VERSION = 1
+
+# Storage kind of each normalized column
+_INT_COLUMNS = {"trade_id", "strategy_id"}
+_FLOAT_COLUMNS = {"quantity", "fees", "price_per_share", "dividend_amount", "strike", "premium"}
+_DATE_COLUMNS = {"trade_date", "expiration_date"}
+_OPTIONAL_STR_COLUMNS = {"option_type"}
+
+
+def file_fingerprint(
+    file_path: str
+) -> Dict[str, Union[int, str]]:
+    """Returns the size, modification time, and content hash of a file.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        Dict[str, Union[int, str]]: The keys size, mtime_ns, and sha256.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def default_cache_dir() -> str:
+    """Returns the directory cache files are written to by default.
+
+    Returns:
+        str: TRADING_ANALYTICS_CACHE_DIR, or a trading_analytics folder in the user's cache directory.
+    """
+    configured = os.environ.get("TRADING_ANALYTICS_CACHE_DIR", "")
+    if configured.strip():
+        return configured
+
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+    return os.path.join(base, "trading_analytics")
+
+
+def cache_path_for(
+    file_path: str,
+    cache_dir: Optional[str] = None
+) -> str:
+    """Returns the cache path for a journal.
+
+    Args:
+        file_path (str): Path to the journal workbook.
+        cache_dir (Optional[str]): Directory for the cache file, defaults to `default_cache_dir()`.
+
+    Returns:
+        str: Path of the cache file, e.g. trades.xlsx.0123456789abcdef.cache.npz.
+    """
+    directory = cache_dir if cache_dir is not None else default_cache_dir()
+    absolute_path = os.path.abspath(file_path)
+    path_hash = hashlib.sha256(absolute_path.encode("utf-8")).hexdigest()[:16]
+
+    return os.path.join(directory, f"{os.path.basename(absolute_path)}.{path_hash}.cache.npz")
+
+
+def save_trade_cache(
+    cache_path: str,
+    fingerprint: Dict[str, Union[int, str]],
+    frame: pd.DataFrame,
+    errors: List[str]
+) -> None:
+    """Writes a normalized trade frame and its row errors to a cache file.
+
+    The cache directory is created if needed. The file is written to a temporary path first and
+    then moved into place, so readers never see a partially written cache.
+
+    Args:
+        cache_path (str): Path of the cache file.
+        fingerprint (Dict[str, Union[int, str]]): Fingerprint of the source journal.
+        frame (pd.DataFrame): Normalized frame from `parse_trade_frame`.
+        errors (List[str]): Row errors logged while parsing the journal.
+    """
+    arrays = {}
+    for column in NORMALIZED_COLUMNS:
+        values = frame[column]
+        if column in _INT_COLUMNS:
+            arrays[column] = values.to_numpy(dtype="int64")
+        elif column in _FLOAT_COLUMNS:
+            arrays[column] = values.to_numpy(dtype="float64")
+        elif column in _DATE_COLUMNS:
+            arrays[column] = pd.to_datetime(values).to_numpy(dtype="datetime64[ns]")
+        elif column in _OPTIONAL_STR_COLUMNS:
+            arrays[column] = np.array(values.fillna("").tolist(), dtype=str)
+        else:
+            arrays[column] = np.array(values.tolist(), dtype=str)
+
+    metadata = {
+        "version": CACHE_VERSION,
+        "fingerprint": fingerprint,
+    }
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    temp_path = f"{cache_path}.tmp.npz"
+    np.savez(
+        temp_path,
+        _metadata=np.array(json.dumps(metadata)),
+        _errors=np.array(errors, dtype=str),
+        **arrays
+    )
+    os.replace(temp_path, cache_path)
+
+
+def load_trade_cache(
+    cache_path: str,
+    fingerprint: Dict[str, Union[int, str]]
+) -> Optional[Tuple[pd.DataFrame, List[str]]]:
+    """Reads a normalized trade frame from a cache file if its fingerprint matches.
+
+    Args:
+        cache_path (str): Path of the cache file.
+        fingerprint (Dict[str, Union[int, str]]): Fingerprint of the current source journal.
+
+    Returns:
+        Optional[Tuple[pd.DataFrame, List[str]]]: The normalized frame and row errors, or None if the cache
+            is missing, stale, from another cache version, or unreadable.
+    """
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as cache:
+            metadata = json.loads(str(cache["_metadata"]))
+            if metadata.get("version") != CACHE_VERSION or metadata.get("fingerprint") != fingerprint:
+                return None
+
+            columns = {column: cache[column] for column in NORMALIZED_COLUMNS}
+            errors = cache["_errors"].tolist()
+
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable trade cache {cache_path}. {e}")
+        return None
+
+    frame = pd.DataFrame(columns)
+    for column in _OPTIONAL_STR_COLUMNS:
+        frame[column] = frame[column].where(frame[column] != "", None)
+    for column in NORMALIZED_COLUMNS:
+        if column not in _INT_COLUMNS | _FLOAT_COLUMNS | _DATE_COLUMNS:
+            frame[column] = frame[column].astype(object)
+
+    return frame, errors
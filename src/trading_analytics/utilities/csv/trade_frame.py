@@ -0,0 +1,494 @@
+"""Column-wise parsing and validation of raw trade rows.
+
+This module turns a raw trade table (as read from Excel or CSV) into a normalized, validated
+frame using whole-column operations instead of one Pydantic constructor per row. The checks
+mirror the ones done by `TradeEntry`, `StockEntry`, `DividendEntry`, and `OptionEntry`, but are
+evaluated as boolean masks over the entire table. Valid rows can then be turned into entry
+objects without paying for validation a second time.
+
+Rows whose common fields cannot be parsed stop the load (same as the row-by-row loader), rows
+that fail entry validation are logged and skipped. Only the rows a mask rejects are parsed and
+validated again one at a time, exactly like the row-by-row loader, so the logged errors are the
+ones the models raise, and a row the models accept after all is kept.
+
+Functions:
+    parse_trade_frame: parses and validates a raw trade table into a normalized frame.
+    frame_to_entries: builds StockEntry, DividendEntry, and OptionEntry objects from a normalized frame.
+"""
+import logging
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_entry import VALID_ACTION_MAP
+from trading_analytics.data.data_model.entry.trade_entry_union import normalize_strategy_column
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.utilities.gc_pause import paused_gc
+
+logger = logging.getLogger(__name__)
+
+# Columns of the normalized frame returned by parse_trade_frame
+NORMALIZED_COLUMNS = [
+    "trade_id",
+    "strategy_id",
+    "brokerage",
+    "account",
+    "strategy",
+    "security",
+    "trade_date",
+    "symbol",
+    "action",
+    "sub_action",
+    "quantity",
+    "fees",
+    "price_per_share",
+    "dividend_amount",
+    "expiration_date",
+    "strike",
+    "premium",
+    "option_type",
+]
+
+# Actions allowed for each security type, as raw column values
+_VALID_ACTIONS = {
+    security.value: {action.value for action in actions}
+    for security, actions in VALID_ACTION_MAP.items()
+}
+
+# Fields of each entry type after the common fields
+_SPECIFIC_FIELDS = {
+    StockEntry: ["price_per_share"],
+    DividendEntry: ["dividend_amount"],
+    OptionEntry: ["expiration_date", "strike", "premium", "option_type"],
+}
+
+
+def _parse_int_column(
+    series: pd.Series
+) -> Tuple[pd.Series, np.ndarray]:
+    """Parses a column the same way `int(str(value))` does.
+
+    Args:
+        series (pd.Series): Raw column values.
+
+    Returns:
+        Tuple[pd.Series, np.ndarray]: Parsed int64 values (0 where parsing failed) and a mask of failed rows.
+    """
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return series.astype("int64"), np.zeros(len(series), dtype=bool)
+
+    # str() of a float is never a valid int ('1.0', 'nan'), so only strings of digits survive
+    text = series.astype(str).str.strip()
+    failed = ~text.str.fullmatch(r"[+-]?\d+").to_numpy(dtype=bool)
+    parsed = pd.to_numeric(text.where(~failed, "0")).astype("int64")
+
+    return parsed, failed
+
+
+def _parse_float_column(
+    series: pd.Series
+) -> Tuple[pd.Series, np.ndarray]:
+    """Parses a column the same way `float(value)` does.
+
+    Args:
+        series (pd.Series): Raw column values.
+
+    Returns:
+        Tuple[pd.Series, np.ndarray]: Parsed float64 values and a mask of rows that could not be converted.
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.astype("float64"), np.zeros(len(series), dtype=bool)
+
+    parsed = pd.to_numeric(series, errors="coerce").astype("float64")
+    failed = (parsed.isna() & series.notna()).to_numpy(dtype=bool)
+
+    return parsed, failed
+
+
+def _parse_date_column(
+    series: pd.Series
+) -> Tuple[pd.Series, np.ndarray]:
+    """Parses a column the same way `pd.to_datetime(value).date()` does.
+
+    Args:
+        series (pd.Series): Raw column values.
+
+    Returns:
+        Tuple[pd.Series, np.ndarray]: Parsed datetime64 values normalized to midnight and a mask of rows
+            that are missing or could not be parsed.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        parsed = series
+    else:
+        parsed = pd.to_datetime(series, errors="coerce", format="mixed")
+
+    parsed = parsed.dt.normalize()
+    failed = parsed.isna().to_numpy(dtype=bool)
+
+    return parsed, failed
+
+
+def _parse_common_fields(
+    row: pd.Series
+) -> Dict[str, Any]:
+    """Parses the common fields of one raw row, like the row-by-row loader.
+
+    Args:
+        row (pd.Series): Raw row.
+
+    Returns:
+        Dict[str, Any]: Common entry fields.
+
+    Raises:
+        KeyError: If a required column is missing.
+        ValueError: If a field cannot be parsed.
+        TypeError: If a field has an unexpected type.
+    """
+    return {
+        "trade_id": int(str(row["trade_id"])),
+        "strategy_id": int(str(row["strategy_id"])),
+        "brokerage": str(row["brokerage"]),
+        "account": str(row["account"]),
+        "strategy": str(row["strategy"]),
+        "security": SecurityType(row["security_type"]),
+        "trade_date": pd.to_datetime(row["trade_date"]).date(),
+        "symbol": str(row["symbol"]),
+        "action": Action(row["action"]),
+        "sub_action": SubAction(row["sub_action"]),
+        "quantity": float(str(row["quantity"])),
+        "fees": float(str(row["fees"])),
+    }
+
+
+def _create_entry(
+    row: pd.Series,
+    common_fields: Dict[str, Any]
+) -> Union[StockEntry, DividendEntry, OptionEntry]:
+    """Creates the entry of one raw row with full validation, like the row-by-row loader.
+
+    Args:
+        row (pd.Series): Raw row.
+        common_fields (Dict[str, Any]): Its common fields from `_parse_common_fields`.
+
+    Returns:
+        Union[StockEntry, DividendEntry, OptionEntry]: The entry.
+
+    Raises:
+        KeyError: If a required column is missing.
+        ValueError: If the row fails entry validation.
+        TypeError: If a field has an unexpected type.
+    """
+    # Stock or ETF, assign price_per_share
+    if common_fields["security"] in [SecurityType.STOCK, SecurityType.ETF]:
+        return StockEntry(
+            **common_fields,
+            price_per_share=float(row.get("price_per_share", 0.0))
+        )
+
+    # Dividend, assign dividend_amount
+    if common_fields["security"] == SecurityType.DIVIDEND:
+        return DividendEntry(
+            **common_fields,
+            dividend_amount=float(row.get("dividend_amount", 0.0))
+        )
+
+    # Option, assign expiration date, strike, premium, option_type
+    try:
+        return OptionEntry(
+            **common_fields,
+            expiration_date=pd.to_datetime(row["expiration_date"]).date() if not pd.isna(row.get("expiration_date")) else None,
+            strike=float(row.get("strike", 0.0)),
+            premium=float(row.get("premium", 0.0)),
+            option_type=OptionType[row["option_type"].upper()] if row.get("option_type") else None
+        )
+    except Exception as e:
+        raise ValueError(f"Failed to parse row for (trade_id={row.get('trade_id')}): {e}")
+
+
+def _entry_record(
+    entry: Union[StockEntry, DividendEntry, OptionEntry]
+) -> Dict[str, Any]:
+    """Returns the normalized frame values of a validated entry (see NORMALIZED_COLUMNS)."""
+    is_option = isinstance(entry, OptionEntry)
+
+    return {
+        "trade_id": entry.trade_id,
+        "strategy_id": entry.strategy_id,
+        "brokerage": entry.brokerage,
+        "account": entry.account,
+        "strategy": ",".join(entry.strategy),
+        "security": entry.security.value,
+        "trade_date": pd.Timestamp(entry.trade_date),
+        "symbol": entry.symbol,
+        "action": entry.action.value,
+        "sub_action": entry.sub_action.value,
+        "quantity": entry.quantity,
+        "fees": entry.fees,
+        "price_per_share": getattr(entry, "price_per_share", np.nan),
+        "dividend_amount": getattr(entry, "dividend_amount", np.nan),
+        "expiration_date": pd.Timestamp(entry.expiration_date) if is_option else pd.NaT,
+        "strike": entry.strike if is_option else np.nan,
+        "premium": entry.premium if is_option else np.nan,
+        "option_type": entry.option_type.name if is_option else None,
+    }
+
+
+def _raise_parse_error(
+    row: pd.Series,
+    error: Exception,
+    log_errors: bool
+) -> None:
+    """Logs and raises the error for a row whose common fields could not be parsed.
+
+    Args:
+        row (pd.Series): The failing raw row.
+        error (Exception): The error to raise.
+        log_errors (bool): Whether to log the error before raising it.
+
+    Raises:
+        Exception: Always raises `error`.
+    """
+    if log_errors:
+        logger.error(f"Failed to parse row for (trade_id={row.get('trade_id', 'unknown')}): {error}")
+    raise error
+
+
+def parse_trade_frame(
+    df: pd.DataFrame,
+    log_errors: bool = True
+) -> Tuple[pd.DataFrame, List[str]]:
+    """Parses and validates a raw trade table using whole-column operations.
+
+    Produces the same outcome as building one entry per row: if the common fields of a row cannot be
+    parsed, the error is logged and raised; rows that fail entry validation are logged and skipped.
+    Entry errors are only reported for rows before the first unparsable row, like the row-by-row loader.
+
+    Args:
+        df (pd.DataFrame): Raw trade table with the journal columns (trade_id, security_type, ...).
+        log_errors (bool): Whether to log row errors, turn off when the caller reports them itself
+            (e.g. from a worker process).
+
+    Returns:
+        Tuple[pd.DataFrame, List[str]]: The normalized frame of valid rows (see NORMALIZED_COLUMNS) and
+            the error messages for skipped rows.
+
+    Raises:
+        KeyError: If a required column is missing.
+        ValueError: If the common fields of a row cannot be parsed.
+    """
+    n_rows = len(df)
+    if n_rows == 0:
+        return pd.DataFrame(columns=NORMALIZED_COLUMNS), []
+
+    # A missing column fails the first row, with the error of the row-by-row parsing
+    required_columns = [
+        "trade_id", "strategy_id", "brokerage", "account", "strategy", "security_type",
+        "trade_date", "symbol", "action", "sub_action", "quantity", "fees",
+    ]
+    if any(column not in df.columns for column in required_columns):
+        try:
+            _parse_common_fields(df.iloc[0])
+        except (KeyError, ValueError, TypeError) as e:
+            _raise_parse_error(df.iloc[0], e, log_errors)
+
+    # Parse the common fields, with a mask of the rows that may not parse
+    trade_id, trade_id_failed = _parse_int_column(df["trade_id"])
+    strategy_id, strategy_id_failed = _parse_int_column(df["strategy_id"])
+    security = df["security_type"]
+    security_failed = ~security.isin([member.value for member in SecurityType]).to_numpy(dtype=bool)
+    trade_date, trade_date_failed = _parse_date_column(df["trade_date"])
+    action = df["action"]
+    action_failed = ~action.isin([member.value for member in Action]).to_numpy(dtype=bool)
+    sub_action = df["sub_action"]
+    sub_action_failed = ~sub_action.isin([member.value for member in SubAction]).to_numpy(dtype=bool)
+    quantity, quantity_failed = _parse_float_column(df["quantity"])
+    fees, fees_failed = _parse_float_column(df["fees"])
+
+    common_failed = (
+        trade_id_failed | strategy_id_failed | security_failed | trade_date_failed
+        | action_failed | sub_action_failed | quantity_failed | fees_failed
+    )
+
+    # Parse the flagged rows one at a time, the load stops at the first row that really fails
+    n_checked = n_rows
+    parse_error = None
+    for position in np.flatnonzero(common_failed).tolist():
+        try:
+            _parse_common_fields(df.iloc[position])
+        except (KeyError, ValueError, TypeError) as e:
+            n_checked = position
+            parse_error = e
+            break
+
+    brokerage = df["brokerage"].astype(str).str.upper()
+    account = df["account"].astype(str)
+    strategy = normalize_strategy_column(df["strategy"].astype(str))
+    symbol = df["symbol"].astype(str)
+
+    is_stock = security.isin([SecurityType.STOCK.value, SecurityType.ETF.value]).to_numpy(dtype=bool)
+    is_dividend = (security == SecurityType.DIVIDEND.value).to_numpy(dtype=bool)
+    is_option = (security == SecurityType.OPTION.value).to_numpy(dtype=bool)
+
+    # Security specific columns, missing columns fall back to the same defaults as row.get()
+    nan_column = pd.Series(np.nan, index=df.index)
+    price_per_share, price_failed = _parse_float_column(df.get("price_per_share", pd.Series(0.0, index=df.index)))
+    dividend_amount, dividend_failed = _parse_float_column(df.get("dividend_amount", pd.Series(0.0, index=df.index)))
+    strike, strike_failed = _parse_float_column(df.get("strike", pd.Series(0.0, index=df.index)))
+    premium, premium_failed = _parse_float_column(df.get("premium", pd.Series(0.0, index=df.index)))
+    expiration_date, expiration_failed = _parse_date_column(df.get("expiration_date", nan_column))
+    raw_option_type = df.get("option_type", nan_column).astype(object)
+    option_type = raw_option_type.where(raw_option_type.map(type) == str).str.upper()
+    option_type_failed = ~option_type.isin([member.name for member in OptionType]).to_numpy(dtype=bool)
+
+    valid_action = np.zeros(n_rows, dtype=bool)
+    for security_value, actions in _VALID_ACTIONS.items():
+        valid_action |= ((security == security_value) & action.isin(actions)).to_numpy(dtype=bool)
+
+    # Rows that may fail entry validation
+    flagged = (
+        common_failed
+        | (trade_id.to_numpy() <= 0)
+        | (strategy_id.to_numpy() <= 0)
+        | (brokerage.str.len().to_numpy() < 1)
+        | (account.str.len().to_numpy() < 4)
+        | (symbol.str.len().to_numpy() < 1)
+        | ~(quantity.to_numpy() >= 0)
+        | ~(fees.to_numpy() >= 0)
+        | ~valid_action
+        | (is_stock & (price_failed | ~(price_per_share.to_numpy() >= 0)))
+        | (is_dividend & (dividend_failed | ~(dividend_amount.to_numpy() >= 0)))
+        | (is_option & (expiration_failed | strike_failed | premium_failed | option_type_failed))
+        | (is_option & ~(strike.to_numpy() >= 0))
+        | (is_option & ~(premium.to_numpy() >= 0))
+        | (is_option & (expiration_date < trade_date).to_numpy(dtype=bool))
+    )
+    flagged[n_checked:] = False
+
+    # Validate the flagged rows one at a time, for the models' own errors
+    invalid = np.zeros(n_rows, dtype=bool)
+    corrected: Dict[int, Union[StockEntry, DividendEntry, OptionEntry]] = {}
+    errors = []
+    for position in np.flatnonzero(flagged).tolist():
+        row = df.iloc[position]
+        try:
+            entry = _create_entry(row, _parse_common_fields(row))
+        except (KeyError, ValueError, TypeError) as e:
+            message = f"Error creating trade entry for (trade_id={row['trade_id']}): {e}"
+            if log_errors:
+                logger.error(message)
+            errors.append(message)
+            invalid[position] = True
+        else:
+            corrected[position] = entry
+
+    # Stop at the first unparsable row, after reporting the entry errors before it
+    if parse_error is not None:
+        _raise_parse_error(df.iloc[n_checked], parse_error, log_errors)
+
+    keep = ~invalid
+    frame = pd.DataFrame({
+        "trade_id": trade_id,
+        "strategy_id": strategy_id,
+        "brokerage": brokerage,
+        "account": account,
+        "strategy": strategy,
+        "security": security.astype(object),
+        "trade_date": trade_date,
+        "symbol": symbol,
+        "action": action.astype(object),
+        "sub_action": sub_action.astype(object),
+        "quantity": quantity,
+        "fees": fees,
+        "price_per_share": price_per_share.where(is_stock),
+        "dividend_amount": dividend_amount.where(is_dividend),
+        "expiration_date": expiration_date.where(is_option),
+        "strike": strike.where(is_option),
+        "premium": premium.where(is_option),
+        "option_type": option_type.where(is_option, None),
+    })
+
+    # Rows a mask flagged but the models accepted take the models' values
+    for position, entry in corrected.items():
+        for column, value in _entry_record(entry).items():
+            frame.iat[position, frame.columns.get_loc(column)] = value
+    frame = frame.loc[keep].reset_index(drop=True)
+
+    return frame, errors
+
+
+def frame_to_entries(
+    frame: pd.DataFrame
+) -> List[Union[StockEntry, DividendEntry, OptionEntry]]:
+    """Builds trade entry objects from a frame produced by `parse_trade_frame`.
+
+    The frame has already been validated column by column, so entries are created with
+    `TradeEntry.from_trusted_records` instead of running every validator again.
+
+    Args:
+        frame (pd.DataFrame): Normalized frame of valid rows.
+
+    Returns:
+        List[Union[StockEntry, DividendEntry, OptionEntry]]: Trade entries in frame order.
+    """
+    if frame.empty:
+        return []
+
+    # Building many small objects, pause garbage collection
+    with paused_gc():
+        # Convert whole columns to the entry field types
+        columns = {
+            "trade_id": frame["trade_id"].tolist(),
+            "strategy_id": frame["strategy_id"].tolist(),
+            "brokerage": frame["brokerage"].tolist(),
+            "account": frame["account"].tolist(),
+            "strategy": frame["strategy"].map(lambda strategy: strategy.split(",") if strategy else []).tolist(),
+            "security": frame["security"].map({member.value: member for member in SecurityType}).tolist(),
+            "trade_date": frame["trade_date"].dt.date.tolist(),
+            "symbol": frame["symbol"].tolist(),
+            "action": frame["action"].map({member.value: member for member in Action}).tolist(),
+            "sub_action": frame["sub_action"].map({member.value: member for member in SubAction}).tolist(),
+            "quantity": frame["quantity"].tolist(),
+            "fees": frame["fees"].tolist(),
+            "price_per_share": frame["price_per_share"].tolist(),
+            "dividend_amount": frame["dividend_amount"].tolist(),
+            "expiration_date": frame["expiration_date"].dt.date.tolist(),
+            "strike": frame["strike"].tolist(),
+            "premium": frame["premium"].tolist(),
+            "option_type": frame["option_type"].map({member.name: member for member in OptionType}).tolist(),
+        }
+        common_fields = NORMALIZED_COLUMNS[:12]  # trade_id through fees
+
+        security = frame["security"].to_numpy()
+        entry_masks = {
+            StockEntry: (security == SecurityType.STOCK.value) | (security == SecurityType.ETF.value),
+            DividendEntry: security == SecurityType.DIVIDEND.value,
+            OptionEntry: security == SecurityType.OPTION.value,
+        }
+
+        # Build each entry type in one batch, then put the entries back in frame order
+        trades: List[Union[StockEntry, DividendEntry, OptionEntry]] = [None] * len(frame)
+        for entry_class, mask in entry_masks.items():
+            positions = np.flatnonzero(mask).tolist()
+            if not positions:
+                continue
+
+            fields = common_fields + _SPECIFIC_FIELDS[entry_class]
+            values = [[columns[field][position] for position in positions] for field in fields]
+            records = [dict(zip(fields, row)) for row in zip(*values)]
+            for position, trade in zip(positions, entry_class.from_trusted_records(records)):
+                trades[position] = trade
+
+    return trades
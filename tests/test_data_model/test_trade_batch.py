@@ -0,0 +1,121 @@
+# Imports
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import (
+    ACTIONS,
+    NO_OPTION_TYPE,
+    OPTION_TYPES,
+    SECURITY_TYPES,
+    TradeBatch,
+)
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.trade_action import Action
+
+
+def _trades() -> list:
+    """One trade of each entry type."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "ETRADE",
+        "account": "TEST1234",
+        "trade_date": date(2023, 10, 15),
+        "quantity": 1,
+        "fees": 1.0,
+    }
+    return [
+        StockEntry(**common, trade_id=1, strategy="basic trade", security="STOCK", symbol="AAPL",
+                   action="BUY", sub_action="OPEN", price_per_share=150.0),
+        DividendEntry(**common, trade_id=2, strategy="", security="DIVIDEND", symbol="KO",
+                      action="DIVIDEND", sub_action="DIVIDEND", dividend_amount=0.5),
+        OptionEntry(**common, trade_id=3, strategy="covered call, wheel", security="OPTION", symbol="AAPL",
+                    action="SELL", sub_action="OPEN", expiration_date=date(2023, 11, 17), strike=150.0,
+                    premium=2.0, option_type="CALL"),
+    ]
+
+
+class TestTradeBatch(unittest.TestCase):
+    """Unit tests for the struct-of-arrays trade batch.
+
+    Test Cases:
+        entries round trip through a batch unchanged
+        enums are integer codes, symbols are interned in order of first appearance
+        fields a trade type lacks get neutral defaults
+        strategies are stored in compressed sparse row form
+        take selects trades by position or mask
+        a normalized frame gives the same batch as the entries
+    """
+    def test_round_trip(self):
+        """Tests that entries converted to a batch and back are unchanged."""
+        trades = _trades()
+
+        batch = TradeBatch.from_entries(trades)
+
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.to_entries(), trades)
+        self.assertEqual([type(trade) for trade in batch.to_entries()], [StockEntry, DividendEntry, OptionEntry])
+
+    def test_codes(self):
+        """Tests that enums and symbols are stored as small integer codes."""
+        batch = TradeBatch.from_entries(_trades())
+
+        self.assertEqual(batch.security.dtype, np.int8)
+        self.assertEqual([SECURITY_TYPES[code] for code in batch.security],
+                         [SecurityType.STOCK, SecurityType.DIVIDEND, SecurityType.OPTION])
+        self.assertEqual([ACTIONS[code] for code in batch.action], [Action.BUY, Action.DIVIDEND, Action.SELL])
+        self.assertEqual(batch.symbols, ["AAPL", "KO"])
+        self.assertEqual(batch.symbol_codes.tolist(), [0, 1, 0])
+
+    def test_defaults(self):
+        """Tests that missing amounts are 0.0, missing dates NaT, and missing option types NO_OPTION_TYPE."""
+        batch = TradeBatch.from_entries(_trades())
+
+        self.assertEqual(batch.price_per_share.tolist(), [150.0, 0.0, 0.0])
+        self.assertEqual(batch.dividend_amount.tolist(), [0.0, 0.5, 0.0])
+        self.assertEqual(batch.premium.tolist(), [0.0, 0.0, 2.0])
+        self.assertEqual(batch.option_type.tolist(), [NO_OPTION_TYPE, NO_OPTION_TYPE, OPTION_TYPES.index(OptionType.CALL)])
+        self.assertTrue(np.isnat(batch.expiration_date[:2]).all())
+        self.assertEqual(batch.expiration_date[2], np.datetime64("2023-11-17"))
+
+    def test_strategies(self):
+        """Tests that strategy lists are stored as row offsets and codes."""
+        batch = TradeBatch.from_entries(_trades())
+
+        self.assertEqual(batch.strategy_indptr.tolist(), [0, 1, 1, 3])
+        self.assertEqual([batch.strategies[code] for code in batch.strategy_indices],
+                         ["basic trade", "covered call", "wheel"])
+
+    def test_take(self):
+        """Tests selecting trades by positions and by boolean mask."""
+        trades = _trades()
+        batch = TradeBatch.from_entries(trades)
+
+        self.assertEqual(batch.take(np.array([2, 0])).to_entries(), [trades[2], trades[0]])
+        self.assertEqual(batch.take(batch.symbol_codes == 0).to_entries(), [trades[0], trades[2]])
+        self.assertEqual(len(batch.take(np.array([], dtype=np.int64))), 0)
+
+    def test_from_frame(self):
+        """Tests that a normalized frame gives the same trades as the entries."""
+        trades = _trades()
+        frame = pd.DataFrame([trade.model_dump() for trade in trades])
+        frame["strategy"] = frame["strategy"].map(",".join)
+        for column in ["security", "action", "sub_action"]:
+            frame[column] = frame[column].map(lambda member: member.value)
+        frame["option_type"] = frame["option_type"].map(lambda member: member.value if isinstance(member, OptionType) else None)
+        frame["trade_date"] = pd.to_datetime(frame["trade_date"])
+        frame["expiration_date"] = pd.to_datetime(frame["expiration_date"])
+
+        batch = TradeBatch.from_frame(frame)
+
+        self.assertEqual(batch.to_entries(), trades)
+
+
+if __name__ == '__main__':
+    unittest.main()
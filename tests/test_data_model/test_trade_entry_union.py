@@ -0,0 +1,118 @@
+# Imports
+import unittest
+from datetime import date
+from unittest import mock
+
+from pydantic import ValidationError
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry import trade_entry_union
+from trading_analytics.data.data_model.entry.trade_entry_union import validate_trade_records
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+
+
+def _records() -> list:
+    """Trade records as they come from a CSV export or an API."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "trade_date": "2023-10-15",
+        "symbol": "AAPL",
+        "quantity": 1,
+        "fees": 1.0,
+    }
+    return [
+        {**common, "trade_id": 1, "strategy": "Basic Trade", "security": "stock", "action": "buy",
+         "sub_action": "open", "price_per_share": 150.0},
+        {**common, "trade_id": 2, "strategy": "Index, , Long Term", "security": "ETF", "action": "SELL",
+         "sub_action": "CLOSE", "price_per_share": 410.0},
+        {**common, "trade_id": 3, "strategy": ["dividend"], "security": SecurityType.DIVIDEND,
+         "action": Action.DIVIDEND, "sub_action": SubAction.DIVIDEND, "dividend_amount": 0.5},
+        {**common, "trade_id": 4, "strategy": "covered call", "security": "OPTION", "action": "sell",
+         "sub_action": "open", "expiration_date": "2023-11-17", "strike": 150.0, "premium": 2.0,
+         "option_type": "call"},
+    ]
+
+
+class TestValidateTradeRecords(unittest.TestCase):
+    """Unit tests for bulk validation through the discriminated union.
+
+    Valid Test Cases:
+        records are dispatched on security and normalized like the entry constructors
+        dates are parsed once per distinct value, before validation
+
+    Invalid Test Cases:
+        unknown security type
+        a field constraint failing in one record
+    """
+    def test_dispatch_on_security(self):
+        """Tests that each record becomes the entry type of its security."""
+        trades = validate_trade_records(_records())
+
+        self.assertEqual([type(trade) for trade in trades], [StockEntry, StockEntry, DividendEntry, OptionEntry])
+
+    def test_matches_constructors(self):
+        """Tests that bulk validation gives the same entries as the per-row constructors."""
+        records = _records()
+        expected = [
+            StockEntry(**records[0]),
+            StockEntry(**records[1]),
+            DividendEntry(**records[2]),
+            OptionEntry(**records[3]),
+        ]
+
+        trades = validate_trade_records(records)
+
+        self.assertEqual([trade.model_dump() for trade in trades], [trade.model_dump() for trade in expected])
+        self.assertEqual(trades[0].brokerage, "ETRADE")
+        self.assertEqual(trades[1].strategy, ["index", "long term"])
+        self.assertEqual(trades[3].option_type, OptionType.CALL)
+        self.assertEqual(trades[3].expiration_date, date(2023, 11, 17))
+
+    def test_dates_parsed_per_column(self):
+        """Tests that date strings are parsed before validation, so the date validators get dates."""
+        records = _records() * 3
+
+        with mock.patch.object(trade_entry_union, "_parse_date", wraps=trade_entry_union._parse_date) as parse:
+            trades = validate_trade_records(records)
+
+        # One trade date and one expiration date
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual({trade.trade_date for trade in trades}, {date(2023, 10, 15)})
+
+    def test_records_not_modified(self):
+        """Tests that the input records are left as they were."""
+        records = _records()
+
+        validate_trade_records(records)
+
+        self.assertEqual(records, _records())
+
+    def test_unknown_security(self):
+        """Tests that an unknown security type raises a ValidationError."""
+        records = _records()
+        records[0]["security"] = "BOND"
+
+        with self.assertRaises(ValidationError):
+            validate_trade_records(records)
+
+    def test_invalid_field(self):
+        """Tests that errors are located by record index and field."""
+        records = _records()
+        records[2]["dividend_amount"] = -1
+
+        with self.assertRaises(ValidationError) as context:
+            validate_trade_records(records)
+
+        locations = [error["loc"] for error in context.exception.errors()]
+        self.assertEqual(locations, [(2, "dividend", "dividend_amount")])
+
+
+if __name__ == '__main__':
+    unittest.main()
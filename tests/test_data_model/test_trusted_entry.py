@@ -0,0 +1,106 @@
+# Imports
+import unittest
+from datetime import date
+from pydantic import ValidationError
+
+from trading_analytics.data.data_model.entry import trade_entry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+
+
+def _stock_data() -> dict:
+    """Already-validated fields of a stock trade."""
+    return {
+        "trade_id": 1,
+        "strategy_id": 1,
+        "brokerage": "ETRADE",
+        "account": "TEST1234",
+        "strategy": ["basic trade"],
+        "security": SecurityType.STOCK,
+        "trade_date": date(2023, 10, 15),
+        "symbol": "AAPL",
+        "action": Action.BUY,
+        "sub_action": SubAction.OPEN,
+        "quantity": 10.0,
+        "fees": 1.0,
+        "price_per_share": 150.0,
+    }
+
+
+def _option_data() -> dict:
+    """Already-validated fields of an option trade."""
+    data = _stock_data()
+    del data["price_per_share"]
+    data.update(
+        trade_id=2,
+        security=SecurityType.OPTION,
+        action=Action.SELL,
+        expiration_date=date(2023, 11, 17),
+        strike=150.0,
+        premium=2.0,
+        option_type=OptionType.CALL,
+    )
+    return data
+
+
+class TestFromTrusted(unittest.TestCase):
+    """Unit tests for building entries from trusted data without validation.
+
+    Valid Test Cases:
+        trusted entries equal entries from the validating constructor
+        many records at once keep their order and class
+
+    Invalid Test Cases:
+        invalid data is accepted silently when trusted validation is off
+        invalid data raises when trusted validation is on
+    """
+    def tearDown(self):
+        """Turns trusted validation back off."""
+        trade_entry.set_trusted_validation(False)
+
+    def test_matches_constructor(self):
+        """Tests that a trusted entry equals the same entry built by the constructor."""
+        self.assertEqual(StockEntry.from_trusted(_stock_data()), StockEntry(**_stock_data()))
+        self.assertEqual(OptionEntry.from_trusted(_option_data()), OptionEntry(**_option_data()))
+
+    def test_behaves_like_constructed_entry(self):
+        """Tests that dumping, properties, and frozen fields work on a trusted entry."""
+        trade = StockEntry.from_trusted(_stock_data())
+
+        self.assertEqual(trade.model_dump(), StockEntry(**_stock_data()).model_dump())
+        self.assertEqual(trade.model_fields_set, set(StockEntry.model_fields))
+        self.assertTrue(trade.is_bought_stock_etf)
+        with self.assertRaises(ValidationError):
+            trade.symbol = "MSFT"
+
+    def test_trusted_records(self):
+        """Tests that many records become entries in order."""
+        records = [dict(_stock_data(), trade_id=trade_id) for trade_id in range(1, 4)]
+
+        trades = StockEntry.from_trusted_records(records)
+
+        self.assertEqual([trade.trade_id for trade in trades], [1, 2, 3])
+        self.assertTrue(all(type(trade) is StockEntry for trade in trades))
+
+    def test_no_validation_by_default(self):
+        """Tests that trusted data skips the validators."""
+        trade = StockEntry.from_trusted(dict(_stock_data(), quantity=-1.0))
+
+        self.assertEqual(trade.quantity, -1.0)
+
+    def test_validation_switch(self):
+        """Tests that invalid trusted data raises once trusted validation is turned on."""
+        trade_entry.set_trusted_validation(True)
+
+        with self.assertRaises(ValidationError):
+            StockEntry.from_trusted(dict(_stock_data(), quantity=-1.0))
+        with self.assertRaises(ValidationError):
+            OptionEntry.from_trusted_records([_option_data(), dict(_option_data(), action=Action.DIVIDEND)])
+
+
+if __name__ == '__main__':
+    unittest.main()
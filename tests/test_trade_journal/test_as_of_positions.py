@@ -0,0 +1,128 @@
+# Imports
+import unittest
+from datetime import (
+    date,
+    timedelta,
+)
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.as_of_positions import AsOfIndex
+from trading_analytics.journal.core.calculate_profit import calculate_qty_and_profit
+
+
+def _trades() -> list:
+    """AAPL stock bought, sold, and paying a dividend, a call on AAPL, and a put on MSFT, out of date order."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "strategy": "basic trade",
+    }
+    option = {
+        "security": "OPTION",
+        "expiration_date": date(2023, 11, 17),
+    }
+    return [
+        StockEntry(**common, trade_id=1, trade_date=date(2023, 10, 2), security="STOCK", symbol="AAPL",
+                   action="BUY", sub_action="OPEN", quantity=100, fees=5.0, price_per_share=150.0),
+        StockEntry(**common, trade_id=2, trade_date=date(2023, 10, 9), security="STOCK", symbol="AAPL",
+                   action="SELL", sub_action="CLOSE", quantity=50, fees=3.0, price_per_share=160.0),
+        OptionEntry(**common, **option, trade_id=3, trade_date=date(2023, 10, 4), symbol="MSFT", action="BUY",
+                    sub_action="OPEN", quantity=2, fees=2.0, strike=300.0, premium=3.0, option_type="PUT"),
+        DividendEntry(**common, trade_id=4, trade_date=date(2023, 10, 4), security="DIVIDEND", symbol="AAPL",
+                      action="DIVIDEND", sub_action="DIVIDEND", quantity=100, fees=0.0, dividend_amount=25.0),
+        OptionEntry(**common, **option, trade_id=5, trade_date=date(2023, 10, 6), symbol="AAPL", action="SELL",
+                    sub_action="OPEN", quantity=1, fees=1.0, strike=170.0, premium=2.0, option_type="CALL"),
+        StockEntry(**common, trade_id=6, trade_date=date(2023, 10, 3), security="STOCK", symbol="AAPL",
+                   action="BUY", sub_action="OPEN", quantity=10, fees=1.0, price_per_share=151.0),
+    ]
+
+
+class TestAsOfIndex(unittest.TestCase):
+    """Unit tests for as-of position queries.
+
+    Test Cases:
+        positions match calculate_qty_and_profit over the trades up to each date, for several snapshot intervals
+        dates before the first trade
+        totals as arrays
+        changes over a date range
+        end before start and invalid snapshot intervals
+        a batch gives the same result as entries
+        no trades
+    """
+    def setUp(self):
+        """Create the trades."""
+        self.trades = _trades()
+
+    def test_positions(self):
+        """Tests that positions match calculate_qty_and_profit over the trades up to each date."""
+        for interval in (1, 2, 4, 256):
+            index = AsOfIndex(self.trades, snapshot_interval=interval)
+            for offset in range(10):
+                as_of = date(2023, 10, 1) + timedelta(days=offset)
+                expected = calculate_qty_and_profit([trade for trade in self.trades if trade.trade_date <= as_of])
+                results = index.positions(as_of)
+
+                with self.subTest(interval=interval, as_of=as_of):
+                    self.assertEqual(sorted(results), sorted(expected))
+                    for symbol, result in expected.items():
+                        self.assertAlmostEqual(results[symbol].profit, result.profit)
+                        self.assertEqual(results[symbol].stock_qty, result.stock_qty)
+                        self.assertEqual(results[symbol].option_qty, result.option_qty)
+
+    def test_before_first_trade(self):
+        """Tests that a date before the first trade gives no positions."""
+        self.assertEqual(AsOfIndex(self.trades).positions(date(2023, 1, 1)), {})
+
+    def test_totals(self):
+        """Tests the totals as arrays."""
+        symbols, totals = AsOfIndex(self.trades).totals(date(2023, 10, 4))
+
+        self.assertEqual(symbols, ["AAPL", "MSFT"])
+        self.assertEqual(totals.shape, (3, 2))
+        # -15005 - 1511 + 25, and -602
+        self.assertEqual(totals[0].tolist(), [-16491.0, -602.0])
+        self.assertEqual(totals[1].tolist(), [110.0, 0.0])
+        self.assertEqual(totals[2].tolist(), [0.0, 2.0])
+
+    def test_changes(self):
+        """Tests the changes over a date range."""
+        changes = AsOfIndex(self.trades, snapshot_interval=2).changes(date(2023, 10, 4), date(2023, 10, 9))
+
+        self.assertEqual(list(changes), ["AAPL", "MSFT"])
+        # 25 + 199 + 7997
+        self.assertEqual(changes["AAPL"].profit, 8221.0)
+        self.assertEqual(changes["AAPL"].stock_qty, -50.0)
+        self.assertEqual(changes["AAPL"].option_qty, 1.0)
+        self.assertEqual(changes["MSFT"].option_qty, 2.0)
+
+    def test_invalid_arguments(self):
+        """Tests that an end before the start and a non-positive snapshot interval raise ValueError."""
+        with self.assertRaises(ValueError):
+            AsOfIndex(self.trades).changes(date(2023, 10, 9), date(2023, 10, 4))
+        with self.assertRaises(ValueError):
+            AsOfIndex(self.trades, snapshot_interval=0)
+
+    def test_batch_input(self):
+        """Tests that a TradeBatch gives the same result as entries."""
+        as_of = date(2023, 10, 6)
+
+        self.assertEqual(
+            AsOfIndex(TradeBatch.from_entries(self.trades)).positions(as_of),
+            AsOfIndex(self.trades).positions(as_of)
+        )
+
+    def test_no_trades(self):
+        """Tests that an index without trades gives no positions."""
+        index = AsOfIndex([])
+
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.positions(date(2023, 10, 4)), {})
+        self.assertEqual(index.changes(date(2023, 10, 4), date(2023, 10, 9)), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+# Imports
+import unittest
+from datetime import date
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.enum.cost_basis_method import CostBasisMethod
+from trading_analytics.journal.core.cost_basis import calculate_cost_basis
+
+
+def _trades() -> list:
+    """Three AAPL buys, a dividend, a sale, and an assigned call in one account, and a buy in another account."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "strategy": "basic trade",
+        "symbol": "AAPL",
+    }
+    stock = {
+        **common,
+        "security": "STOCK",
+    }
+    return [
+        StockEntry(**stock, trade_id=1, account="TEST1234", trade_date=date(2023, 1, 2), action="BUY",
+                   sub_action="OPEN", quantity=100, fees=10.0, price_per_share=100.0),
+        StockEntry(**stock, trade_id=2, account="TEST1234", trade_date=date(2023, 2, 1), action="BUY",
+                   sub_action="OPEN", quantity=100, fees=0.0, price_per_share=120.0),
+        StockEntry(**stock, trade_id=3, account="TEST1234", trade_date=date(2023, 3, 1), action="BUY",
+                   sub_action="OPEN", quantity=100, fees=0.0, price_per_share=110.0),
+        DividendEntry(**common, trade_id=4, account="TEST1234", trade_date=date(2023, 3, 15), security="DIVIDEND",
+                      action="DIVIDEND", sub_action="DIVIDEND", quantity=300, fees=0.0, dividend_amount=75.0),
+        StockEntry(**stock, trade_id=5, account="TEST1234", trade_date=date(2023, 4, 3), action="SELL",
+                   sub_action="CLOSE", quantity=150, fees=15.0, price_per_share=130.0),
+        OptionEntry(**common, trade_id=6, account="TEST1234", trade_date=date(2023, 5, 19), security="OPTION",
+                    action="OPTION ASSIGNED", sub_action="CLOSE", quantity=1, fees=0.0, strike=140.0, premium=0.0,
+                    option_type="CALL", expiration_date=date(2023, 5, 19)),
+        StockEntry(**stock, trade_id=7, account="TEST5678", trade_date=date(2023, 1, 3), action="BUY",
+                   sub_action="OPEN", quantity=10, fees=0.0, price_per_share=90.0),
+    ]
+
+
+class TestCostBasis(unittest.TestCase):
+    """Unit tests for lot-level cost basis.
+
+    Test Cases:
+        FIFO closes the oldest lots first, including fees in cost and proceeds
+        LIFO closes the newest lots first
+        specific ID closes the chosen lots, then FIFO
+        chosen lots that are not open fall back to FIFO with a warning
+        lots are kept per account
+        selling more shares than are open
+        trades out of date order
+        realized, cost basis, and unrealized totals by symbol
+        a batch gives the same result as entries
+        no trades
+    """
+    def setUp(self):
+        """Create the trades."""
+        self.trades = _trades()
+
+    def test_fifo(self):
+        """Tests that FIFO closes the oldest lots first."""
+        result = calculate_cost_basis(self.trades)
+        sale, assignment = result.realized
+
+        self.assertEqual(sale.trade_id, 5)
+        self.assertEqual(sale.quantity, 150.0)
+        self.assertEqual(sale.lot_trade_ids, [1, 2])
+        # 100 * 100.1 + 50 * 120
+        self.assertAlmostEqual(sale.cost_basis, 16010.0)
+        self.assertAlmostEqual(sale.proceeds, 150 * 130.0 - 15.0)
+        self.assertAlmostEqual(sale.gain, 19485.0 - 16010.0)
+
+        self.assertEqual(assignment.trade_id, 6)
+        self.assertEqual(assignment.lot_trade_ids, [2, 3])
+        # 50 * 120 + 50 * 110
+        self.assertAlmostEqual(assignment.cost_basis, 11500.0)
+        self.assertAlmostEqual(assignment.gain, 14000.0 - 11500.0)
+
+        self.assertEqual([(lot.trade_id, lot.quantity) for lot in result.open_lots], [(7, 10.0), (3, 50.0)])
+
+    def test_lifo(self):
+        """Tests that LIFO closes the newest lots first."""
+        result = calculate_cost_basis(self.trades, method=CostBasisMethod.LIFO)
+        sale, assignment = result.realized
+
+        self.assertEqual(sale.lot_trade_ids, [3, 2])
+        self.assertAlmostEqual(sale.cost_basis, 100 * 110.0 + 50 * 120.0)
+        self.assertEqual(assignment.lot_trade_ids, [2, 1])
+        self.assertEqual([(lot.trade_id, lot.quantity) for lot in result.open_lots], [(1, 50.0), (7, 10.0)])
+
+    def test_specific_id(self):
+        """Tests that specific ID closes the chosen lots first, then FIFO."""
+        result = calculate_cost_basis(
+            self.trades,
+            method=CostBasisMethod.SPECIFIC_ID,
+            lot_selection={5: [2, 3]}
+        )
+        sale, assignment = result.realized
+
+        self.assertEqual(sale.lot_trade_ids, [2, 3])
+        self.assertAlmostEqual(sale.cost_basis, 100 * 120.0 + 50 * 110.0)
+        self.assertEqual(assignment.lot_trade_ids, [1])
+        self.assertAlmostEqual(assignment.cost_basis, 100 * 100.1)
+        self.assertEqual([(lot.trade_id, lot.quantity) for lot in result.open_lots], [(7, 10.0), (3, 50.0)])
+
+    def test_specific_id_not_open(self):
+        """Tests that chosen lots that are not open fall back to FIFO with a warning."""
+        with self.assertLogs("trading_analytics.journal.core.cost_basis", level="WARNING") as logs:
+            result = calculate_cost_basis(
+                self.trades,
+                method=CostBasisMethod.SPECIFIC_ID,
+                lot_selection={5: [7]}
+            )
+
+        self.assertEqual(result.realized[0].lot_trade_ids, [1, 2])
+        self.assertIn("Lot 7 selected by trade_id 5 is not open", logs.output[0])
+
+    def test_accounts(self):
+        """Tests that lots are kept per account."""
+        result = calculate_cost_basis(self.trades)
+
+        self.assertNotIn(7, result.realized[0].lot_trade_ids)
+        self.assertEqual(result.open_lots[0].account, "TEST5678")
+
+    def test_oversold(self):
+        """Tests that shares removed beyond the open shares are logged and left out of the gain."""
+        trades = self.trades[:1] + [
+            StockEntry(strategy_id=1, brokerage="etrade", strategy="basic trade", symbol="AAPL", security="STOCK",
+                       trade_id=8, account="TEST1234", trade_date=date(2023, 6, 1), action="SELL",
+                       sub_action="CLOSE", quantity=200, fees=0.0, price_per_share=150.0)
+        ]
+
+        with self.assertLogs("trading_analytics.journal.core.cost_basis", level="WARNING") as logs:
+            result = calculate_cost_basis(trades)
+
+        self.assertEqual(result.realized[0].quantity, 100.0)
+        self.assertAlmostEqual(result.realized[0].proceeds, 15000.0)
+        self.assertEqual(result.open_lots, [])
+        self.assertIn("Only 100.0 of 200.0 shares of AAPL", logs.output[0])
+
+    def test_date_order(self):
+        """Tests that trades are processed in trade date order."""
+        self.assertEqual(calculate_cost_basis(self.trades[::-1]), calculate_cost_basis(self.trades))
+
+    def test_totals_by_symbol(self):
+        """Tests the realized, cost basis, and unrealized totals by symbol."""
+        result = calculate_cost_basis(self.trades)
+
+        self.assertAlmostEqual(result.realized_by_symbol()["AAPL"], 3475.0 + 2500.0)
+        # (50 * 110 + 10 * 90) / 60
+        self.assertAlmostEqual(result.cost_basis_by_symbol()["AAPL"], 6400.0 / 60)
+        self.assertAlmostEqual(result.unrealized_by_symbol({"AAPL": 120.0})["AAPL"], 60 * 120.0 - 6400.0)
+        self.assertEqual(result.unrealized_by_symbol({}), {})
+
+    def test_batch_input(self):
+        """Tests that a TradeBatch gives the same result as entries."""
+        self.assertEqual(calculate_cost_basis(TradeBatch.from_entries(self.trades)), calculate_cost_basis(self.trades))
+
+    def test_no_trades(self):
+        """Tests that no trades give no gains and no lots."""
+        result = calculate_cost_basis([])
+
+        self.assertEqual(result.realized, [])
+        self.assertEqual(result.open_lots, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+# Imports
+import json
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+from unittest import mock
+
+import numpy as np
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core import (
+    engine_checkpoint,
+    profit_cache,
+)
+from trading_analytics.journal.core.engine_checkpoint import (
+    load_engine_checkpoint,
+    run_portfolio_engine_checkpointed,
+)
+from trading_analytics.journal.core.portfolio_engine import run_portfolio_engine
+from trading_analytics.journal.core.profit_cache import trades_fingerprints
+
+
+def _trades() -> list:
+    """Stock, dividend, and call trades on three symbols with awkward decimal amounts."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "ETRADE",
+        "account": "TEST1234",
+        "strategy": ["basic trade"],
+        "trade_date": date(2023, 10, 15),
+    }
+    trades = []
+    for index in range(20):
+        symbol = ["AAPL", "MSFT", "SPY"][index % 3]
+        trades.extend([
+            StockEntry(**common, trade_id=3 * index + 1, security="STOCK", symbol=symbol, action="BUY",
+                       sub_action="OPEN", quantity=index + 1, fees=0.65, price_per_share=100.1 + index * 0.37),
+            DividendEntry(**common, trade_id=3 * index + 2, security="DIVIDEND", symbol=symbol, action="DIVIDEND",
+                          sub_action="DIVIDEND", quantity=index + 1, fees=0.0, dividend_amount=1.1 * index),
+            OptionEntry(**common, trade_id=3 * index + 3, security="OPTION", symbol=symbol, action="SELL",
+                        sub_action="OPEN", quantity=1, fees=0.66, expiration_date=date(2023, 11, 17), strike=101.5,
+                        premium=1.13 + index * 0.01, option_type="CALL"),
+        ])
+    return trades
+
+
+class TestEngineCheckpoint(unittest.TestCase):
+    """Unit tests for checkpointing the portfolio engine.
+
+    Test Cases:
+        the first run writes a checkpoint and equals a full engine run
+        a later run only processes the new trades and still equals a full run exactly
+        an unchanged journal processes no trades
+        an edited, removed, or reordered earlier trade rebuilds the checkpoint
+        a checkpoint from another version or a corrupt file is rebuilt
+        the fingerprint of leading trades doesn't depend on the later trades, chunking, or representation
+        a warm start converts and processes only the new trades
+        a warm start on 300k trades is faster than a full engine run, only run when
+            TRADING_ANALYTICS_BENCHMARKS is set since it depends on the machine
+    """
+    def setUp(self):
+        """Create the trades and a temporary checkpoint path."""
+        self.trades = _trades()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.temp_dir.name, "engine.json")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def _run(
+        self,
+        trades: list
+    ) -> tuple:
+        """Runs the checkpointed engine and returns the result and the number of trades it processed."""
+        with mock.patch.object(
+            engine_checkpoint, "compute_trade_effects", wraps=engine_checkpoint.compute_trade_effects
+        ) as compute:
+            result = run_portfolio_engine_checkpointed(trades, self.checkpoint_path)
+
+        processed = sum(len(call.args[0]) for call in compute.call_args_list)
+        return result, processed
+
+    def test_first_run(self):
+        """Tests that the first run writes a checkpoint covering all trades."""
+        result, processed = self._run(self.trades)
+
+        checkpoint = load_engine_checkpoint(self.checkpoint_path)
+        self.assertEqual(result, run_portfolio_engine(self.trades))
+        self.assertEqual(processed, len(self.trades))
+        self.assertEqual(checkpoint.trade_count, len(self.trades))
+        self.assertEqual(checkpoint.last_trade_id, self.trades[-1].trade_id)
+
+    def test_only_new_trades(self):
+        """Tests that a restart folds in only the appended trades and gives the full result exactly."""
+        self._run(self.trades[:40])
+
+        result, processed = self._run(self.trades)
+
+        self.assertEqual(processed, len(self.trades) - 40)
+        self.assertEqual(result, run_portfolio_engine(self.trades))
+        self.assertEqual(list(result.symbol_results), list(run_portfolio_engine(self.trades).symbol_results))
+
+    def test_unchanged(self):
+        """Tests that an unchanged journal processes no trades."""
+        self._run(self.trades)
+
+        result, processed = self._run(TradeBatch.from_entries(self.trades))
+
+        self.assertEqual(processed, 0)
+        self.assertEqual(result, run_portfolio_engine(self.trades))
+
+    def test_stale_checkpoint(self):
+        """Tests that changes to trades the checkpoint covers rebuild it."""
+        edited = list(self.trades)
+        edited[5] = edited[5].model_copy(update={"fees": 9.99})
+        reordered = list(self.trades)
+        reordered[3], reordered[4] = reordered[4], reordered[3]
+        changes = {
+            "edited": edited,
+            "removed": self.trades[:10] + self.trades[11:],
+            "reordered": reordered,
+            "truncated": self.trades[:30],
+        }
+        for name, trades in changes.items():
+            with self.subTest(change=name):
+                self._run(self.trades[:40])
+
+                with self.assertLogs("trading_analytics.journal.core.engine_checkpoint", level="INFO"):
+                    result, processed = self._run(trades)
+
+                self.assertEqual(processed, len(trades))
+                self.assertEqual(result, run_portfolio_engine(trades))
+
+    def test_invalid_file(self):
+        """Tests that checkpoints from another version and corrupt files are rebuilt."""
+        self._run(self.trades)
+        with open(self.checkpoint_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        data["version"] = -1
+        with open(self.checkpoint_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+
+        _, processed = self._run(self.trades)
+        self.assertEqual(processed, len(self.trades))
+
+        with open(self.checkpoint_path, "w", encoding="utf-8") as file:
+            file.write("{not json")
+        with self.assertLogs("trading_analytics.journal.core.engine_checkpoint", level="WARNING"):
+            result, processed = self._run(self.trades)
+        self.assertEqual(processed, len(self.trades))
+        self.assertEqual(result, run_portfolio_engine(self.trades))
+
+    def test_fingerprint(self):
+        """Tests that the fingerprint of leading trades doesn't depend on the later trades or the representation."""
+        batch = TradeBatch.from_entries(self.trades)
+
+        with mock.patch.object(profit_cache, "FINGERPRINT_CHUNK_SIZE", 7):
+            leading = trades_fingerprints(self.trades[:25], [25])
+            self.assertEqual(trades_fingerprints(self.trades, [25]), leading)
+            self.assertEqual(trades_fingerprints(batch, [25]), leading)
+            self.assertEqual(trades_fingerprints(batch.take(np.arange(25)), [25]), leading)
+            self.assertNotIn(leading[0], trades_fingerprints(self.trades, [24, 26]))
+
+    def test_warm_start_work(self):
+        """Tests that a warm start converts and processes only the new trades."""
+        self._run(self.trades[:50])
+
+        with mock.patch.object(
+            engine_checkpoint.TradeBatch, "from_entries", wraps=engine_checkpoint.TradeBatch.from_entries
+        ) as from_entries:
+            result, processed = self._run(self.trades)
+
+        self.assertEqual(processed, len(self.trades) - 50)
+        self.assertEqual([len(call.args[0]) for call in from_entries.call_args_list], [len(self.trades) - 50])
+        self.assertEqual(result, run_portfolio_engine(self.trades))
+
+    @unittest.skipUnless(
+        os.environ.get("TRADING_ANALYTICS_BENCHMARKS"),
+        "timing benchmark, set TRADING_ANALYTICS_BENCHMARKS to run it"
+    )
+    def test_warm_start_time(self):
+        """Tests that a warm start on 300k trades is faster than running the engine over all of them."""
+        def best_time(function):
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                function()
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        batch = TradeBatch.from_entries(self.trades * 5000)
+        leading = batch.take(np.arange(len(batch) - 1000))
+        run_portfolio_engine_checkpointed(leading, self.checkpoint_path)
+
+        def warm_start():
+            run_portfolio_engine_checkpointed(batch, self.checkpoint_path)
+            # Keep the checkpoint at the leading trades for the next round
+            run_portfolio_engine_checkpointed(leading, self.checkpoint_path)
+
+        warm = best_time(warm_start) / 2
+        full = best_time(lambda: run_portfolio_engine(batch))
+
+        self.assertLess(warm, full)
+
+
+if __name__ == '__main__':
+    unittest.main()
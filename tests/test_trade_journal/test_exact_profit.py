@@ -0,0 +1,136 @@
+# Imports
+import unittest
+from datetime import date
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.calculate_profit import calculate_qty_and_profit
+from trading_analytics.journal.core.exact_profit import (
+    ScaledTrades,
+    calculate_qty_and_profit_exact,
+    exact_totals,
+)
+
+COMMON = {
+    "strategy_id": 1,
+    "brokerage": "etrade",
+    "account": "TEST1234",
+    "strategy": "basic trade",
+    "trade_date": date(2023, 10, 15),
+}
+
+
+def _stock(trade_id: int, action: str, quantity: float, price: float, fees: float, symbol: str = "AAPL") -> StockEntry:
+    """Creates a stock trade."""
+    return StockEntry(**COMMON, trade_id=trade_id, security="STOCK", symbol=symbol, action=action,
+                      sub_action="OPEN" if action == "BUY" else "CLOSE", quantity=quantity, fees=fees,
+                      price_per_share=price)
+
+
+def _trades() -> list:
+    """Stock buys and a sale, a dividend, and a call on AAPL, and a put on MSFT."""
+    return [
+        _stock(1, "BUY", 100, 150.0, 5.0),
+        _stock(2, "SELL", 50, 160.0, 3.0),
+        DividendEntry(**COMMON, trade_id=3, security="DIVIDEND", symbol="AAPL", action="DIVIDEND",
+                      sub_action="DIVIDEND", quantity=100, fees=0.0, dividend_amount=25.0),
+        OptionEntry(**COMMON, trade_id=4, security="OPTION", symbol="AAPL", action="SELL", sub_action="OPEN",
+                    quantity=1, fees=1.0, strike=170.0, premium=2.0, option_type="CALL",
+                    expiration_date=date(2023, 11, 17)),
+        OptionEntry(**COMMON, trade_id=5, security="OPTION", symbol="MSFT", action="BUY", sub_action="OPEN",
+                    quantity=2, fees=2.0, strike=300.0, premium=3.0, option_type="PUT",
+                    expiration_date=date(2023, 11, 17)),
+    ]
+
+
+class TestExactProfit(unittest.TestCase):
+    """Unit tests for the exact integer arithmetic mode.
+
+    Test Cases:
+        results match calculate_qty_and_profit for amounts exact in binary
+        totals are exact sums of cents where float totals drift
+        each trade's cash is rounded to cents half away from zero
+        fractional quantities
+        per-symbol totals in cents and scaled quantities, with converted values reused
+        warnings for unexpected trades
+        values too large for exact arithmetic
+        no trades
+    """
+    def test_matches_float_path(self):
+        """Tests that results match calculate_qty_and_profit when the float arithmetic is exact."""
+        trades = _trades()
+
+        self.assertEqual(calculate_qty_and_profit_exact(trades), calculate_qty_and_profit(trades))
+
+    def test_no_drift(self):
+        """Tests that totals are exact sums of cents where the float totals drift."""
+        trades = [_stock(trade_id, "SELL", 1, 0.1, 0.0) for trade_id in range(1, 11)]
+
+        self.assertNotEqual(calculate_qty_and_profit(trades)["AAPL"].profit, 1.0)
+        self.assertEqual(calculate_qty_and_profit_exact(trades)["AAPL"].profit, 1.0)
+        self.assertEqual(exact_totals(TradeBatch.from_entries(trades)).profit_cents.tolist(), [100])
+
+    def test_rounding(self):
+        """Tests that each trade's cash is rounded to cents half away from zero."""
+        trades = [
+            _stock(1, "SELL", 1, 0.005, 0.0, symbol="UP"),
+            _stock(2, "BUY", 1, 0.005, 0.0, symbol="DOWN"),
+            _stock(3, "SELL", 3, 0.0033, 0.0, symbol="SMALL"),
+        ]
+
+        totals = exact_totals(TradeBatch.from_entries(trades))
+
+        self.assertEqual(totals.profit_cents.tolist(), [1, -1, 1])
+
+    def test_fractional_quantities(self):
+        """Tests fractional share quantities."""
+        trades = [_stock(1, "BUY", 0.5, 101.01, 0.0), _stock(2, "SELL", 0.25, 120.0, 0.0)]
+
+        result = calculate_qty_and_profit_exact(trades)["AAPL"]
+
+        # -50.505 rounds to -50.51
+        self.assertEqual(result.profit, -20.51)
+        self.assertEqual(result.stock_qty, 0.25)
+
+    def test_exact_totals(self):
+        """Tests the per-symbol totals in cents and scaled quantities, with converted values reused."""
+        batch = TradeBatch.from_entries(_trades())
+        scaled = ScaledTrades.from_batch(batch)
+
+        totals = exact_totals(batch, scaled)
+
+        self.assertEqual(totals.symbols, ["AAPL", "MSFT"])
+        self.assertEqual(totals.profit_cents.tolist(), [-678400, -60200])
+        self.assertEqual(totals.stock_qty.tolist(), [500000, 0])
+        self.assertEqual(totals.option_qty.tolist(), [10000, 20000])
+        self.assertEqual(calculate_qty_and_profit_exact(batch, scaled), calculate_qty_and_profit_exact(batch))
+
+    def test_warnings(self):
+        """Tests that unexpected trades are logged like the float path."""
+        trades = [
+            OptionEntry(**COMMON, trade_id=7, security="OPTION", symbol="MSFT", action="SELL", sub_action="OPEN",
+                        quantity=1, fees=1.0, strike=300.0, premium=3.0, option_type="PUT",
+                        expiration_date=date(2023, 11, 17)),
+        ]
+
+        with self.assertLogs("trading_analytics.journal.core.vectorized_profit", level="WARNING") as logs:
+            calculate_qty_and_profit_exact(trades)
+
+        self.assertIn("for trade_id 7", logs.output[0])
+
+    def test_too_large(self):
+        """Tests that values too large for exact arithmetic raise ValueError."""
+        with self.assertRaises(ValueError):
+            calculate_qty_and_profit_exact([_stock(1, "BUY", 1e15, 1.0, 0.0)])
+        with self.assertRaises(ValueError):
+            calculate_qty_and_profit_exact([_stock(1, "BUY", 1e9, 1e9, 0.0)])
+
+    def test_no_trades(self):
+        """Tests that no trades give an empty result."""
+        self.assertEqual(calculate_qty_and_profit_exact([]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+# Imports
+import unittest
+from datetime import date
+
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.enum.contract_status import ContractStatus
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.journal.core.option_contracts import match_option_contracts
+
+
+def _option(trade_id: int, trade_date: date, action: str, sub_action: str, quantity: float, **fields) -> OptionEntry:
+    """Creates an AAPL 170 call expiring 2023-11-17 in account TEST1234, unless overridden."""
+    values = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "strategy": "basic trade",
+        "security": "OPTION",
+        "symbol": "AAPL",
+        "option_type": "CALL",
+        "strike": 170.0,
+        "expiration_date": date(2023, 11, 17),
+        "premium": 2.0,
+        "fees": 1.0,
+        **fields,
+    }
+    return OptionEntry(trade_id=trade_id, trade_date=trade_date, action=action, sub_action=sub_action,
+                       quantity=quantity, **values)
+
+
+class TestOptionContracts(unittest.TestCase):
+    """Unit tests for matching option trades into contract lifecycles.
+
+    Test Cases:
+        opens paired with partial closes and an expiration
+        contracts are keyed by option type, strike, expiration date, and account
+        assigned and exercised contracts
+        open contracts and their holding period
+        a closed contract opened again starts a new lifecycle
+        closes without opens are flagged as unmatched
+        trades out of date order and non-option trades
+        a batch gives the same result as entries
+        no trades
+    """
+    def test_lifecycle(self):
+        """Tests that opens are paired with partial closes and an expiration."""
+        trades = [
+            _option(1, date(2023, 10, 2), "SELL", "OPEN", 2),
+            _option(2, date(2023, 10, 20), "BUY", "CLOSE", 1, premium=1.0),
+            _option(3, date(2023, 11, 17), "OPTION EXPIRED", "CLOSE", 1, premium=0.0, fees=0.0),
+        ]
+
+        contracts = match_option_contracts(trades)
+
+        self.assertEqual(len(contracts), 1)
+        contract = contracts[0]
+        self.assertEqual(contract.symbol, "AAPL")
+        self.assertEqual(contract.option_type, OptionType.CALL)
+        self.assertTrue(contract.is_short)
+        self.assertEqual(contract.opened_quantity, 2.0)
+        self.assertEqual(contract.closed_quantity, 2.0)
+        self.assertEqual(contract.open_quantity, 0.0)
+        # 400 - 1 - 100 - 1
+        self.assertEqual(contract.realized_profit, 298.0)
+        self.assertEqual(contract.holding_days, 46)
+        self.assertEqual(contract.status, ContractStatus.EXPIRED)
+        self.assertEqual(contract.trade_ids, [1, 2, 3])
+
+    def test_contract_keys(self):
+        """Tests that contracts are keyed by option type, strike, expiration date, and account."""
+        trades = [
+            _option(1, date(2023, 10, 2), "SELL", "OPEN", 1),
+            _option(2, date(2023, 10, 2), "BUY", "OPEN", 1, option_type="PUT"),
+            _option(3, date(2023, 10, 2), "SELL", "OPEN", 1, strike=175.0),
+            _option(4, date(2023, 10, 2), "SELL", "OPEN", 1, expiration_date=date(2023, 12, 15)),
+            _option(5, date(2023, 10, 2), "SELL", "OPEN", 1, account="TEST5678"),
+            _option(6, date(2023, 10, 3), "SELL", "OPEN", 1),
+        ]
+
+        contracts = match_option_contracts(trades)
+
+        self.assertEqual([contract.trade_ids for contract in contracts], [[1, 6], [2], [3], [4], [5]])
+        self.assertFalse(contracts[1].is_short)
+
+    def test_assigned_and_exercised(self):
+        """Tests that assignments and exercises end contracts without counting the strike as profit."""
+        trades = [
+            _option(1, date(2023, 10, 2), "SELL", "OPEN", 1),
+            _option(2, date(2023, 11, 17), "OPTION ASSIGNED", "CLOSE", 1, premium=0.0, fees=0.0),
+            _option(3, date(2023, 10, 2), "BUY", "OPEN", 1, strike=160.0),
+            _option(4, date(2023, 11, 10), "OPTION EXERCISED", "CLOSE", 1, strike=160.0, premium=0.0),
+        ]
+
+        assigned, exercised = match_option_contracts(trades)
+
+        self.assertEqual(assigned.status, ContractStatus.ASSIGNED)
+        self.assertEqual(assigned.realized_profit, 199.0)
+        self.assertEqual(exercised.status, ContractStatus.EXERCISED)
+        self.assertEqual(exercised.realized_profit, -202.0)
+
+    def test_open_contract(self):
+        """Tests that open contracts are OPEN with a holding period up to as_of."""
+        trades = [_option(1, date(2023, 10, 2), "BUY", "OPEN", 3)]
+
+        self.assertIsNone(match_option_contracts(trades)[0].holding_days)
+        contract = match_option_contracts(trades, as_of=date(2023, 10, 12))[0]
+        self.assertEqual(contract.status, ContractStatus.OPEN)
+        self.assertEqual(contract.open_quantity, 3.0)
+        self.assertEqual(contract.holding_days, 10)
+
+    def test_reopened(self):
+        """Tests that a closed contract opened again starts a new lifecycle."""
+        trades = [
+            _option(1, date(2023, 10, 2), "SELL", "OPEN", 1),
+            _option(2, date(2023, 10, 5), "BUY", "CLOSE", 1),
+            _option(3, date(2023, 10, 9), "SELL", "OPEN", 1),
+        ]
+
+        first, second = match_option_contracts(trades)
+
+        self.assertEqual(first.status, ContractStatus.CLOSED)
+        self.assertEqual(first.trade_ids, [1, 2])
+        self.assertEqual(second.status, ContractStatus.OPEN)
+        self.assertEqual(second.trade_ids, [3])
+
+    def test_unmatched(self):
+        """Tests that contracts closed without being opened are flagged and logged."""
+        trades = [
+            _option(1, date(2023, 10, 2), "SELL", "OPEN", 1),
+            _option(2, date(2023, 10, 5), "BUY", "CLOSE", 3),
+        ]
+
+        with self.assertLogs("trading_analytics.journal.core.option_contracts", level="WARNING") as logs:
+            contract = match_option_contracts(trades)[0]
+
+        self.assertEqual(contract.status, ContractStatus.UNMATCHED)
+        self.assertEqual(contract.closed_quantity, 1.0)
+        self.assertEqual(contract.unmatched_quantity, 2.0)
+        self.assertIn("2.0 AAPL CALL 170.0 2023-11-17 contracts in account TEST1234", logs.output[0])
+
+    def test_order_and_other_trades(self):
+        """Tests that trades are matched in date order and non-option trades are ignored."""
+        stock = StockEntry(trade_id=9, strategy_id=1, brokerage="etrade", account="TEST1234", strategy="basic trade",
+                           security="STOCK", symbol="AAPL", trade_date=date(2023, 10, 1), action="BUY",
+                           sub_action="OPEN", quantity=100, fees=0.0, price_per_share=150.0)
+        trades = [
+            _option(2, date(2023, 10, 5), "BUY", "CLOSE", 1),
+            stock,
+            _option(1, date(2023, 10, 2), "SELL", "OPEN", 1),
+        ]
+
+        contract, = match_option_contracts(trades)
+
+        self.assertEqual(contract.trade_ids, [1, 2])
+        self.assertEqual(contract.status, ContractStatus.CLOSED)
+
+    def test_batch_input(self):
+        """Tests that a TradeBatch gives the same result as entries."""
+        trades = [
+            _option(1, date(2023, 10, 2), "SELL", "OPEN", 2),
+            _option(2, date(2023, 10, 20), "BUY", "CLOSE", 1),
+        ]
+
+        self.assertEqual(match_option_contracts(TradeBatch.from_entries(trades)), match_option_contracts(trades))
+
+    def test_no_trades(self):
+        """Tests that no trades give no contracts."""
+        self.assertEqual(match_option_contracts([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+# Imports
+import unittest
+from datetime import date
+from unittest import mock
+
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.market.stock_data import CurrentStockData
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.journal.core import portfolio_data
+from trading_analytics.journal.core.calculate_profit import (
+    calculate_qty_and_profit,
+    get_current_positions,
+)
+from trading_analytics.journal.core.option_expiry import (
+    apply_expiries,
+    synthesize_expiries,
+)
+
+
+def _option(trade_id: int, action: str, sub_action: str, quantity: float, **fields) -> OptionEntry:
+    """Creates an AAPL 170 call traded 2023-10-02 and expiring 2023-11-17, unless overridden."""
+    values = {
+        "strategy_id": 2,
+        "brokerage": "ETRADE",
+        "account": "TEST1234",
+        "strategy": "covered call",
+        "security": "OPTION",
+        "symbol": "AAPL",
+        "trade_date": date(2023, 10, 2),
+        "option_type": "CALL",
+        "strike": 170.0,
+        "expiration_date": date(2023, 11, 17),
+        "premium": 2.0,
+        "fees": 1.0,
+        **fields,
+    }
+    return OptionEntry(trade_id=trade_id, action=action, sub_action=sub_action, quantity=quantity, **values)
+
+
+def _trades() -> list:
+    """An AAPL call partly closed, a closed MSFT call, and an open MSFT call expiring later."""
+    return [
+        _option(1, "SELL", "OPEN", 3),
+        _option(2, "BUY", "CLOSE", 1, trade_date=date(2023, 10, 20)),
+        _option(3, "BUY", "OPEN", 1, symbol="MSFT", strike=300.0),
+        _option(4, "SELL", "CLOSE", 1, symbol="MSFT", strike=300.0, trade_date=date(2023, 11, 1)),
+        _option(5, "BUY", "OPEN", 2, symbol="MSFT", strike=310.0, expiration_date=date(2023, 12, 15)),
+    ]
+
+
+class TestOptionExpiry(unittest.TestCase):
+    """Unit tests for synthetic expiry of options past their expiration date.
+
+    Test Cases:
+        expiries are created for the open quantity of contracts expired before as_of
+        contracts expiring on as_of or later are still open
+        the expiries bring the option quantity of the expired contracts to zero without changing profit
+        dry-run mode only logs the expiries
+        the portfolio load drops expired option positions when given as_of
+        no trades
+    """
+    def setUp(self):
+        """Create the trades."""
+        self.trades = _trades()
+
+    def test_synthesize(self):
+        """Tests the synthetic expiry of the open AAPL contracts."""
+        expiries = synthesize_expiries(self.trades, date(2023, 11, 20))
+
+        self.assertEqual(len(expiries), 1)
+        expiry = expiries[0]
+        self.assertEqual(expiry.trade_id, 6)
+        self.assertEqual(expiry.symbol, "AAPL")
+        self.assertEqual(expiry.action, Action.OPTION_EXPIRED)
+        self.assertEqual(expiry.sub_action, SubAction.CLOSE)
+        self.assertEqual(expiry.quantity, 2.0)
+        self.assertEqual(expiry.trade_date, date(2023, 11, 17))
+        self.assertEqual(expiry.strike, 170.0)
+        self.assertEqual(expiry.strategy_id, 2)
+        self.assertEqual(expiry.strategy, ["covered call"])
+        self.assertEqual(expiry.account, "TEST1234")
+
+    def test_as_of(self):
+        """Tests that contracts expiring on as_of or later are still open."""
+        self.assertEqual(synthesize_expiries(self.trades, date(2023, 11, 17)), [])
+        self.assertEqual(
+            [expiry.symbol for expiry in synthesize_expiries(self.trades, date(2024, 1, 2))],
+            ["AAPL", "MSFT"]
+        )
+
+    def test_quantities(self):
+        """Tests that the expiries close the expired contracts without changing profit."""
+        before = calculate_qty_and_profit(self.trades)
+        after = calculate_qty_and_profit(apply_expiries(self.trades, date(2023, 11, 20)))
+
+        self.assertEqual(before["AAPL"].option_qty, 2.0)
+        self.assertEqual(after["AAPL"].option_qty, 0.0)
+        self.assertEqual(after["AAPL"].profit, before["AAPL"].profit)
+        self.assertEqual(after["MSFT"], before["MSFT"])
+        self.assertNotIn("AAPL", get_current_positions(after))
+
+    def test_dry_run(self):
+        """Tests that dry-run mode logs the expiries and returns the trades unchanged."""
+        with self.assertLogs("trading_analytics.journal.core.option_expiry", level="INFO") as logs:
+            trades = apply_expiries(self.trades, date(2023, 11, 20), dry_run=True)
+
+        self.assertEqual(trades, self.trades)
+        self.assertIn("Would expire 2.0 AAPL CALL 170.0 2023-11-17 contracts", logs.output[0])
+
+    def test_portfolio_load(self):
+        """Tests that loading the portfolio as of a date drops the expired option positions."""
+        def load(**kwargs):
+            with mock.patch.object(portfolio_data, "load_trades_from_excel", return_value=self.trades), \
+                    mock.patch.object(portfolio_data, "fetch_current_stock_price",
+                                      return_value=CurrentStockData(symbol="AAPL", current_price=120.0)), \
+                    mock.patch("builtins.print"):
+                return portfolio_data.load_and_process_portfolio_data("trades.xlsx", **kwargs)
+
+        self.assertEqual([position.symbol for position in load()], ["AAPL", "MSFT"])
+        self.assertEqual([position.symbol for position in load(as_of=date(2023, 11, 20))], ["MSFT"])
+
+    def test_no_trades(self):
+        """Tests that no trades give no expiries."""
+        self.assertEqual(synthesize_expiries([], date(2023, 11, 20)), [])
+        self.assertEqual(apply_expiries([], date(2023, 11, 20)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+# Imports
+import math
+import os
+import time
+import unittest
+from datetime import date
+from unittest import mock
+
+import numpy as np
+
+from trading_analytics.data.portfolio.option_contract import OptionContract
+from trading_analytics.journal.core.option_pricing import (
+    DEFAULT_VOLATILITY,
+    black_scholes,
+    norm_cdf,
+    value_option_contracts,
+)
+
+
+def _reference(spot: float, strike: float, years: float, rate: float, volatility: float, is_call: bool) -> dict:
+    """Black-Scholes price and Greeks of one option, with the exact normal distribution."""
+    d1 = (math.log(spot / strike) + (rate + volatility ** 2 / 2) * years) / (volatility * math.sqrt(years))
+    d2 = d1 - volatility * math.sqrt(years)
+    cdf = lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2)))  # noqa: E731
+    pdf = math.exp(-d1 ** 2 / 2) / math.sqrt(2 * math.pi)
+    discount = math.exp(-rate * years)
+    if is_call:
+        price = spot * cdf(d1) - strike * discount * cdf(d2)
+        delta = cdf(d1)
+        theta = -spot * pdf * volatility / (2 * math.sqrt(years)) - rate * strike * discount * cdf(d2)
+    else:
+        price = strike * discount * cdf(-d2) - spot * cdf(-d1)
+        delta = cdf(d1) - 1
+        theta = -spot * pdf * volatility / (2 * math.sqrt(years)) + rate * strike * discount * cdf(-d2)
+
+    return {
+        "price": price,
+        "delta": delta,
+        "gamma": pdf / (spot * volatility * math.sqrt(years)),
+        "theta": theta / 365,
+        "vega": spot * pdf * math.sqrt(years) / 100,
+    }
+
+
+def _contract(symbol: str, option_type: str, strike: float, expiration: date, opened: float = 1,
+              closed: float = 0, is_short: bool = False) -> OptionContract:
+    """Creates an option contract."""
+    return OptionContract(symbol=symbol, option_type=option_type, strike=strike, expiration_date=expiration,
+                          account="TEST1234", is_short=is_short, opened_quantity=opened, closed_quantity=closed)
+
+
+class TestOptionPricing(unittest.TestCase):
+    """Unit tests for Black-Scholes valuation.
+
+    Test Cases:
+        the normal distribution function is within 1e-7 of the exact one
+        prices and Greeks match the closed form for calls and puts
+        the textbook at-the-money example and put-call parity
+        expired options are worth their intrinsic value
+        non-positive volatility
+        open contracts valued from prices, with market value by symbol
+        rate and volatility from environment variables, and volatility by symbol
+        contracts without an underlying price
+        100,000 contracts in one call
+    """
+    def test_norm_cdf(self):
+        """Tests the normal distribution function against math.erf."""
+        x = np.linspace(-8, 8, 1601)
+        exact = np.array([0.5 * (1 + math.erf(value / math.sqrt(2))) for value in x])
+
+        self.assertLess(np.max(np.abs(norm_cdf(x) - exact)), 1e-7)
+
+    def test_matches_closed_form(self):
+        """Tests prices and Greeks against the closed form."""
+        cases = [
+            (100.0, 110.0, 0.25, 0.03, 0.25, True),
+            (100.0, 110.0, 0.25, 0.03, 0.25, False),
+            (50.0, 40.0, 2.0, 0.05, 0.6, True),
+            (50.0, 40.0, 2.0, 0.05, 0.6, False),
+        ]
+        spot, strike, years, rate, volatility, is_call = map(np.array, zip(*cases))
+        greeks = black_scholes(spot, strike, years, rate, volatility, is_call)
+
+        for index, case in enumerate(cases):
+            for name, value in _reference(*case).items():
+                self.assertAlmostEqual(greeks[name][index], value, places=4, msg=f"{name} of {case}")
+
+    def test_textbook_example(self):
+        """Tests the at-the-money example and put-call parity."""
+        greeks = black_scholes(100.0, 100.0, 1.0, 0.05, 0.2, np.array([True, False]))
+
+        self.assertAlmostEqual(greeks["price"][0], 10.4506, places=3)
+        self.assertAlmostEqual(greeks["price"][1], 5.5735, places=3)
+        self.assertAlmostEqual(greeks["price"][0] - greeks["price"][1], 100 - 100 * math.exp(-0.05), places=5)
+
+    def test_expired(self):
+        """Tests that expired options are worth their intrinsic value."""
+        greeks = black_scholes(np.array([120.0, 120.0, 80.0]), 100.0, np.array([0.0, -0.1, 0.0]), 0.05, 0.2,
+                               np.array([True, False, False]))
+
+        np.testing.assert_allclose(greeks["price"], [20.0, 0.0, 20.0])
+        np.testing.assert_allclose(greeks["delta"], [1.0, 0.0, -1.0])
+        for name in ("gamma", "theta", "vega"):
+            np.testing.assert_allclose(greeks[name], 0.0)
+
+    def test_invalid_volatility(self):
+        """Tests that volatility must be positive."""
+        with self.assertRaises(ValueError):
+            black_scholes(100.0, 100.0, 1.0, 0.05, 0.0, True)
+
+    def test_value_option_contracts(self):
+        """Tests valuing open contracts from underlying prices."""
+        contracts = [
+            _contract("AAPL", "CALL", 110.0, date(2024, 1, 19), is_short=True),
+            _contract("AAPL", "PUT", 90.0, date(2024, 1, 19), opened=2, closed=2),
+            _contract("MSFT", "PUT", 300.0, date(2024, 3, 15), opened=3, closed=1),
+        ]
+        valuation = value_option_contracts(contracts, {"AAPL": 100.0, "MSFT": 310.0}, date(2023, 10, 15),
+                                           rate=0.04, volatility=0.3)
+
+        self.assertEqual([contract.strike for contract in valuation.contracts], [110.0, 300.0])
+        np.testing.assert_allclose(valuation.quantity, [-1.0, 2.0])
+        call = _reference(100.0, 110.0, 96 / 365, 0.04, 0.3, True)
+        put = _reference(310.0, 300.0, 152 / 365, 0.04, 0.3, False)
+        np.testing.assert_allclose(valuation.price, [call["price"], put["price"]], atol=1e-4)
+        np.testing.assert_allclose(valuation.delta, [call["delta"], put["delta"]], atol=1e-6)
+        np.testing.assert_allclose(valuation.market_value, [-100 * call["price"], 200 * put["price"]], rtol=1e-5)
+        self.assertEqual(list(valuation.market_value_by_symbol()), ["AAPL", "MSFT"])
+
+    def test_settings(self):
+        """Tests rate and volatility from environment variables, and volatility by symbol."""
+        contracts = [
+            _contract("AAPL", "CALL", 100.0, date(2024, 10, 14)),
+            _contract("MSFT", "CALL", 100.0, date(2024, 10, 14)),
+        ]
+        prices = {"AAPL": 100.0, "MSFT": 100.0}
+        environment = {"TRADING_ANALYTICS_RISK_FREE_RATE": "0.05", "TRADING_ANALYTICS_VOLATILITY": "0.2"}
+
+        with mock.patch.dict(os.environ, environment):
+            valuation = value_option_contracts(contracts, prices, date(2023, 10, 15), volatility={"MSFT": 0.5})
+
+        years = 365 / 365
+        np.testing.assert_allclose(valuation.price, [
+            _reference(100.0, 100.0, years, 0.05, 0.2, True)["price"],
+            _reference(100.0, 100.0, years, 0.05, 0.5, True)["price"],
+        ], atol=1e-4)
+
+        with mock.patch.dict(os.environ, {"TRADING_ANALYTICS_VOLATILITY": "high"}):
+            with self.assertLogs("trading_analytics.journal.core.option_pricing", level="WARNING"):
+                valuation = value_option_contracts(contracts[:1], prices, date(2023, 10, 15), rate=0.05)
+        self.assertAlmostEqual(
+            valuation.price[0], _reference(100.0, 100.0, years, 0.05, DEFAULT_VOLATILITY, True)["price"], places=4
+        )
+
+    def test_missing_price(self):
+        """Tests that contracts without an underlying price get NaN values."""
+        contracts = [_contract("TSLA", "PUT", 200.0, date(2024, 1, 19))]
+
+        with self.assertLogs("trading_analytics.journal.core.option_pricing", level="WARNING"):
+            valuation = value_option_contracts(contracts, {}, date(2023, 10, 15), rate=0.04, volatility=0.3)
+
+        self.assertTrue(np.isnan(valuation.price[0]))
+
+    def test_large_batch(self):
+        """Tests valuing 100,000 options in one call."""
+        rng = np.random.default_rng(0)
+        count = 100_000
+        start = time.perf_counter()
+        greeks = black_scholes(rng.uniform(50, 150, count), rng.uniform(50, 150, count), rng.uniform(0, 2, count),
+                               0.04, rng.uniform(0.1, 0.8, count), rng.random(count) < 0.5)
+        elapsed = time.perf_counter() - start
+
+        self.assertTrue(np.all(np.isfinite(greeks["price"])))
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+# Imports
+import unittest
+from datetime import date
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.journal.core.portfolio_accumulator import PortfolioAccumulator
+from trading_analytics.journal.core.portfolio_engine import run_portfolio_engine
+
+
+def _trades() -> list:
+    """Stock, ETF, dividend, call, and put trades on three symbols with awkward decimal amounts."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "ETRADE",
+        "account": "TEST1234",
+        "strategy": ["basic trade"],
+        "trade_date": date(2023, 10, 15),
+    }
+    option = {
+        "security": "OPTION",
+        "expiration_date": date(2023, 11, 17),
+        "strike": 101.5,
+    }
+    trades = []
+    for index in range(30):
+        symbol = ["AAPL", "MSFT", "SPY"][index % 3]
+        trade_id = 5 * index
+        trades.extend([
+            StockEntry(**common, trade_id=trade_id + 1, security="STOCK" if index % 2 else "ETF", symbol=symbol,
+                       action="BUY", sub_action="OPEN", quantity=index + 1, fees=0.65,
+                       price_per_share=100.1 + index * 0.37),
+            StockEntry(**common, trade_id=trade_id + 2, security="STOCK", symbol=symbol, action="SELL",
+                       sub_action="CLOSE", quantity=1, fees=0.65, price_per_share=103.3 + index * 0.29),
+            DividendEntry(**common, trade_id=trade_id + 3, security="DIVIDEND", symbol=symbol, action="DIVIDEND",
+                          sub_action="DIVIDEND", quantity=index + 1, fees=0.0, dividend_amount=1.1 * index),
+            OptionEntry(**common, **option, trade_id=trade_id + 4, symbol=symbol, action="SELL", sub_action="OPEN",
+                        quantity=1, fees=0.66, premium=1.13 + index * 0.01, option_type="CALL"),
+            OptionEntry(**common, **option, trade_id=trade_id + 5, symbol=symbol,
+                        action="OPTION ASSIGNED" if index % 4 == 0 else "SELL", sub_action="OPEN", quantity=1,
+                        fees=0.66, premium=0.9, option_type="PUT"),
+        ])
+    return trades
+
+
+class TestPortfolioAccumulator(unittest.TestCase):
+    """Unit tests for the incremental portfolio accumulator.
+
+    Test Cases:
+        adding trades in order equals a full engine run exactly
+        adding trades one at a time keeps up with the engine after every trade
+        removing trades equals recomputing without them exactly
+        removing the last trade of a symbol drops the symbol
+        replacing an edited trade keeps its place and equals recomputing exactly
+        replacing a trade with one of another symbol
+        unexpected combinations are logged on add
+        removing a trade of an unknown symbol raises
+        removing a trade that was never added raises
+        adding the same trade_id twice raises
+        extending with a repeated trade_id raises and adds nothing
+    """
+    def setUp(self):
+        """Create the trades."""
+        self.trades = _trades()
+
+    def test_matches_engine(self):
+        """Tests that accumulated totals equal a full engine run exactly."""
+        with self.assertLogs("trading_analytics.journal.core.portfolio_accumulator", level="WARNING"):
+            accumulator = PortfolioAccumulator(self.trades)
+        with self.assertLogs("trading_analytics.journal.core.vectorized_profit", level="WARNING"):
+            expected = run_portfolio_engine(self.trades)
+
+        self.assertEqual(len(accumulator), len(self.trades))
+        self.assertEqual(accumulator.result(), expected)
+        self.assertEqual(accumulator.result().adjusted_buy_in(), expected.adjusted_buy_in())
+
+    def test_live_updates(self):
+        """Tests that the totals equal a full recompute after each new trade."""
+        accumulator = PortfolioAccumulator()
+        with self.assertLogs(level="WARNING"):
+            for count, trade in enumerate(self.trades[:20], start=1):
+                accumulator.add(trade)
+                self.assertEqual(accumulator.symbol_results, run_portfolio_engine(self.trades[:count]).symbol_results)
+
+    def test_remove(self):
+        """Tests that removing trades equals recomputing without them exactly."""
+        with self.assertLogs(level="WARNING"):
+            accumulator = PortfolioAccumulator(self.trades)
+            for trade in self.trades[::4]:
+                accumulator.remove(trade)
+            expected = run_portfolio_engine([trade for index, trade in enumerate(self.trades) if index % 4])
+
+        self.assertEqual(len(accumulator), len(self.trades) - len(self.trades[::4]))
+        self.assertEqual(accumulator.result(), expected)
+
+    def test_remove_last_trade(self):
+        """Tests that removing every trade of a symbol drops it."""
+        accumulator = PortfolioAccumulator(self.trades[:2])
+
+        accumulator.remove(self.trades[0])
+        accumulator.remove(self.trades[1])
+
+        self.assertEqual(accumulator.symbol_results, {})
+        self.assertEqual(len(accumulator), 0)
+
+    def test_replace(self):
+        """Tests that an edited trade replaces the old version in its place, equal to recomputing exactly."""
+        with self.assertLogs(level="WARNING"):
+            accumulator = PortfolioAccumulator(self.trades)
+        edited = self.trades[3].model_copy(update={"premium": 1.17, "quantity": 3.0})
+        trades = self.trades[:3] + [edited] + self.trades[4:]
+
+        accumulator.replace(self.trades[3], edited)
+        with self.assertLogs(level="WARNING"):
+            expected = run_portfolio_engine(trades)
+
+        self.assertEqual(accumulator.result(), expected)
+        self.assertEqual(len(accumulator), len(self.trades))
+
+    def test_replace_moves_symbol(self):
+        """Tests that an edit to another symbol moves the trade there."""
+        accumulator = PortfolioAccumulator(self.trades[:3])
+        edited = self.trades[0].model_copy(update={"symbol": "MSFT", "quantity": 2.0})
+
+        accumulator.replace(self.trades[0], edited)
+
+        self.assertEqual(accumulator.symbol_results["AAPL"].stock_qty, -1.0)
+        self.assertEqual(accumulator.buy_in_data["MSFT"].total_quantity, 2.0)
+
+    def test_unexpected_action_logged(self):
+        """Tests that a put sold to open is logged like the engine does."""
+        with self.assertLogs("trading_analytics.journal.core.portfolio_accumulator", level="WARNING") as logs:
+            PortfolioAccumulator([self.trades[9]])
+
+        self.assertIn("for trade_id 10", logs.output[0])
+
+    def test_remove_unknown_symbol(self):
+        """Tests that removing a trade of a symbol that was never added raises."""
+        with self.assertRaises(KeyError):
+            PortfolioAccumulator().remove(self.trades[0])
+
+    def test_remove_unknown_trade(self):
+        """Tests that removing a trade that was never added raises, also if its symbol has trades."""
+        accumulator = PortfolioAccumulator(self.trades[:3])
+        before = accumulator.result()
+
+        with self.assertRaises(KeyError):
+            accumulator.remove(self.trades[3])
+        with self.assertRaises(KeyError):
+            accumulator.remove(self.trades[3].model_copy(update={"trade_id": 1000}))
+
+        self.assertEqual(accumulator.result(), before)
+        self.assertNotIn(1000, accumulator)
+
+    def test_add_twice(self):
+        """Tests that adding a trade_id that is already accumulated raises."""
+        accumulator = PortfolioAccumulator(self.trades[:1])
+
+        with self.assertRaises(ValueError):
+            accumulator.add(self.trades[0])
+        self.assertEqual(len(accumulator), 1)
+
+    def test_extend_repeated_trade(self):
+        """Tests that extending with a repeated trade_id raises and adds nothing."""
+        accumulator = PortfolioAccumulator()
+
+        with self.assertRaises(ValueError):
+            accumulator.extend([self.trades[0], self.trades[1], self.trades[0]])
+        self.assertEqual(len(accumulator), 0)
+        self.assertEqual(accumulator.symbol_results, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# Imports
+import os
+import time
+import unittest
+from datetime import date
+from unittest import mock
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.market.stock_data import CurrentStockData
+from trading_analytics.journal.core import portfolio_data
+from trading_analytics.journal.core.portfolio_data import load_and_process_portfolio_data
+from trading_analytics.journal.core.portfolio_engine import PortfolioEngineResult
+
+
+def _open_positions(
+    symbol_count: int
+) -> list:
+    """Two stock buys and a dividend for each of symbol_count symbols, all still held."""
+    trades = []
+    for index in range(symbol_count):
+        common = {
+            "strategy_id": 1,
+            "brokerage": "ETRADE",
+            "account": "TEST1234",
+            "strategy": ["basic trade"],
+            "trade_date": date(2023, 10, 15),
+            "symbol": f"SYM{index}",
+            "fees": 1.0,
+        }
+        trades.append(StockEntry(**common, trade_id=3 * index + 1, security="STOCK", action="BUY",
+                                 sub_action="OPEN", quantity=10, price_per_share=100.0))
+        trades.append(StockEntry(**common, trade_id=3 * index + 2, security="STOCK", action="BUY",
+                                 sub_action="OPEN", quantity=10, price_per_share=110.0))
+        trades.append(DividendEntry(**common, trade_id=3 * index + 3, security="DIVIDEND", action="DIVIDEND",
+                                    sub_action="DIVIDEND", quantity=20, dividend_amount=21.0))
+    return trades
+
+
+def _current_price(
+    symbol: str
+) -> CurrentStockData:
+    """Fixed market price instead of a network call."""
+    return CurrentStockData(symbol=symbol, current_price=120.0)
+
+
+class TestLoadAndProcessPortfolioData(unittest.TestCase):
+    """Unit tests for building positions from a journal.
+
+    Test Cases:
+        positions carry quantities, buy-ins, and unrealized profit
+        the engine runs once per load, however many symbols are open
+        buy-ins are computed once and prices fetched once per symbol, for 125 and 500 symbols
+        run time grows linearly with the number of open symbols (500 symbols), only run when
+            TRADING_ANALYTICS_BENCHMARKS is set since it depends on the machine
+    """
+    def _load(
+        self,
+        trades: list
+    ) -> list:
+        """Runs the load with mocked trades and prices."""
+        with mock.patch.object(portfolio_data, "load_trades_from_excel", return_value=trades), \
+                mock.patch.object(portfolio_data, "fetch_current_stock_price", side_effect=_current_price), \
+                mock.patch("builtins.print"):
+            return load_and_process_portfolio_data("trades.xlsx")
+
+    def test_positions(self):
+        """Tests the values of each position."""
+        positions = self._load(_open_positions(2))
+
+        self.assertEqual([position.symbol for position in positions], ["SYM0", "SYM1"])
+        position = positions[0]
+        self.assertEqual(position.stock_qty, 20.0)
+        self.assertEqual(position.current_price, 120.0)
+        self.assertAlmostEqual(position.original_buy_in, 2102.0 / 20)
+        self.assertAlmostEqual(position.adjusted_buy_in, (2102.0 - 20.0) / 20)
+        self.assertAlmostEqual(position.profit, (120.0 - (2102.0 - 20.0) / 20) * 20)
+
+    def test_engine_runs_once(self):
+        """Tests that quantities and buy-ins are computed once, not per symbol."""
+        with mock.patch.object(
+            portfolio_data, "run_portfolio_engine", wraps=portfolio_data.run_portfolio_engine
+        ) as engine:
+            positions = self._load(_open_positions(50))
+
+        self.assertEqual(len(positions), 50)
+        self.assertEqual(engine.call_count, 1)
+
+    def test_work_per_symbol(self):
+        """Tests that the work that depends on the trades is done once per load, and per symbol only the price."""
+        engine = mock.patch.object(portfolio_data, "run_portfolio_engine", wraps=portfolio_data.run_portfolio_engine)
+        original_buy_in = mock.patch.object(
+            PortfolioEngineResult, "original_buy_in", autospec=True, side_effect=PortfolioEngineResult.original_buy_in
+        )
+        adjusted_buy_in = mock.patch.object(
+            PortfolioEngineResult, "adjusted_buy_in", autospec=True, side_effect=PortfolioEngineResult.adjusted_buy_in
+        )
+        for symbol_count in (125, 500):
+            trades = _open_positions(symbol_count)
+            with self.subTest(symbol_count=symbol_count), engine as engine_mock, \
+                    original_buy_in as original_mock, adjusted_buy_in as adjusted_mock, \
+                    mock.patch.object(portfolio_data, "load_trades_from_excel", return_value=trades), \
+                    mock.patch.object(
+                        portfolio_data, "fetch_current_stock_price", side_effect=_current_price
+                    ) as fetch, \
+                    mock.patch("builtins.print"):
+                positions = load_and_process_portfolio_data("trades.xlsx")
+
+                self.assertEqual(len(positions), symbol_count)
+                self.assertEqual(engine_mock.call_count, 1)
+                self.assertEqual(original_mock.call_count, 1)
+                self.assertEqual(adjusted_mock.call_count, 1)
+                self.assertEqual(fetch.call_count, symbol_count)
+
+    @unittest.skipUnless(
+        os.environ.get("TRADING_ANALYTICS_BENCHMARKS"),
+        "timing benchmark, set TRADING_ANALYTICS_BENCHMARKS to run it"
+    )
+    def test_linear_scaling(self):
+        """Tests that 500 open symbols take about 4 times as long as 125, not 16 times."""
+        def best_time(trades):
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                positions = self._load(trades)
+                timings.append(time.perf_counter() - start)
+            self.assertEqual(len(positions), len(trades) // 3)
+            return min(timings)
+
+        small = best_time(_open_positions(125))
+        large = best_time(_open_positions(500))
+
+        self.assertLess(large / small, 8.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+# Imports
+import unittest
+from datetime import date
+from unittest import mock
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.calculate_profit import (
+    calculate_adjusted_buy_in,
+    calculate_original_buy_in,
+    calculate_portfolio,
+    calculate_qty_and_profit,
+)
+from trading_analytics.journal.core.portfolio_engine import run_portfolio_engine
+
+
+def _trades() -> list:
+    """Stock buys and a sale, a dividend, and a covered call on AAPL, and a put on MSFT."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "strategy": "basic trade",
+        "trade_date": date(2023, 10, 15),
+    }
+    option = {
+        "security": "OPTION",
+        "expiration_date": date(2023, 11, 17),
+    }
+    return [
+        StockEntry(**common, trade_id=1, security="STOCK", symbol="AAPL", action="BUY", sub_action="OPEN",
+                   quantity=100, fees=5.0, price_per_share=150.0),
+        StockEntry(**common, trade_id=2, security="STOCK", symbol="AAPL", action="SELL", sub_action="CLOSE",
+                   quantity=50, fees=3.0, price_per_share=160.0),
+        DividendEntry(**common, trade_id=3, security="DIVIDEND", symbol="AAPL", action="DIVIDEND",
+                      sub_action="DIVIDEND", quantity=100, fees=0.0, dividend_amount=25.0),
+        OptionEntry(**common, **option, trade_id=4, symbol="AAPL", action="SELL", sub_action="OPEN", quantity=1,
+                    fees=1.0, strike=170.0, premium=2.0, option_type="CALL"),
+        OptionEntry(**common, **option, trade_id=5, symbol="MSFT", action="BUY", sub_action="OPEN", quantity=2,
+                    fees=2.0, strike=300.0, premium=3.0, option_type="PUT"),
+        StockEntry(**common, trade_id=6, security="ETF", symbol="AAPL", action="BUY", sub_action="OPEN",
+                   quantity=100, fees=5.0, price_per_share=140.0),
+    ]
+
+
+class TestPortfolioEngine(unittest.TestCase):
+    """Unit tests for the single-pass portfolio engine.
+
+    Test Cases:
+        per-symbol profit and quantities
+        buy-in data and the original and adjusted buy-in
+        symbols without bought shares
+        the calculate_profit functions are views over the engine
+        the calculate_profit functions share one engine run
+        combining the results of earlier and later trades
+        a batch gives the same result as entries
+        no trades
+    """
+    def setUp(self):
+        """Create the trades."""
+        self.trades = _trades()
+
+    def test_symbol_results(self):
+        """Tests per-symbol profit and quantities."""
+        results = run_portfolio_engine(self.trades).symbol_results
+
+        self.assertEqual(list(results), ["AAPL", "MSFT"])
+        # -15005 + 7997 + 25 + 199 - 14005
+        self.assertAlmostEqual(results["AAPL"].profit, -20789.0)
+        self.assertEqual(results["AAPL"].stock_qty, 150.0)
+        self.assertEqual(results["AAPL"].option_qty, 1.0)
+        self.assertAlmostEqual(results["MSFT"].profit, -602.0)
+        self.assertEqual(results["MSFT"].option_qty, 2.0)
+
+    def test_buy_in(self):
+        """Tests the buy-in data and the original and adjusted buy-in."""
+        result = run_portfolio_engine(self.trades)
+        data = result.buy_in_data["AAPL"]
+
+        self.assertEqual(data.total_cost, 29010.0)
+        self.assertEqual(data.total_quantity, 200.0)
+        self.assertEqual(data.net_option_premiums, 199.0)
+        self.assertEqual(data.total_dividends, 25.0)
+        self.assertAlmostEqual(result.original_buy_in()["AAPL"], 145.05)
+        self.assertAlmostEqual(result.adjusted_buy_in()["AAPL"], (29010.0 - 199.0 - 25.0) / 200)
+
+    def test_no_bought_shares(self):
+        """Tests that symbols without bought shares are left out of the buy-in, with a warning for the original."""
+        result = run_portfolio_engine(self.trades)
+
+        with self.assertLogs("trading_analytics.journal.core.portfolio_engine", level="WARNING") as logs:
+            original = result.original_buy_in()
+
+        self.assertNotIn("MSFT", original)
+        self.assertNotIn("MSFT", result.adjusted_buy_in())
+        self.assertIn("No valid buy quantity 0.0 for MSFT", logs.output[0])
+
+    def test_views(self):
+        """Tests that the calculate_profit functions return the engine's results."""
+        result = run_portfolio_engine(self.trades)
+
+        self.assertEqual(calculate_qty_and_profit(self.trades), result.symbol_results)
+        with self.assertLogs("trading_analytics.journal.core.portfolio_engine", level="WARNING"):
+            expected_original = result.original_buy_in()
+        with self.assertLogs("trading_analytics.journal.core.calculate_profit", level="WARNING") as logs:
+            self.assertEqual(calculate_original_buy_in(self.trades), expected_original)
+        self.assertEqual(calculate_adjusted_buy_in(self.trades), result.adjusted_buy_in())
+        self.assertIn("No valid buy quantity 0.0 for MSFT", logs.output[0])
+
+    def test_shared_result(self):
+        """Tests that the views take one calculate_portfolio result instead of running the engine each."""
+        with mock.patch(
+            "trading_analytics.journal.core.calculate_profit.run_portfolio_engine",
+            wraps=run_portfolio_engine
+        ) as engine:
+            result = calculate_portfolio(self.trades)
+            symbol_results = calculate_qty_and_profit(result)
+            with self.assertLogs("trading_analytics.journal.core.calculate_profit", level="WARNING"):
+                original = calculate_original_buy_in(result)
+            adjusted = calculate_adjusted_buy_in(result)
+
+        self.assertEqual(engine.call_count, 1)
+        self.assertEqual(symbol_results, calculate_qty_and_profit(self.trades))
+        self.assertEqual(original, {"AAPL": 145.05})
+        self.assertEqual(adjusted, calculate_adjusted_buy_in(self.trades))
+
+    def test_combined(self):
+        """Tests that combining the results of earlier and later trades gives the result of all trades."""
+        combined = run_portfolio_engine(self.trades[:4]).combined(run_portfolio_engine(self.trades[4:]))
+        expected = run_portfolio_engine(self.trades)
+
+        self.assertEqual(list(combined.symbol_results), list(expected.symbol_results))
+        for symbol, result in expected.symbol_results.items():
+            self.assertAlmostEqual(combined.symbol_results[symbol].profit, result.profit)
+            self.assertEqual(combined.symbol_results[symbol].stock_qty, result.stock_qty)
+            self.assertEqual(combined.buy_in_data[symbol], expected.buy_in_data[symbol])
+
+    def test_batch_input(self):
+        """Tests that a TradeBatch gives the same result as entries."""
+        self.assertEqual(run_portfolio_engine(TradeBatch.from_entries(self.trades)), run_portfolio_engine(self.trades))
+
+    def test_no_trades(self):
+        """Tests that no trades give empty results."""
+        result = run_portfolio_engine([])
+
+        self.assertEqual(result.symbol_results, {})
+        self.assertEqual(result.buy_in_data, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Imports
+import unittest
+from datetime import date
+
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.calculate_profit import calculate_qty_and_profit
+from trading_analytics.journal.core.position_timeseries import (
+    TIMESERIES_COLUMNS,
+    position_timeseries,
+)
+
+
+def _trades() -> list:
+    """AAPL stock bought, partly sold, and paying a dividend over a week, and a put on MSFT, out of date order."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "strategy": "basic trade",
+    }
+    return [
+        StockEntry(**common, trade_id=1, trade_date=date(2023, 10, 2), security="STOCK", symbol="AAPL",
+                   action="BUY", sub_action="OPEN", quantity=100, fees=5.0, price_per_share=150.0),
+        StockEntry(**common, trade_id=2, trade_date=date(2023, 10, 5), security="STOCK", symbol="AAPL",
+                   action="SELL", sub_action="CLOSE", quantity=50, fees=3.0, price_per_share=160.0),
+        OptionEntry(**common, trade_id=3, trade_date=date(2023, 10, 4), security="OPTION", symbol="MSFT",
+                    action="BUY", sub_action="OPEN", quantity=2, fees=2.0, strike=300.0, premium=3.0,
+                    option_type="PUT", expiration_date=date(2023, 11, 17)),
+        DividendEntry(**common, trade_id=4, trade_date=date(2023, 10, 3), security="DIVIDEND", symbol="AAPL",
+                      action="DIVIDEND", sub_action="DIVIDEND", quantity=100, fees=0.0, dividend_amount=25.0),
+    ]
+
+
+class TestPositionTimeseries(unittest.TestCase):
+    """Unit tests for daily per-symbol positions and cumulative profit.
+
+    Test Cases:
+        one row per symbol and day, with running totals
+        the last day matches calculate_qty_and_profit
+        trades before start count on the first day, trades after end are left out
+        end before start
+        a batch gives the same result as entries
+        no trades
+    """
+    def setUp(self):
+        """Create the trades."""
+        self.trades = _trades()
+
+    def test_daily_rows(self):
+        """Tests that every symbol gets one row per day with running totals."""
+        frame = position_timeseries(self.trades)
+
+        self.assertEqual(list(frame.columns), TIMESERIES_COLUMNS)
+        self.assertEqual(list(frame["symbol"].cat.categories), ["AAPL", "MSFT"])
+        self.assertEqual(len(frame), 2 * 4)
+
+        aapl = frame[frame["symbol"] == "AAPL"]
+        self.assertEqual(list(aapl["date"]), list(pd.date_range("2023-10-02", "2023-10-05")))
+        self.assertEqual(list(aapl["stock_qty"]), [100.0, 100.0, 100.0, 50.0])
+        self.assertEqual(list(aapl["profit"]), [-15005.0, -14980.0, -14980.0, -6983.0])
+
+        msft = frame[frame["symbol"] == "MSFT"]
+        self.assertEqual(list(msft["option_qty"]), [0.0, 0.0, 2.0, 2.0])
+        self.assertEqual(list(msft["profit"]), [0.0, 0.0, -602.0, -602.0])
+
+    def test_last_day_matches_totals(self):
+        """Tests that the last day of each symbol matches calculate_qty_and_profit."""
+        last = position_timeseries(self.trades).groupby("symbol", observed=True).tail(1)
+
+        for row, (symbol, result) in zip(last.itertuples(), calculate_qty_and_profit(self.trades).items()):
+            self.assertEqual(row.symbol, symbol)
+            self.assertAlmostEqual(row.profit, result.profit)
+            self.assertEqual(row.stock_qty, result.stock_qty)
+            self.assertEqual(row.option_qty, result.option_qty)
+
+    def test_start_and_end(self):
+        """Tests that trades before start count on the first day and trades after end are left out."""
+        frame = position_timeseries(self.trades, start=date(2023, 10, 3), end=date(2023, 10, 4))
+        aapl = frame[frame["symbol"] == "AAPL"]
+
+        self.assertEqual(list(aapl["date"]), list(pd.date_range("2023-10-03", "2023-10-04")))
+        self.assertEqual(list(aapl["stock_qty"]), [100.0, 100.0])
+        self.assertEqual(list(aapl["profit"]), [-14980.0, -14980.0])
+
+    def test_end_before_start(self):
+        """Tests that an end before the start raises ValueError."""
+        with self.assertRaises(ValueError):
+            position_timeseries(self.trades, start=date(2023, 10, 5), end=date(2023, 10, 4))
+
+    def test_batch_input(self):
+        """Tests that a TradeBatch gives the same result as entries."""
+        pd.testing.assert_frame_equal(
+            position_timeseries(TradeBatch.from_entries(self.trades)),
+            position_timeseries(self.trades)
+        )
+
+    def test_no_trades(self):
+        """Tests that no trades give an empty frame."""
+        frame = position_timeseries([])
+
+        self.assertTrue(frame.empty)
+        self.assertEqual(list(frame.columns), TIMESERIES_COLUMNS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# Imports
+import time
+import unittest
+from datetime import date
+
+import numpy as np
+
+from trading_analytics.data.data_model.portfolio.position import Position
+from trading_analytics.data.portfolio.option_contract import OptionContract
+from trading_analytics.journal.core.price_scenarios import (
+    DEFAULT_SHOCKS,
+    price_shock_grid,
+)
+
+
+def _contract(symbol: str, option_type: str, strike: float, opened: float, is_short: bool,
+              closed: float = 0.0) -> OptionContract:
+    """Creates an option contract expiring 2023-11-17."""
+    return OptionContract(symbol=symbol, option_type=option_type, strike=strike,
+                          expiration_date=date(2023, 11, 17), account="TEST1234", is_short=is_short,
+                          opened_quantity=opened, closed_quantity=closed)
+
+
+class TestPriceScenarios(unittest.TestCase):
+    """Unit tests for the price-shock scenario grid.
+
+    Test Cases:
+        stock P&L under market-wide shocks, with the unshocked column equal to the position profit
+        short calls and long puts valued at intrinsic value
+        per-symbol shocks
+        positions without a current price or buy-in
+        closed or unrelated option legs are ignored
+        shocks with the wrong number of rows
+        a 500-symbol by 121-shock grid in milliseconds
+    """
+    def setUp(self):
+        self.positions = [
+            Position(symbol="AAPL", current_price=100.0, adjusted_buy_in=90.0, stock_qty=100),
+            Position(symbol="MSFT", current_price=200.0, adjusted_buy_in=210.0, stock_qty=10),
+        ]
+
+    def test_stock_pnl(self):
+        """Tests stock P&L under market-wide shocks."""
+        grid = price_shock_grid(self.positions)
+
+        self.assertEqual(grid.symbols, ["AAPL", "MSFT"])
+        self.assertEqual(grid.pnl.shape, (2, 121))
+        unshocked = int(np.argmin(np.abs(DEFAULT_SHOCKS)))
+        np.testing.assert_allclose(grid.pnl[:, unshocked], [1000.0, -100.0], atol=1e-9)
+        np.testing.assert_allclose(grid.pnl[:, 0], [(70.0 - 90.0) * 100, (140.0 - 210.0) * 10])
+        np.testing.assert_allclose(grid.pnl[:, -1], [(130.0 - 90.0) * 100, (260.0 - 210.0) * 10])
+        np.testing.assert_allclose(grid.total, grid.pnl.sum(axis=0))
+
+    def test_option_legs(self):
+        """Tests that short calls and long puts are valued at intrinsic value."""
+        legs = [
+            _contract("AAPL", "CALL", 110.0, 1, is_short=True),
+            _contract("MSFT", "PUT", 190.0, 2, is_short=False),
+        ]
+        grid = price_shock_grid(self.positions, np.array([-0.1, 0.0, 0.2]), legs)
+
+        np.testing.assert_allclose(grid.pnl[0], [0.0, 1000.0, 3000.0 - 1000.0])
+        np.testing.assert_allclose(grid.pnl[1], [-300.0 + 2 * 100 * 10.0, -100.0, 300.0])
+
+    def test_per_symbol_shocks(self):
+        """Tests one row of shocks per position."""
+        shocks = np.array([[0.1, -0.1], [0.0, 0.5]])
+        grid = price_shock_grid(self.positions, shocks)
+
+        np.testing.assert_allclose(grid.pnl, [[2000.0, 0.0], [-100.0, 900.0]])
+
+    def test_missing_price_or_buy_in(self):
+        """Tests that positions without a price are left out and ones without a buy-in are valued from the price."""
+        positions = self.positions + [
+            Position(symbol="NOPRICE", adjusted_buy_in=10.0, stock_qty=5),
+            Position(symbol="OPTIONS", current_price=50.0, option_qty=1),
+        ]
+        legs = [_contract("OPTIONS", "CALL", 50.0, 1, is_short=True)]
+
+        with self.assertLogs("trading_analytics.journal.core.price_scenarios", level="WARNING"):
+            grid = price_shock_grid(positions, np.array([[0.0], [0.0], [0.0], [0.1]]), legs)
+
+        self.assertEqual(grid.symbols, ["AAPL", "MSFT", "OPTIONS"])
+        np.testing.assert_allclose(grid.shocks, [[0.0], [0.0], [0.1]])
+        np.testing.assert_allclose(grid.pnl[2], [-500.0])
+
+    def test_ignored_legs(self):
+        """Tests that closed legs and legs of other symbols are ignored."""
+        legs = [
+            _contract("AAPL", "CALL", 50.0, 1, is_short=True, closed=1),
+            _contract("TSLA", "PUT", 500.0, 1, is_short=False),
+        ]
+        grid = price_shock_grid(self.positions, np.array([0.0]), legs)
+
+        np.testing.assert_allclose(grid.pnl[:, 0], [1000.0, -100.0])
+
+    def test_wrong_shock_rows(self):
+        """Tests that per-symbol shocks need one row per position."""
+        with self.assertRaises(ValueError):
+            price_shock_grid(self.positions, np.zeros((3, 5)))
+
+    def test_large_grid(self):
+        """Tests a 500-symbol by 121-shock grid with an option leg per symbol."""
+        positions = [
+            Position(symbol=f"SYM{index}", current_price=50.0 + index, adjusted_buy_in=45.0 + index, stock_qty=100)
+            for index in range(500)
+        ]
+        legs = [_contract(f"SYM{index}", "CALL", 55.0 + index, 1, is_short=True) for index in range(500)]
+
+        start = time.perf_counter()
+        grid = price_shock_grid(positions, option_legs=legs)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(grid.pnl.shape, (500, 121))
+        self.assertLess(elapsed, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
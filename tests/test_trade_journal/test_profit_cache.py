@@ -0,0 +1,221 @@
+# Imports
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core import profit_cache
+from trading_analytics.journal.core.calculate_profit import (
+    calculate_adjusted_buy_in,
+    calculate_original_buy_in,
+    calculate_qty_and_profit,
+)
+from trading_analytics.journal.core.profit_cache import ProfitCache
+from trading_analytics.utilities.csv.load_trades import (
+    load_trade_batch_from_excel,
+    load_trades_from_excel,
+)
+
+
+def _trades() -> list:
+    """Stock buys, a dividend, and a call over two symbols."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "strategy": "basic trade",
+        "trade_date": date(2023, 10, 15),
+    }
+    return [
+        StockEntry(**common, trade_id=1, security="STOCK", symbol="AAPL", action="BUY",
+                   sub_action="OPEN", quantity=100, fees=5.0, price_per_share=150.0),
+        DividendEntry(**common, trade_id=2, security="DIVIDEND", symbol="AAPL", action="DIVIDEND",
+                      sub_action="DIVIDEND", quantity=100, fees=0.0, dividend_amount=24.0),
+        OptionEntry(**common, trade_id=3, security="OPTION", symbol="AAPL", action="SELL",
+                    sub_action="OPEN", quantity=1, fees=0.65, strike=160.0, premium=2.5,
+                    option_type="CALL", expiration_date=date(2023, 11, 17)),
+        StockEntry(**common, trade_id=4, security="STOCK", symbol="MSFT", action="BUY",
+                   sub_action="OPEN", quantity=10, fees=1.0, price_per_share=300.0),
+    ]
+
+
+class TestProfitCache(unittest.TestCase):
+    """Test suite for the `ProfitCache` class.
+
+    Test Cases:
+        cached values equal the uncached calculations
+        a new list of the same entries reuses the engine result
+        copies of the entries reuse the engine result
+        changing a field the engine doesn't read reuses the engine result
+        replacing an entry runs the engine again
+        changing only the strike of an assigned option runs the engine again
+        batches are cached by content
+        changing a batch array in place runs the engine again
+        loading the same workbook again, as entries or as a batch, reuses the engine result
+        the least recently used collection is evicted first
+        invalidation drops one collection or all of them
+        changing a returned dict or result doesn't change the cache
+        a cache size that isn't positive raises
+    """
+    def setUp(self):
+        """Create the trades and a cache of two collections."""
+        self.trades = _trades()
+        self.cache = ProfitCache(max_entries=2)
+
+    def test_matches_calculate_profit(self):
+        """Tests that cached values equal the uncached calculations."""
+        self.assertEqual(self.cache.qty_and_profit(self.trades), calculate_qty_and_profit(self.trades))
+        self.assertEqual(self.cache.original_buy_in(self.trades), calculate_original_buy_in(self.trades))
+        self.assertEqual(self.cache.adjusted_buy_in(self.trades), calculate_adjusted_buy_in(self.trades))
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_hit_on_same_entries(self):
+        """Tests that a new list of the same entries reuses the engine result."""
+        with mock.patch.object(profit_cache, "run_portfolio_engine", wraps=profit_cache.run_portfolio_engine) as run:
+            first = self.cache.qty_and_profit(self.trades)
+            second = self.cache.qty_and_profit(list(self.trades))
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_hit_on_copied_entries(self):
+        """Tests that copies of the entries reuse the engine result."""
+        self.cache.qty_and_profit(self.trades)
+        self.cache.qty_and_profit([trade.model_copy(deep=True) for trade in self.trades])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_hit_on_other_fields(self):
+        """Tests that changing a field the engine doesn't read reuses the engine result."""
+        self.cache.qty_and_profit(self.trades)
+        edited = list(self.trades)
+        edited[2] = edited[2].model_copy(update={"strategy": ["wheel"]})
+        edited[2].expiration_date = date(2023, 12, 15)
+        self.cache.qty_and_profit(edited)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_miss_on_replaced_entry(self):
+        """Tests that replacing an entry runs the engine again."""
+        before = self.cache.qty_and_profit(self.trades)
+        edited = list(self.trades)
+        edited[3] = edited[3].model_copy(update={"quantity": 20})
+        after = self.cache.qty_and_profit(edited)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(before["MSFT"].stock_qty, 10)
+        self.assertEqual(after["MSFT"].stock_qty, 20)
+
+    def test_miss_on_changed_strike(self):
+        """Tests that changing only the strike of an assigned option runs the engine again."""
+        assigned = OptionEntry(
+            trade_id=5, strategy_id=1, brokerage="etrade", account="TEST1234", strategy=["wheel"],
+            security="OPTION", trade_date=date(2023, 11, 17), symbol="MSFT", action="OPTION ASSIGNED",
+            sub_action="CLOSE", quantity=1, fees=0.0, strike=100.0, premium=0.0, option_type="PUT",
+            expiration_date=date(2023, 11, 17)
+        )
+        before = self.cache.qty_and_profit([assigned])
+        edited = [assigned.model_copy(update={"strike": 150.0})]
+        after = self.cache.qty_and_profit(edited)
+        self.cache.qty_and_profit(TradeBatch.from_entries([assigned]))
+        self.cache.qty_and_profit(TradeBatch.from_entries(edited))
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+        self.assertEqual(before["MSFT"].profit, -10000.0)
+        self.assertEqual(after, calculate_qty_and_profit(edited))
+        self.assertEqual(after["MSFT"].profit, -15000.0)
+
+    def test_batch(self):
+        """Tests that batches are cached by content."""
+        batch = TradeBatch.from_entries(self.trades)
+        self.assertEqual(self.cache.qty_and_profit(batch), calculate_qty_and_profit(self.trades))
+        self.cache.qty_and_profit(TradeBatch.from_entries(self.trades))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_batch_changed_in_place(self):
+        """Tests that changing a batch array in place runs the engine again."""
+        batch = TradeBatch.from_entries(self.trades)
+        self.cache.qty_and_profit(batch)
+        batch.quantity[3] = 20.0
+        after = self.cache.qty_and_profit(batch)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(after["MSFT"].stock_qty, 20)
+
+    def test_reload_same_file(self):
+        """Tests that loading the same workbook again, as entries or as a batch, reuses the engine result."""
+        rows = [
+            {"trade_id": trade.trade_id, "strategy_id": trade.strategy_id, "brokerage": trade.brokerage,
+             "account": trade.account, "strategy": ",".join(trade.strategy), "security_type": trade.security.value,
+             "trade_date": trade.trade_date, "symbol": trade.symbol, "action": trade.action.value,
+             "sub_action": trade.sub_action.value, "quantity": trade.quantity, "fees": trade.fees,
+             "price_per_share": getattr(trade, "price_per_share", None),
+             "dividend_amount": getattr(trade, "dividend_amount", None),
+             "expiration_date": getattr(trade, "expiration_date", None), "strike": getattr(trade, "strike", None),
+             "premium": getattr(trade, "premium", None),
+             "option_type": trade.option_type.value if isinstance(trade, OptionEntry) else None}
+            for trade in self.trades
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "journal.xlsx")
+            pd.DataFrame(rows).to_excel(file_path, index=False)
+
+            first = self.cache.qty_and_profit(load_trades_from_excel(file_path, use_cache=False))
+            second = self.cache.qty_and_profit(load_trades_from_excel(file_path, use_cache=False))
+            self.cache.qty_and_profit(load_trade_batch_from_excel(file_path, use_cache=False))
+            self.cache.qty_and_profit(load_trade_batch_from_excel(file_path, use_cache=False))
+
+        # The batches hold the same trades as the entries
+        self.assertEqual((self.cache.hits, self.cache.misses), (3, 1))
+        self.assertEqual(first, second)
+        self.assertEqual(first, calculate_qty_and_profit(self.trades))
+
+    def test_lru_eviction(self):
+        """Tests that the least recently used collection is evicted first."""
+        first = self.trades[:1]
+        second = self.trades[:2]
+        third = self.trades[:3]
+        self.cache.qty_and_profit(first)
+        self.cache.qty_and_profit(second)
+        self.cache.qty_and_profit(first)
+        self.cache.qty_and_profit(third)
+        self.assertEqual(len(self.cache), 2)
+
+        self.cache.qty_and_profit(first)
+        self.assertEqual(self.cache.hits, 2)
+        self.cache.qty_and_profit(second)
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_invalidate(self):
+        """Tests that invalidation drops one collection or all of them."""
+        self.cache.qty_and_profit(self.trades)
+        self.cache.qty_and_profit(self.trades[:1])
+        self.cache.invalidate(self.trades)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.qty_and_profit(self.trades)
+        self.assertEqual(self.cache.misses, 3)
+
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_returns_copies(self):
+        """Tests that changing a returned dict or result doesn't change the cache."""
+        results = self.cache.qty_and_profit(self.trades)
+        results["MSFT"].profit = 0.0
+        del results["AAPL"]
+        self.cache.engine_result(self.trades).symbol_results["MSFT"].stock_qty = 0.0
+
+        results = self.cache.qty_and_profit(self.trades)
+        self.assertIn("AAPL", results)
+        self.assertEqual(results["MSFT"], calculate_qty_and_profit(self.trades)["MSFT"])
+
+    def test_invalid_size(self):
+        """Tests that a cache size that isn't positive raises."""
+        with self.assertRaises(ValueError):
+            ProfitCache(max_entries=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
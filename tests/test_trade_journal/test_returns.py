@@ -0,0 +1,147 @@
+# Imports
+import time
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.journal.core.returns import (
+    money_weighted_returns,
+    solve_xirr,
+    time_weighted_return,
+)
+
+
+def _stock(trade_id: int, action: str, quantity: float, price: float, trade_date: date, symbol: str = "AAPL",
+           account: str = "TEST1234") -> StockEntry:
+    """Creates a stock trade without fees."""
+    return StockEntry(strategy_id=1, brokerage="etrade", account=account, strategy="basic trade",
+                      trade_date=trade_date, trade_id=trade_id, security="STOCK", symbol=symbol, action=action,
+                      sub_action="OPEN" if action == "BUY" else "CLOSE", quantity=quantity, fees=0.0,
+                      price_per_share=price)
+
+
+def _days(*dates: date) -> np.ndarray:
+    """Day numbers of dates."""
+    return np.array(dates, dtype="datetime64[D]").astype(np.int64)
+
+
+class TestReturns(unittest.TestCase):
+    """Unit tests for money-weighted and time-weighted returns.
+
+    Test Cases:
+        a one-year investment returns its gain
+        many series solved at once, with rates found by brute force
+        series without a rate get NaN
+        XIRR by symbol, by account, with dividends and terminal values
+        terminal values of groups without trades are ignored
+        unknown dimensions
+        thousands of series well under a second
+        time-weighted returns with and without external flows, for several portfolios
+    """
+    def test_one_year(self):
+        """Tests that a one-year investment returns its gain."""
+        rates = solve_xirr(np.array([0, 0]), _days(date(2023, 1, 1), date(2024, 1, 1)),
+                           np.array([-1000.0, 1100.0]), 1)
+
+        self.assertAlmostEqual(rates[0], 0.1, places=9)
+
+    def test_many_series(self):
+        """Tests solving several series at once against the net present value."""
+        days = _days(date(2023, 1, 1), date(2023, 4, 1), date(2023, 9, 15), date(2024, 6, 30))
+        series = [
+            [-1000.0, -500.0, 200.0, 1500.0],
+            [-1000.0, 0.0, 0.0, 600.0],
+            [-100.0, 50.0, 50.0, 50.0],
+            [-1000.0, 3000.0, 0.0, 0.0],
+        ]
+        groups = np.repeat(np.arange(len(series)), len(days))
+        amounts = np.array(series).ravel()
+        rates = solve_xirr(groups, np.tile(days, len(series)), amounts, len(series))
+
+        years = (days - days[0]) / 365.0
+        for rate, flows in zip(rates, series):
+            npv = sum(amount / (1 + rate) ** year for amount, year in zip(flows, years))
+            self.assertAlmostEqual(npv, 0.0, places=6)
+        self.assertLess(rates[1], 0)
+        self.assertGreater(rates[3], 10)
+
+    def test_no_rate(self):
+        """Tests that series with only outflows or a single flow have no rate."""
+        rates = solve_xirr(np.array([0, 0, 1]), _days(date(2023, 1, 1), date(2024, 1, 1), date(2023, 1, 1)),
+                           np.array([-100.0, -100.0, 50.0]), 2)
+
+        self.assertTrue(np.all(np.isnan(rates)))
+
+    def test_money_weighted_returns(self):
+        """Tests XIRR by symbol and by account, with dividends and terminal values."""
+        trades = [
+            _stock(1, "BUY", 10, 100.0, date(2023, 1, 1)),
+            _stock(2, "BUY", 10, 50.0, date(2023, 1, 1), symbol="MSFT", account="OTHER"),
+            DividendEntry(strategy_id=1, brokerage="etrade", account="TEST1234", strategy="basic trade",
+                          trade_date=date(2023, 7, 2), trade_id=3, security="DIVIDEND", symbol="AAPL",
+                          action="DIVIDEND", sub_action="DIVIDEND", quantity=10, fees=0.0, dividend_amount=50.0),
+            _stock(4, "SELL", 10, 110.0, date(2024, 1, 1)),
+        ]
+
+        by_symbol = money_weighted_returns(trades, terminal_values={("MSFT",): 600.0})
+        self.assertEqual(list(by_symbol), [("AAPL",), ("MSFT",)])
+        expected = solve_xirr(np.zeros(3, dtype=np.int64), _days(date(2023, 1, 1), date(2023, 7, 2), date(2024, 1, 1)),
+                              np.array([-1000.0, 50.0, 1100.0]), 1)[0]
+        self.assertAlmostEqual(by_symbol[("AAPL",)], expected, places=9)
+        self.assertAlmostEqual(by_symbol[("MSFT",)], 0.2, places=9)
+
+        by_account = money_weighted_returns(trades, by=("account",))
+        self.assertAlmostEqual(by_account[("TEST1234",)], expected, places=9)
+        self.assertTrue(np.isnan(by_account[("OTHER",)]))
+
+        with self.assertLogs("trading_analytics.journal.core.returns", level="WARNING"):
+            money_weighted_returns(trades, terminal_values={("TSLA",): 100.0}, as_of=date(2024, 6, 1))
+
+    def test_unknown_dimension(self):
+        """Tests that unknown dimensions raise."""
+        with self.assertRaises(ValueError):
+            money_weighted_returns([], by=("sector",))
+
+    def test_many_symbols(self):
+        """Tests XIRR over thousands of symbols well under a second."""
+        rng = np.random.default_rng(0)
+        trades = []
+        for index in range(2000):
+            symbol = f"SYM{index}"
+            buy = rng.uniform(10, 100)
+            trades.append(_stock(2 * index + 1, "BUY", 10, buy, date(2022, 1, 1), symbol=symbol))
+            trades.append(_stock(2 * index + 2, "SELL", 10, buy * rng.uniform(0.5, 2.0),
+                                 date(2023, 1, 1) if index % 2 else date(2022, 6, 1), symbol=symbol))
+
+        start = time.perf_counter()
+        rates = money_weighted_returns(trades)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(rates), 2000)
+        self.assertFalse(any(np.isnan(rate) for rate in rates.values()))
+        self.assertLess(elapsed, 1.0)
+
+    def test_time_weighted_return(self):
+        """Tests chaining daily returns with and without external flows."""
+        index = pd.to_datetime(["2023-01-03", "2023-01-01", "2023-01-02"])
+        values = pd.Series([0.0, 1000.0, 1100.0], index=pd.to_datetime(["2022-12-31", "2023-01-01", "2023-01-02"]))
+
+        self.assertAlmostEqual(time_weighted_return(values), 0.1)
+
+        values = pd.Series([1310.0, 1000.0, 1100.0], index=index)
+        flows = pd.Series([100.0], index=pd.to_datetime(["2023-01-03"]))
+        self.assertAlmostEqual(time_weighted_return(values, flows), 1.1 * 1.1 - 1)
+
+        frame = pd.DataFrame({"a": [1000.0, 1100.0, 1320.0], "b": [100.0, 90.0, 99.0]},
+                             index=pd.to_datetime(["2023-01-01", "2023-01-02", "2023-01-03"]))
+        result = time_weighted_return(frame)
+        self.assertAlmostEqual(result["a"], 0.32)
+        self.assertAlmostEqual(result["b"], -0.01)
+
+
+if __name__ == "__main__":
+    unittest.main()
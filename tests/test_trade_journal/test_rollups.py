@@ -0,0 +1,152 @@
+# Imports
+import unittest
+from datetime import date
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.journal.core.calculate_profit import calculate_qty_and_profit
+from trading_analytics.journal.core.rollups import (
+    rollup,
+    rollups,
+)
+
+
+def _trades() -> list:
+    """AAPL stock and a covered call in two accounts, a dividend without a strategy, and a put on MSFT."""
+    common = {
+        "brokerage": "etrade",
+        "trade_date": date(2023, 10, 15),
+    }
+    option = {
+        "security": "OPTION",
+        "expiration_date": date(2023, 11, 17),
+    }
+    return [
+        StockEntry(**common, trade_id=1, strategy_id=1, account="TEST1234", strategy="wheel, income",
+                   security="STOCK", symbol="AAPL", action="BUY", sub_action="OPEN", quantity=100, fees=5.0,
+                   price_per_share=150.0),
+        StockEntry(**common, trade_id=2, strategy_id=1, account="TEST1234", strategy="wheel", security="STOCK",
+                   symbol="AAPL", action="SELL", sub_action="CLOSE", quantity=50, fees=3.0, price_per_share=160.0),
+        DividendEntry(**common, trade_id=3, strategy_id=2, account="TEST5678", strategy="", security="DIVIDEND",
+                      symbol="AAPL", action="DIVIDEND", sub_action="DIVIDEND", quantity=100, fees=0.0,
+                      dividend_amount=25.0),
+        OptionEntry(**common, **option, trade_id=4, strategy_id=1, account="TEST1234", strategy="income",
+                    symbol="AAPL", action="SELL", sub_action="OPEN", quantity=1, fees=1.0, strike=170.0,
+                    premium=2.0, option_type="CALL"),
+        OptionEntry(**common, **option, trade_id=5, strategy_id=3, account="TEST5678", strategy="hedge",
+                    symbol="MSFT", action="BUY", sub_action="OPEN", quantity=2, fees=2.0, strike=300.0,
+                    premium=3.0, option_type="PUT"),
+    ]
+
+
+class TestRollups(unittest.TestCase):
+    """Unit tests for profit and quantity rollups.
+
+    Test Cases:
+        grouping by symbol matches calculate_qty_and_profit
+        trades count towards each of their strategies, trades without one are grouped under None
+        strategy_id, account, and brokerage
+        combinations of dimensions
+        the portfolio total
+        several groupings at once
+        a batch gives the same result as entries
+        unknown and repeated dimensions
+        no trades
+    """
+    def setUp(self):
+        """Create the trades."""
+        self.trades = _trades()
+
+    def test_symbol(self):
+        """Tests that grouping by symbol gives the same totals as calculate_qty_and_profit."""
+        results = rollup(self.trades, ["symbol"])
+
+        self.assertEqual(
+            results,
+            {(symbol,): result for symbol, result in calculate_qty_and_profit(self.trades).items()}
+        )
+
+    def test_strategy(self):
+        """Tests that trades count towards each of their strategies and trades without one are grouped under None."""
+        results = rollup(self.trades, ["strategy"])
+
+        self.assertEqual(list(results), [("wheel",), ("income",), (None,), ("hedge",)])
+        # -15005 + 7997
+        self.assertEqual(results[("wheel",)].profit, -7008.0)
+        self.assertEqual(results[("wheel",)].stock_qty, 50.0)
+        # -15005 + 199
+        self.assertEqual(results[("income",)].profit, -14806.0)
+        self.assertEqual(results[("income",)].stock_qty, 100.0)
+        self.assertEqual(results[("income",)].option_qty, 1.0)
+        self.assertEqual(results[(None,)].profit, 25.0)
+        self.assertEqual(results[("hedge",)].profit, -602.0)
+
+    def test_other_dimensions(self):
+        """Tests grouping by strategy_id, account, and brokerage."""
+        by_strategy_id = rollup(self.trades, ["strategy_id"])
+        by_account = rollup(self.trades, ["account"])
+        by_brokerage = rollup(self.trades, ["brokerage"])
+
+        self.assertEqual(list(by_strategy_id), [(1,), (2,), (3,)])
+        self.assertEqual(by_strategy_id[(1,)].profit, -6809.0)
+        self.assertEqual(list(by_account), [("TEST1234",), ("TEST5678",)])
+        self.assertEqual(by_account[("TEST5678",)].profit, -577.0)
+        self.assertEqual(list(by_brokerage), [("ETRADE",)])
+        self.assertEqual(by_brokerage[("ETRADE",)].profit, -7386.0)
+
+    def test_combination(self):
+        """Tests grouping by a combination of dimensions."""
+        results = rollup(self.trades, ["account", "strategy", "symbol"])
+
+        self.assertEqual(
+            list(results),
+            [
+                ("TEST1234", "wheel", "AAPL"),
+                ("TEST1234", "income", "AAPL"),
+                ("TEST5678", None, "AAPL"),
+                ("TEST5678", "hedge", "MSFT"),
+            ]
+        )
+        self.assertEqual(results[("TEST1234", "income", "AAPL")].profit, -14806.0)
+        self.assertEqual(results[("TEST5678", "hedge", "MSFT")].option_qty, 2.0)
+
+    def test_total(self):
+        """Tests that no dimensions give the portfolio total."""
+        results = rollup(self.trades, [])
+
+        self.assertEqual(list(results), [()])
+        self.assertEqual(results[()].profit, -7386.0)
+        self.assertEqual(results[()].stock_qty, 50.0)
+        self.assertEqual(results[()].option_qty, 3.0)
+
+    def test_several_groupings(self):
+        """Tests that several groupings at once give the same results as one at a time."""
+        groupings = [("symbol",), ("strategy",), ("account", "symbol")]
+        results = rollups(self.trades, groupings)
+
+        self.assertEqual(list(results), groupings)
+        for by in groupings:
+            self.assertEqual(results[by], rollup(self.trades, by))
+
+    def test_batch_input(self):
+        """Tests that a TradeBatch gives the same result as entries."""
+        by = ["strategy", "strategy_id"]
+
+        self.assertEqual(rollup(TradeBatch.from_entries(self.trades), by), rollup(self.trades, by))
+
+    def test_invalid_dimensions(self):
+        """Tests that unknown and repeated dimensions raise ValueError."""
+        with self.assertRaises(ValueError):
+            rollup(self.trades, ["sector"])
+        with self.assertRaises(ValueError):
+            rollups(self.trades, [("symbol",), ("account", "account")])
+
+    def test_no_trades(self):
+        """Tests that no trades give empty results."""
+        self.assertEqual(rollups([], [("symbol",), ()]), {("symbol",): {}, (): {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
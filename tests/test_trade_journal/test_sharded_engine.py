@@ -0,0 +1,117 @@
+# Imports
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest import mock
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.journal.core.portfolio_engine import run_portfolio_engine
+from trading_analytics.journal.core.sharded_engine import (
+    _default_workers,
+    run_portfolio_engine_sharded,
+    shard_of_symbols,
+)
+
+
+def _trades() -> list:
+    """Stock buys, sales, dividends, and calls over eight symbols, interleaved."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "strategy": "basic trade",
+        "trade_date": date(2023, 10, 15),
+    }
+    trades = []
+    for index in range(8):
+        symbol = f"SYM{index}"
+        trade_id = 4 * index
+        trades.extend([
+            StockEntry(**common, trade_id=trade_id + 1, security="STOCK", symbol=symbol, action="BUY",
+                       sub_action="OPEN", quantity=100, fees=5.0, price_per_share=10.0 + index),
+            DividendEntry(**common, trade_id=trade_id + 2, security="DIVIDEND", symbol=symbol, action="DIVIDEND",
+                          sub_action="DIVIDEND", quantity=100, fees=0.0, dividend_amount=2.5 * index),
+            OptionEntry(**common, trade_id=trade_id + 3, security="OPTION", symbol=symbol, action="SELL",
+                        sub_action="OPEN", quantity=1, fees=0.65, strike=15.0 + index, premium=0.3,
+                        option_type="CALL", expiration_date=date(2023, 11, 17)),
+            StockEntry(**common, trade_id=trade_id + 4, security="STOCK", symbol=symbol, action="SELL",
+                       sub_action="CLOSE", quantity=40, fees=5.0, price_per_share=11.0 + index),
+        ])
+    # Interleave the symbols
+    return trades[::2] + trades[1::2]
+
+
+class TestShardedEngine(unittest.TestCase):
+    """Unit tests for the portfolio engine run over symbol shards.
+
+    Test Cases:
+        the sharded result equals the single-process result, in a process pool
+        a given executor and more shards than workers
+        one worker or one shard runs in the calling process
+        symbols always land in the same shard
+        the default worker count
+        invalid worker and shard counts
+        no trades
+    """
+    def setUp(self):
+        """Create the trades."""
+        self.trades = _trades()
+        self.expected = run_portfolio_engine(self.trades)
+
+    def test_process_pool(self):
+        """Tests that the sharded result in a process pool equals the single-process result."""
+        result = run_portfolio_engine_sharded(self.trades, workers=2)
+
+        self.assertEqual(result, self.expected)
+        self.assertEqual(list(result.symbol_results), list(self.expected.symbol_results))
+
+    def test_executor(self):
+        """Tests running the shards in a given executor, with more shards than workers."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = run_portfolio_engine_sharded(self.trades, shard_count=5, executor=executor)
+
+        self.assertEqual(result, self.expected)
+
+    def test_single_process(self):
+        """Tests that one worker or one shard runs the engine in the calling process."""
+        with mock.patch("trading_analytics.journal.core.sharded_engine.ProcessPoolExecutor") as pool:
+            self.assertEqual(run_portfolio_engine_sharded(self.trades, workers=1), self.expected)
+            self.assertEqual(run_portfolio_engine_sharded(self.trades, workers=4, shard_count=1), self.expected)
+
+        pool.assert_not_called()
+
+    def test_stable_shards(self):
+        """Tests that symbols are assigned to shards by a stable hash."""
+        shards = shard_of_symbols(["AAPL", "MSFT", "SPY"], 4)
+
+        self.assertEqual(shards.tolist(), shard_of_symbols(["AAPL", "MSFT", "SPY"], 4).tolist())
+        self.assertTrue(all(0 <= shard < 4 for shard in shards))
+
+    def test_default_workers(self):
+        """Tests the worker count from the environment, falling back to the number of CPUs."""
+        with mock.patch.dict(os.environ, {"TRADING_ANALYTICS_ENGINE_WORKERS": "3"}):
+            self.assertEqual(_default_workers(), 3)
+        with mock.patch.dict(os.environ, {"TRADING_ANALYTICS_ENGINE_WORKERS": "many"}):
+            with self.assertLogs("trading_analytics.journal.core.sharded_engine", level="WARNING"):
+                self.assertEqual(_default_workers(), os.cpu_count() or 1)
+
+    def test_invalid_counts(self):
+        """Tests that non-positive worker and shard counts raise ValueError."""
+        with self.assertRaises(ValueError):
+            run_portfolio_engine_sharded(self.trades, workers=0)
+        with self.assertRaises(ValueError):
+            run_portfolio_engine_sharded(self.trades, workers=2, shard_count=0)
+
+    def test_no_trades(self):
+        """Tests that no trades give empty results."""
+        result = run_portfolio_engine_sharded([], workers=2)
+
+        self.assertEqual(result.symbol_results, {})
+        self.assertEqual(result.buy_in_data, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,389 @@
+# Imports
+import itertools
+import logging
+import unittest
+from datetime import date
+
+import numpy as np
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.data_model.entry.trade_batch import TradeBatch
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.data.portfolio.buy_in_data import BuyInData
+from trading_analytics.data.portfolio.symbol_result import SymbolResult
+from trading_analytics.journal.core.calculate_profit import (
+    calculate_adjusted_buy_in,
+    calculate_original_buy_in,
+    calculate_qty_and_profit,
+)
+from trading_analytics.journal.core.vectorized_profit import (
+    calculate_qty_and_profit_vectorized,
+    trade_effect,
+)
+
+
+def _every_combination() -> list:
+    """One trusted trade for every security, option type, action, and sub-action, valid or not."""
+    trades = []
+    combinations = itertools.product(SecurityType, [None, *OptionType], Action, SubAction)
+    for trade_id, (security, option_type, action, sub_action) in enumerate(combinations, start=1):
+        if security != SecurityType.OPTION and option_type is not None:
+            continue
+
+        data = {
+            "trade_id": trade_id,
+            "strategy_id": 1,
+            "brokerage": "ETRADE",
+            "account": "TEST1234",
+            "strategy": ["basic trade"],
+            "security": security,
+            "trade_date": date(2023, 10, 15),
+            "symbol": ["AAPL", "MSFT", "KO"][trade_id % 3],
+            "action": action,
+            "sub_action": sub_action,
+            "quantity": trade_id / 7,
+            "fees": trade_id / 100,
+        }
+        if security in [SecurityType.STOCK, SecurityType.ETF]:
+            trades.append(StockEntry.from_trusted({**data, "price_per_share": trade_id * 1.37}))
+        elif security == SecurityType.DIVIDEND:
+            trades.append(DividendEntry.from_trusted({**data, "dividend_amount": trade_id * 0.11}))
+        else:
+            trades.append(OptionEntry.from_trusted({
+                **data,
+                "expiration_date": date(2023, 11, 17),
+                "strike": trade_id * 2.3,
+                "premium": trade_id * 0.07,
+                "option_type": option_type,
+            }))
+
+    return trades
+
+
+_baseline_logger = logging.getLogger("baseline_calculate_profit")
+
+
+def _baseline_process_stock_etf_buy_trades(
+    trades: list,
+    data_dict: dict
+) -> None:
+    """Frozen copy of the original `_process_stock_etf_buy_trades`."""
+    for trade in trades:
+        symbol = trade.symbol
+
+        # Initialize dict for new symbol is not already there
+        if symbol not in data_dict:
+            data_dict[symbol] = BuyInData() # Class with variables need for calculating original or adjusted buy-in
+
+        # If bought stock/etf update cost and quantity
+        if trade.is_bought_stock_etf:
+            total_cost = trade.price_per_share * trade.quantity + trade.fees
+            data_dict[symbol].total_cost += total_cost
+            data_dict[symbol].total_quantity += trade.quantity
+
+
+def _baseline_qty_and_profit(
+    trades: list
+) -> dict:
+    """Frozen copy of the original per-trade `calculate_qty_and_profit` loop, the oracle for the engine."""
+    # Initialize aggregated profit/loss, stock quantity, and option quantity by symbol
+    results = {}
+
+    # Iterate through each trade to calculate and aggregate profit/loss
+    for trade in trades:
+        symbol = trade.symbol
+
+        # Initialize dict for new symbol
+        if symbol not in results.keys():
+            results[symbol] = SymbolResult()
+
+        # Initialize quantities and profit
+        stock_qty = 0.0
+        option_qty = 0.0
+        profit = 0.0
+
+        # Assign quantities and profit for stock/etf
+        if trade.security in [SecurityType.STOCK, SecurityType.ETF]:
+            # Bought stock/etf
+            if trade.action == Action.BUY:
+                stock_qty = trade.quantity  # Positive for buying shares
+                profit = -trade.quantity * getattr(trade, 'price_per_share', 0.0) - trade.fees  # Cash outflow
+
+            # Sold stock/etf
+            elif trade.action == Action.SELL:
+                stock_qty = -trade.quantity  # Negative for selling shares
+                profit = trade.quantity * getattr(trade, 'price_per_share', 0.0) - trade.fees  # Cash inflow
+
+            # Stock/ETF trade should only be bought or sold
+            else:
+                _baseline_logger.warning(f"Unexpected action {trade.action} for trade_id {trade.trade_id}")
+                stock_qty = 0.0
+                profit = 0.0
+
+        # Assign profit for Dividends
+        elif trade.security == SecurityType.DIVIDEND:
+            profit = getattr(trade, 'dividend_amount', 0.0) - trade.fees
+            stock_qty = 0.0
+
+        # Assign quantity and profit for Options
+        elif trade.security == SecurityType.OPTION:
+            # Get option type (call or put)
+            option_type = getattr(trade, 'option_type', None)
+
+            # Assign quantity and profit for Calls
+            if option_type == OptionType.CALL:
+                # Calls sold open
+                if trade.action == Action.SELL and trade.sub_action == SubAction.OPEN:
+                    option_qty = trade.quantity
+                    profit = trade.quantity * getattr(trade, 'premium', 0.0) * 100 - trade.fees
+
+                # Calls sold close
+                elif trade.action == Action.SELL and trade.sub_action == SubAction.CLOSE:
+                    option_qty = -trade.quantity
+                    profit = trade.quantity * getattr(trade, 'premium', 0.0) * 100 - trade.fees
+
+                # Calls bought open
+                elif trade.action == Action.BUY and trade.sub_action == SubAction.OPEN:
+                    option_qty = trade.quantity
+                    profit = -trade.quantity * getattr(trade, 'premium', 0.0) * 100 - trade.fees
+
+                # Calls bought close
+                elif trade.action == Action.BUY and trade.sub_action == SubAction.CLOSE:
+                    option_qty = -trade.quantity
+                    profit = -trade.quantity * getattr(trade, 'premium', 0.0) * 100 - trade.fees
+
+                # Calls expired
+                elif trade.action == Action.OPTION_EXPIRED:
+                    option_qty = -trade.quantity
+                    profit = 0.0
+
+                # Calls assigned
+                elif trade.action == Action.OPTION_ASSIGNED:
+                    stock_qty = -trade.quantity * 100
+                    option_qty = -trade.quantity
+                    profit = trade.quantity * getattr(trade, 'strike', 0.0) * 100 - trade.fees
+
+                # Calls exercised
+                elif trade.action == Action.OPTION_EXERCISED:
+                    stock_qty = trade.quantity * 100
+                    option_qty = -trade.quantity
+                    profit = -trade.quantity * getattr(trade, 'strike', 0.0) * 100 - trade.fees
+
+                # Wrong action for calls
+                else:
+                    _baseline_logger.warning(f"Unexpected action {trade.action} for trade_id {trade.trade_id}")
+                    option_qty = 0.0
+                    profit = 0.0
+
+            # Assign quantity and profit for Puts
+            elif option_type == OptionType.PUT:
+                # Puts bought open
+                if trade.action == Action.BUY and trade.sub_action == SubAction.OPEN:
+                    option_qty = trade.quantity
+                    profit = -trade.quantity * getattr(trade, 'premium', 0.0) * 100 - trade.fees
+
+                # Puts sold close
+                elif trade.action == Action.SELL and trade.sub_action == SubAction.CLOSE:
+                    option_qty = -trade.quantity
+                    profit = trade.quantity * getattr(trade, 'premium', 0.0) * 100 - trade.fees
+
+                # Puts expired
+                elif trade.action == Action.OPTION_EXPIRED:
+                    option_qty = -trade.quantity
+                    profit = 0.0
+
+                # Puts assigned
+                elif trade.action == Action.OPTION_ASSIGNED:
+                    stock_qty = trade.quantity * 100
+                    option_qty = -trade.quantity
+                    profit = -trade.quantity * getattr(trade, 'strike', 0.0) * 100 - trade.fees
+
+                # Invalid action for puts
+                else:
+                    _baseline_logger.warning(f"Unexpected action {trade.action} for trade_id {trade.trade_id}")
+                    option_qty = 0.0
+                    profit = 0.0
+
+        # Unexpected security type
+        else:
+            _baseline_logger.warning(f"Unexpected security type {trade.security} for trade_id {trade.trade_id}")
+            stock_qty = 0.0
+            option_qty = 0.0
+            profit = 0.0
+
+        # Aggregate profit, stock_qty, and option_qty for symbol
+        results[symbol].profit += profit
+        results[symbol].stock_qty += stock_qty
+        results[symbol].option_qty += option_qty
+
+    return results
+
+
+def _baseline_original_buy_in(
+    trades: list
+) -> dict:
+    """Frozen copy of the original `calculate_original_buy_in`."""
+    buy_in_data = {}
+
+    # Stock/ETF trades bought
+    _baseline_process_stock_etf_buy_trades(trades, buy_in_data)
+
+    # Calculate average buy-in price per share by symbol
+    result = {}
+    for symbol, data in buy_in_data.items():
+        if data.total_quantity > 0:
+            result[symbol] = data.total_cost / data.total_quantity
+        else:
+            _baseline_logger.warning(f"No valid buy quantity {data.total_quantity} for {symbol}")
+
+    return result
+
+
+def _baseline_adjusted_buy_in(
+    trades: list
+) -> dict:
+    """Frozen copy of the original `calculate_adjusted_buy_in`."""
+    adjusted_data = {}
+
+    # Stock/ETF trade that were bought
+    _baseline_process_stock_etf_buy_trades(trades, adjusted_data)
+
+    # Add/subtract premiums and dividends
+    for trade in trades:
+        symbol = trade.symbol
+
+        # Initialize dict for new symbols
+        if symbol not in adjusted_data:
+            adjusted_data[symbol] = BuyInData()
+
+        try:
+            # Option Trades (premiums)
+            if isinstance(trade, OptionEntry):
+                if trade.option_type in [OptionType.CALL, OptionType.PUT]:
+
+                    # Sold option, add premium
+                    if (
+                        trade.action == Action.SELL
+                        and trade.sub_action in [SubAction.OPEN, SubAction.CLOSE]
+                    ):
+                        premium = trade.premium  * trade.quantity * 100 - trade.fees
+                        adjusted_data[symbol].net_option_premiums += premium
+
+                    # Bought option, subtract premium
+                    elif (
+                            trade.action == Action.BUY
+                            and trade.sub_action in [SubAction.OPEN, SubAction.CLOSE]
+                    ):
+                        premium = -trade.premium * trade.quantity * 100 - trade.fees
+                        adjusted_data[symbol].net_option_premiums += premium
+
+            # Dividend Trades, add dividend
+            elif isinstance(trade, DividendEntry):
+                dividend = trade.dividend_amount - trade.fees
+                adjusted_data[symbol].total_dividends += dividend
+
+        except ValueError as e:
+            _baseline_logger.error(f"Validation error for trade_id {trade.trade_id}: {e}")
+
+    # Calculate adjusted buy-in price per share buy symbol
+    result = {}
+    for symbol, data in adjusted_data.items():
+        if data.total_quantity > 0:
+            adjusted_cost = (
+                data.total_cost
+                - data.net_option_premiums
+                - data.total_dividends
+            )
+            result[symbol] = adjusted_cost / data.total_quantity
+
+    return result
+
+
+class TestVectorizedProfit(unittest.TestCase):
+    """Unit tests for the vectorized profit engine.
+
+    Test Cases:
+        results match the original per-trade loop exactly, for every combination of enums
+        unexpected combinations are logged like the per-trade loop, in trade order
+        a batch gives the same result as entries, also after take
+        calculate_qty_and_profit gives the same result
+        the original and adjusted buy-in match the original per-trade loops exactly
+        no trades give no results
+        the effect rule for a few known trades
+    """
+    def setUp(self):
+        """Create trades for every combination."""
+        self.trades = _every_combination()
+
+    def test_matches_loop(self):
+        """Tests that the totals and symbol order equal the per-trade loop exactly."""
+        expected = _baseline_qty_and_profit(self.trades)
+        with self.assertLogs("trading_analytics.journal.core.vectorized_profit", level="WARNING"):
+            results = calculate_qty_and_profit_vectorized(self.trades)
+
+        self.assertEqual(list(results), list(expected))
+        self.assertEqual(results, expected)
+
+    def test_warnings(self):
+        """Tests that each unexpected combination is logged like the per-trade loop, in trade order."""
+        with self.assertLogs("baseline_calculate_profit", level="WARNING") as expected:
+            _baseline_qty_and_profit(self.trades)
+        with self.assertLogs("trading_analytics.journal.core.vectorized_profit", level="WARNING") as logs:
+            calculate_qty_and_profit_vectorized(self.trades)
+
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            [record.getMessage() for record in expected.records]
+        )
+        self.assertIn(f"Unexpected action {Action.SELL} for trade_id", "\n".join(logs.output))
+
+    def test_batch_input(self):
+        """Tests that a TradeBatch and a subset of it give the same results as entries."""
+        batch = TradeBatch.from_entries(self.trades)
+        subset = batch.take(np.arange(len(batch))[::-4])
+
+        with self.assertLogs("trading_analytics.journal.core.vectorized_profit", level="WARNING"):
+            self.assertEqual(calculate_qty_and_profit_vectorized(batch), calculate_qty_and_profit_vectorized(self.trades))
+        expected = _baseline_qty_and_profit(subset.to_entries())
+        with self.assertLogs("trading_analytics.journal.core.vectorized_profit", level="WARNING"):
+            results = calculate_qty_and_profit_vectorized(subset)
+        self.assertEqual(list(results), list(expected))
+        self.assertEqual(results, expected)
+
+    def test_calculate_qty_and_profit(self):
+        """Tests that calculate_qty_and_profit is the same calculation, with its warnings under its own logger."""
+        with self.assertLogs("trading_analytics.journal.core.calculate_profit", level="WARNING"):
+            self.assertEqual(calculate_qty_and_profit(self.trades), _baseline_qty_and_profit(self.trades))
+
+    def test_buy_in_matches_loop(self):
+        """Tests that the original and adjusted buy-in equal the per-trade loops exactly."""
+        expected_original = _baseline_original_buy_in(self.trades)
+        expected_adjusted = _baseline_adjusted_buy_in(self.trades)
+
+        with self.assertLogs("trading_analytics.journal.core.calculate_profit", level="WARNING"):
+            self.assertEqual(calculate_original_buy_in(self.trades), expected_original)
+            self.assertEqual(calculate_adjusted_buy_in(self.trades), expected_adjusted)
+
+    def test_no_trades(self):
+        """Tests that no trades give no results."""
+        self.assertEqual(calculate_qty_and_profit_vectorized([]), {})
+
+    def test_trade_effect(self):
+        """Tests the effect rule for a few known trades."""
+        bought_stock = trade_effect(SecurityType.STOCK, None, Action.BUY, SubAction.OPEN)
+        assigned_put = trade_effect(SecurityType.OPTION, OptionType.PUT, Action.OPTION_ASSIGNED, SubAction.CLOSE)
+        sold_put = trade_effect(SecurityType.OPTION, OptionType.PUT, Action.SELL, SubAction.OPEN)
+
+        self.assertEqual((bought_stock.stock_qty_per_unit, bought_stock.cash_sign), (1.0, -1.0))
+        self.assertEqual(assigned_put.stock_qty_per_unit, 100.0)
+        self.assertEqual(assigned_put.amount, "strike")
+        self.assertEqual(sold_put.warning, "action")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,683 @@
+# Imports
+import json
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+from datetime import (
+    date,
+    datetime,
+)
+
+import pandas as pd
+
+from trading_analytics.data.data_model.entry.dividend_entry import DividendEntry
+from trading_analytics.data.data_model.entry.option_entry import OptionEntry
+from trading_analytics.data.data_model.entry.stock_entry import StockEntry
+from trading_analytics.data.enum.option_type import OptionType
+from trading_analytics.data.enum.security_type import SecurityType
+from trading_analytics.data.enum.sub_action import SubAction
+from trading_analytics.data.enum.trade_action import Action
+from trading_analytics.journal.core.calculate_profit import calculate_qty_and_profit
+from trading_analytics.utilities.csv.incremental_loader import IncrementalTradeLoader
+from trading_analytics.utilities.csv.load_trades import (
+    iter_trade_chunks_from_excel,
+    iter_trades_from_excel,
+    load_trade_batch_from_excel,
+    load_trades_from_csv,
+    load_trades_from_excel,
+    load_trades_from_json,
+)
+from trading_analytics.utilities.csv import load_trades
+from trading_analytics.utilities.csv.trade_cache import (
+    cache_path_for,
+    default_cache_dir,
+)
+from trading_analytics.utilities.csv.trade_frame import parse_trade_frame
+
+# Loads with the default cache settings write their cache files here
+_cache_dir = None
+_cache_environment = None
+
+
+def setUpModule():
+    """Point the default trade cache directory at a temporary directory."""
+    global _cache_dir, _cache_environment
+    _cache_dir = tempfile.TemporaryDirectory()
+    _cache_environment = mock.patch.dict(os.environ, {"TRADING_ANALYTICS_CACHE_DIR": _cache_dir.name})
+    _cache_environment.start()
+
+
+def tearDownModule():
+    """Restore the environment and remove the cache directory."""
+    _cache_environment.stop()
+    _cache_dir.cleanup()
+
+
+def _journal_rows() -> list:
+    """Rows of a small trade journal with one row of each security type and two invalid rows."""
+    common = {
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "price_per_share": None,
+        "dividend_amount": None,
+        "expiration_date": None,
+        "strike": None,
+        "premium": None,
+        "option_type": None,
+    }
+    return [
+        {**common, "trade_id": 1, "strategy_id": 1, "strategy": "Basic Trade", "security_type": "STOCK",
+         "trade_date": datetime(2023, 10, 15), "symbol": "AAPL", "action": "BUY", "sub_action": "OPEN",
+         "quantity": 100, "fees": 5.0, "price_per_share": 150.0},
+        {**common, "trade_id": 2, "strategy_id": 2, "strategy": "dividend", "security_type": "DIVIDEND",
+         "trade_date": datetime(2023, 10, 16), "symbol": "AAPL", "action": "DIVIDEND", "sub_action": "DIVIDEND",
+         "quantity": 100, "fees": 0.0, "dividend_amount": 0.5},
+        {**common, "trade_id": 3, "strategy_id": 3, "strategy": "Covered Call, Wheel", "security_type": "OPTION",
+         "trade_date": datetime(2023, 10, 17), "symbol": "AAPL", "action": "SELL", "sub_action": "OPEN",
+         "quantity": 1, "fees": 1.0, "expiration_date": datetime(2023, 11, 17), "strike": 150.0, "premium": 2.0,
+         "option_type": "call"},
+        # Invalid: negative quantity
+        {**common, "trade_id": 4, "strategy_id": 4, "strategy": "basic trade", "security_type": "STOCK",
+         "trade_date": datetime(2023, 10, 18), "symbol": "MSFT", "action": "BUY", "sub_action": "OPEN",
+         "quantity": -5, "fees": 1.0, "price_per_share": 300.0},
+        # Invalid: expiration before trade date
+        {**common, "trade_id": 5, "strategy_id": 5, "strategy": "basic option", "security_type": "OPTION",
+         "trade_date": datetime(2023, 10, 19), "symbol": "MSFT", "action": "BUY", "sub_action": "OPEN",
+         "quantity": 2, "fees": 2.0, "expiration_date": datetime(2023, 10, 1), "strike": 300.0, "premium": 3.0,
+         "option_type": "PUT"},
+    ]
+
+
+_baseline_logger = logging.getLogger("baseline_load_trades")
+
+
+def _baseline_load_trades_from_excel(file_path: str) -> list:
+    """Frozen copy of the original row-by-row loader, the reference for the logged errors."""
+    df = pd.read_excel(file_path)
+
+    trades = []
+    for _, row in df.iterrows():
+        try:
+            common_fields = {
+                "trade_id": int(str(row["trade_id"])),
+                "strategy_id": int(str(row["strategy_id"])),
+                "brokerage": str(row["brokerage"]),
+                "account": str(row["account"]),
+                "strategy": str(row["strategy"]),
+                "security": SecurityType(row["security_type"]),
+                "trade_date": pd.to_datetime(row["trade_date"]).date(),
+                "symbol": str(row["symbol"]),
+                "action": Action(row["action"]),
+                "sub_action": SubAction(row["sub_action"]),
+                "quantity": float(str(row["quantity"])),
+                "fees": float(str(row["fees"])),
+            }
+        except (KeyError, ValueError, TypeError) as e:
+            _baseline_logger.error(f"Failed to parse row for (trade_id={row.get('trade_id', 'unknown')}): {e}")
+            raise e
+
+        try:
+            if common_fields['security'] in [SecurityType.STOCK, SecurityType.ETF]:
+                trade = StockEntry(
+                    **common_fields,
+                    price_per_share=float(row.get("price_per_share", 0.0))
+                )
+            elif common_fields['security'] == SecurityType.DIVIDEND:
+                trade = DividendEntry(
+                    **common_fields,
+                    dividend_amount=float(row.get("dividend_amount", 0.0))
+                )
+            elif common_fields['security'] == SecurityType.OPTION:
+                try:
+                    trade = OptionEntry(
+                        **common_fields,
+                        expiration_date=pd.to_datetime(row["expiration_date"]).date() if not pd.isna(row.get("expiration_date")) else None,
+                        strike=float(row.get("strike", 0.0)),
+                        premium=float(row.get("premium", 0.0)),
+                        option_type=OptionType[row["option_type"].upper()] if row.get("option_type") else None
+                    )
+                except Exception as e:
+                    raise ValueError(f"Failed to parse row for (trade_id={row.get('trade_id')}): {e}")
+            else:
+                _baseline_logger.error(f"Invalid security type for (trade_id={row['trade_id']}): {common_fields['security']}")
+                continue
+
+            trades.append(trade)
+
+        except (KeyError, ValueError, TypeError) as e:
+            _baseline_logger.error(f"Error creating trade entry for (trade_id={row['trade_id']}): {e}")
+            continue
+
+    return trades
+
+
+def _bad_rows() -> list:
+    """Journal rows with many kinds of invalid rows, and a valid row the column checks alone would reject."""
+    rows = _journal_rows()
+    template_stock, template_option = rows[0], rows[2]
+    bad = [
+        {**template_stock, "trade_id": 6, "account": "123"},
+        {**template_stock, "trade_id": 7, "fees": -1.0, "strategy_id": 0},
+        {**template_stock, "trade_id": 8, "price_per_share": "abc"},
+        {**template_stock, "trade_id": 9, "action": "DIVIDEND"},
+        {**template_option, "trade_id": 10, "option_type": "STRADDLE"},
+        {**template_option, "trade_id": 11, "option_type": None},
+        {**template_option, "trade_id": 12, "premium": -2.0, "strike": -1.0},
+        {**template_option, "trade_id": 13, "expiration_date": None},
+        # float() accepts underscores, pd.to_numeric doesn't
+        {**template_stock, "trade_id": 14, "quantity": "1_000"},
+    ]
+    return rows + bad
+
+
+class TestLoadTradesFromExcel(unittest.TestCase):
+    """Unit tests for loading trades from an Excel journal.
+
+    Test Cases:
+        valid rows become StockEntry, DividendEntry, and OptionEntry objects with normalized fields
+        loading into a TradeBatch gives the same trades
+        rows failing entry validation are logged and skipped
+        logged errors and loaded trades match the original row-by-row loader
+        rows with unparsable common fields raise, with the original error
+    """
+    def setUp(self):
+        """Create a temporary directory for the journal."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "trades.xlsx")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_valid_rows(self):
+        """Tests that each valid row is converted into the matching entry type."""
+        pd.DataFrame(_journal_rows()).to_excel(self.file_path, index=False)
+
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR") as logs:
+            trades = load_trades_from_excel(self.file_path)
+
+        self.assertEqual([trade.trade_id for trade in trades], [1, 2, 3])
+        self.assertIsInstance(trades[0], StockEntry)
+        self.assertIsInstance(trades[1], DividendEntry)
+        self.assertIsInstance(trades[2], OptionEntry)
+
+        self.assertEqual(trades[0].brokerage, "ETRADE")
+        self.assertEqual(trades[0].strategy, ["basic trade"])
+        self.assertEqual(trades[0].security, SecurityType.STOCK)
+        self.assertEqual(trades[0].trade_date, date(2023, 10, 15))
+        self.assertEqual(trades[0].action, Action.BUY)
+        self.assertEqual(trades[0].price_per_share, 150.0)
+        self.assertEqual(trades[1].dividend_amount, 0.5)
+        self.assertEqual(trades[2].strategy, ["covered call", "wheel"])
+        self.assertEqual(trades[2].option_type, OptionType.CALL)
+        self.assertEqual(trades[2].expiration_date, date(2023, 11, 17))
+
+        # The invalid rows are reported once each
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("trade_id=4", logs.output[0])
+        self.assertIn("trade_id=5", logs.output[1])
+
+    def test_entries_match_validated_models(self):
+        """Tests that loaded entries equal the same trades built through full validation."""
+        pd.DataFrame(_journal_rows()[:3]).to_excel(self.file_path, index=False)
+
+        trades = load_trades_from_excel(self.file_path)
+        expected = StockEntry(
+            trade_id=1,
+            strategy_id=1,
+            brokerage='etrade',
+            account="TEST1234",
+            strategy="Basic Trade",
+            security=SecurityType.STOCK,
+            trade_date=date(2023, 10, 15),
+            symbol="AAPL",
+            action=Action.BUY,
+            sub_action="OPEN",
+            quantity=100,
+            fees=5.0,
+            price_per_share=150.0
+        )
+
+        self.assertEqual(trades[0].model_dump(), expected.model_dump())
+
+    def test_batch_matches_entries(self):
+        """Tests that loading into a TradeBatch gives the same trades as loading entries."""
+        pd.DataFrame(_journal_rows()).to_excel(self.file_path, index=False)
+
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            trades = load_trades_from_excel(self.file_path, use_cache=False)
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            batch = load_trade_batch_from_excel(self.file_path, use_cache=False)
+
+        self.assertEqual(batch.to_entries(), trades)
+
+    def test_errors_match_row_loader(self):
+        """Tests that the logged errors and loaded trades match the original row-by-row loader."""
+        pd.DataFrame(_bad_rows()).to_excel(self.file_path, index=False)
+
+        with self.assertLogs("baseline_load_trades", level="ERROR") as expected_logs:
+            expected = _baseline_load_trades_from_excel(self.file_path)
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR") as logs:
+            trades = load_trades_from_excel(self.file_path, use_cache=False)
+
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            [record.getMessage() for record in expected_logs.records]
+        )
+        self.assertEqual([trade.model_dump() for trade in trades], [trade.model_dump() for trade in expected])
+        self.assertEqual(trades[-1].quantity, 1000.0)
+
+    def test_unparsable_row_matches_row_loader(self):
+        """Tests that an unparsable row raises and logs the original error, after the errors before it."""
+        rows = _bad_rows()
+        rows.insert(7, {**rows[0], "trade_id": 20, "trade_date": "not a date"})
+        pd.DataFrame(rows).to_excel(self.file_path, index=False)
+
+        with self.assertLogs("baseline_load_trades", level="ERROR") as expected_logs:
+            with self.assertRaises(ValueError) as expected_error:
+                _baseline_load_trades_from_excel(self.file_path)
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR") as logs:
+            with self.assertRaises(ValueError) as error:
+                load_trades_from_excel(self.file_path, use_cache=False)
+
+        self.assertEqual(str(error.exception), str(expected_error.exception))
+        self.assertEqual(
+            [record.getMessage() for record in logs.records],
+            [record.getMessage() for record in expected_logs.records]
+        )
+
+    def test_unparsable_row_raises(self):
+        """Tests that an invalid action stops the load."""
+        rows = _journal_rows()
+        rows[1]["action"] = "BOUGHT"
+        pd.DataFrame(rows).to_excel(self.file_path, index=False)
+
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            with self.assertRaises(ValueError):
+                load_trades_from_excel(self.file_path)
+
+
+class TestStreamTradesFromExcel(unittest.TestCase):
+    """Unit tests for streaming trades from an Excel journal in chunks.
+
+    Test Cases:
+        streamed trades equal the trades loaded at once
+        chunks never hold more than chunk_size trades
+        invalid chunk size raises
+        streamed trades can be passed straight to calculate_qty_and_profit
+    """
+    def setUp(self):
+        """Create a temporary journal."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "trades.xlsx")
+        pd.DataFrame(_journal_rows()).to_excel(self.file_path, index=False)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_stream_matches_load(self):
+        """Tests that streaming yields the same trades as loading the whole file."""
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            expected = load_trades_from_excel(self.file_path)
+            streamed = list(iter_trades_from_excel(self.file_path, chunk_size=2))
+
+        self.assertEqual(
+            [trade.model_dump() for trade in streamed],
+            [trade.model_dump() for trade in expected]
+        )
+
+    def test_chunk_size(self):
+        """Tests that rows are read in chunks of at most chunk_size."""
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            chunks = list(iter_trade_chunks_from_excel(self.file_path, chunk_size=2))
+
+        # 5 rows -> 3 chunks, the invalid rows 4 and 5 are dropped from the last two
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1, 0])
+
+    def test_invalid_chunk_size(self):
+        """Tests that a non-positive chunk size raises a ValueError."""
+        with self.assertRaises(ValueError):
+            next(iter_trade_chunks_from_excel(self.file_path, chunk_size=0))
+
+    def test_stream_into_calculate_qty_and_profit(self):
+        """Tests that calculate_qty_and_profit takes the stream, also across engine chunks, like a list."""
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            expected = calculate_qty_and_profit(load_trades_from_excel(self.file_path))
+            with mock.patch("trading_analytics.journal.core.portfolio_engine.STREAM_CHUNK_SIZE", 2):
+                streamed = calculate_qty_and_profit(iter_trades_from_excel(self.file_path, chunk_size=2))
+
+        self.assertEqual(list(streamed), ["AAPL"])
+        self.assertEqual(streamed, expected)
+
+
+class TestTradeCache(unittest.TestCase):
+    """Unit tests for the trade cache used by load_trades_from_excel.
+
+    Test Cases:
+        an unchanged journal is loaded from the cache without reading the workbook
+        row errors are logged again on a cached load
+        the cache is written to the cache directory, not next to the journal
+        journals with the same name in different folders get different cache files
+        the default cache directory comes from the environment or the user cache directory
+        editing the journal invalidates the cache
+        no cache file is written when caching is off
+    """
+    def setUp(self):
+        """Create a temporary journal."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "trades.xlsx")
+        pd.DataFrame(_journal_rows()).to_excel(self.file_path, index=False)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_cached_load(self):
+        """Tests that a second load comes from the cache and returns the same trades."""
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            expected = load_trades_from_excel(self.file_path)
+        self.assertTrue(os.path.exists(cache_path_for(self.file_path)))
+        self.assertEqual(os.listdir(self.temp_dir.name), ["trades.xlsx"])
+
+        with mock.patch(
+            "trading_analytics.utilities.csv.load_trades.pd.read_excel",
+            side_effect=AssertionError("workbook should not be read")
+        ):
+            with self.assertLogs("trading_analytics.utilities.csv.load_trades", level="ERROR") as logs:
+                cached = load_trades_from_excel(self.file_path)
+
+        self.assertEqual(
+            [trade.model_dump() for trade in cached],
+            [trade.model_dump() for trade in expected]
+        )
+        self.assertEqual([type(trade) for trade in cached], [type(trade) for trade in expected])
+        self.assertEqual(len(logs.output), 2)
+
+    def test_cache_paths(self):
+        """Tests that the cache file is named after the journal and its folder, in the cache directory."""
+        other_path = os.path.join(self.temp_dir.name, "other", "trades.xlsx")
+
+        self.assertEqual(os.path.dirname(cache_path_for(self.file_path)), _cache_dir.name)
+        self.assertTrue(os.path.basename(cache_path_for(self.file_path)).startswith("trades.xlsx."))
+        self.assertNotEqual(cache_path_for(self.file_path), cache_path_for(other_path))
+        self.assertEqual(os.path.dirname(cache_path_for(self.file_path, "custom")), "custom")
+
+    def test_default_cache_dir(self):
+        """Tests the cache directory from the environment and the user cache directory."""
+        self.assertEqual(default_cache_dir(), _cache_dir.name)
+
+        environment = {"TRADING_ANALYTICS_CACHE_DIR": "", "XDG_CACHE_HOME": "/xdg", "LOCALAPPDATA": "C:\\Local"}
+        with mock.patch.dict(os.environ, environment):
+            expected = "C:\\Local" if os.name == "nt" else "/xdg"
+            self.assertEqual(default_cache_dir(), os.path.join(expected, "trading_analytics"))
+
+    def test_edit_invalidates_cache(self):
+        """Tests that changing the journal is picked up on the next load."""
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            load_trades_from_excel(self.file_path)
+
+        pd.DataFrame(_journal_rows()[:2]).to_excel(self.file_path, index=False)
+        trades = load_trades_from_excel(self.file_path)
+
+        self.assertEqual([trade.trade_id for trade in trades], [1, 2])
+
+    def test_cache_disabled(self):
+        """Tests that no cache file is written when caching is off."""
+        with self.assertLogs("trading_analytics.utilities.csv.trade_frame", level="ERROR"):
+            load_trades_from_excel(self.file_path, use_cache=False)
+
+        self.assertFalse(os.path.exists(cache_path_for(self.file_path)))
+
+
+class TestLoadTradesFromCsv(unittest.TestCase):
+    """Unit tests for loading trades from several CSV exports.
+
+    Test Cases:
+        trades from all files are merged in trade_date/trade_id order
+        parallel and serial loading give the same trades
+        row errors from every file are logged
+        no matching file raises
+    """
+    def setUp(self):
+        """Split the journal rows across CSV files, newest rows first."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rows = _journal_rows()
+        for index, file_rows in enumerate([rows[3:], rows[1:3], rows[:1]]):
+            pd.DataFrame(file_rows).to_csv(os.path.join(self.temp_dir.name, f"export_{index}.csv"), index=False)
+        self.pattern = os.path.join(self.temp_dir.name, "*.csv")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_merged_order(self):
+        """Tests that trades are merged in trade_date/trade_id order with the right entry types."""
+        with self.assertLogs("trading_analytics.utilities.csv.load_trades", level="ERROR") as logs:
+            trades = load_trades_from_csv(self.pattern, max_workers=2)
+
+        self.assertEqual([trade.trade_id for trade in trades], [1, 2, 3])
+        self.assertEqual([type(trade) for trade in trades], [StockEntry, DividendEntry, OptionEntry])
+        self.assertEqual(trades[0].account, "TEST1234")
+        self.assertEqual(trades[2].expiration_date, date(2023, 11, 17))
+        self.assertEqual(len(logs.output), 2)
+
+    def test_parallel_matches_serial(self):
+        """Tests that worker processes give the same trades as parsing in this process."""
+        with self.assertLogs("trading_analytics.utilities.csv.load_trades", level="ERROR"):
+            serial = load_trades_from_csv(self.pattern, max_workers=1)
+            parallel = load_trades_from_csv(self.pattern, max_workers=2)
+
+        self.assertEqual(
+            [trade.model_dump() for trade in parallel],
+            [trade.model_dump() for trade in serial]
+        )
+
+    def test_no_files(self):
+        """Tests that a pattern without matches raises a FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            load_trades_from_csv(os.path.join(self.temp_dir.name, "*.txt"))
+
+
+def _json_records() -> list:
+    """Trade records with the entry field names, as in a JSON export."""
+    common = {
+        "strategy_id": 1,
+        "brokerage": "etrade",
+        "account": "TEST1234",
+        "strategy": "Basic Trade",
+        "trade_date": "2023-10-15",
+        "symbol": "AAPL",
+        "fees": 1.0,
+    }
+    return [
+        {**common, "trade_id": 1, "security": "STOCK", "action": "BUY", "sub_action": "OPEN", "quantity": 100,
+         "price_per_share": 150.0},
+        {**common, "trade_id": 2, "security": "DIVIDEND", "action": "DIVIDEND", "sub_action": "DIVIDEND",
+         "quantity": 100, "dividend_amount": 0.5},
+        {**common, "trade_id": 3, "security": "OPTION", "action": "SELL", "sub_action": "OPEN", "quantity": 1,
+         "expiration_date": "2023-11-17", "strike": 150.0, "premium": 2.0, "option_type": "call"},
+        # Invalid: negative quantity
+        {**common, "trade_id": 4, "security": "STOCK", "action": "BUY", "sub_action": "OPEN", "quantity": -5,
+         "price_per_share": 300.0},
+        # Invalid: unknown security type
+        {**common, "trade_id": 5, "security": "BOND", "action": "BUY", "sub_action": "OPEN", "quantity": 1},
+    ]
+
+
+class TestLoadTradesFromJson(unittest.TestCase):
+    """Unit tests for loading trades from a JSON export.
+
+    Test Cases:
+        valid records are validated in one call into the entry type of their security
+        invalid records are logged and skipped, the rest are validated in a second call
+        a file that doesn't hold a list of records raises
+    """
+    def setUp(self):
+        """Create a temporary directory for the JSON files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "trades.json")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def _write(
+        self,
+        records: object
+    ) -> None:
+        """Writes records to the JSON file."""
+        with open(self.file_path, "w", encoding="utf-8") as file:
+            json.dump(records, file)
+
+    def test_one_call(self):
+        """Tests that valid records are validated in one call into the entry type of their security."""
+        self._write(_json_records()[:3])
+
+        with mock.patch.object(
+            load_trades, "validate_trade_records", wraps=load_trades.validate_trade_records
+        ) as validate:
+            trades = load_trades_from_json(self.file_path)
+
+        self.assertEqual(validate.call_count, 1)
+        self.assertEqual([type(trade) for trade in trades], [StockEntry, DividendEntry, OptionEntry])
+        self.assertEqual(trades[0].brokerage, "ETRADE")
+        self.assertEqual(trades[0].strategy, ["basic trade"])
+        self.assertEqual(trades[2].option_type, OptionType.CALL)
+        self.assertEqual(trades[2].expiration_date, date(2023, 11, 17))
+
+    def test_invalid_records(self):
+        """Tests that invalid records are logged and skipped."""
+        self._write(_json_records())
+
+        with self.assertLogs("trading_analytics.utilities.csv.load_trades", level="ERROR") as logs:
+            trades = load_trades_from_json(self.file_path)
+
+        self.assertEqual([trade.trade_id for trade in trades], [1, 2, 3])
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("trade_id=4", logs.output[0])
+        self.assertIn("quantity", logs.output[0])
+        self.assertIn("trade_id=5", logs.output[1])
+
+    def test_not_a_list(self):
+        """Tests that a file that doesn't hold a list of records raises a ValueError."""
+        self._write({"trade_id": 1})
+
+        with self.assertRaises(ValueError):
+            load_trades_from_json(self.file_path)
+
+
+class TestIncrementalTradeLoader(unittest.TestCase):
+    """Unit tests for incremental loading of an append-only journal.
+
+    Test Cases:
+        first refresh loads everything
+        appended rows are the only new trades
+        editing an earlier row forces a full reload
+        appending rows with an older trade_id forces a full reload
+        appending a row that changes how pandas would type a column keeps appending
+        the journal is streamed rather than read into pandas
+        a full reload logs a single reason
+    """
+    def setUp(self):
+        """Create a temporary journal with the first three rows."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "trades.xlsx")
+        self.rows = _journal_rows()
+        pd.DataFrame(self.rows[:3]).to_excel(self.file_path, index=False)
+        self.loader = IncrementalTradeLoader(self.file_path)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def test_first_refresh(self):
+        """Tests that the first refresh is a full load."""
+        result = self.loader.refresh()
+
+        self.assertTrue(result.full_reload)
+        self.assertEqual([trade.trade_id for trade in result.new_trades], [1, 2, 3])
+        self.assertEqual(self.loader.row_count, 3)
+        self.assertEqual(self.loader.last_trade_id, 3)
+
+    def test_append(self):
+        """Tests that only appended rows are parsed and returned."""
+        self.loader.refresh()
+        new_row = {**self.rows[0], "trade_id": 6, "quantity": 10}
+        pd.DataFrame(self.rows[:3] + [new_row]).to_excel(self.file_path, index=False)
+
+        with mock.patch(
+            "trading_analytics.utilities.csv.incremental_loader.parse_trade_frame",
+            wraps=parse_trade_frame
+        ) as parse:
+            result = self.loader.refresh()
+
+        self.assertFalse(result.full_reload)
+        self.assertEqual([trade.trade_id for trade in result.new_trades], [6])
+        self.assertEqual(len(parse.call_args.args[0]), 1)
+        self.assertEqual([trade.trade_id for trade in self.loader.trades], [1, 2, 3, 6])
+        self.assertEqual(self.loader.last_trade_id, 6)
+
+    def test_edit_forces_reload(self):
+        """Tests that changing an ingested row reloads the whole journal."""
+        self.loader.refresh()
+        edited = [dict(row) for row in self.rows[:3]]
+        edited[0]["quantity"] = 50
+        pd.DataFrame(edited).to_excel(self.file_path, index=False)
+
+        result = self.loader.refresh()
+
+        self.assertTrue(result.full_reload)
+        self.assertEqual(len(result.new_trades), 3)
+        self.assertEqual(self.loader.trades[0].quantity, 50)
+
+    def test_older_trade_id_forces_reload(self):
+        """Tests that appended rows with a trade_id not after the last one reload the journal."""
+        self.loader.refresh()
+        new_row = {**self.rows[0], "trade_id": 2}
+        pd.DataFrame(self.rows[:3] + [new_row]).to_excel(self.file_path, index=False)
+
+        result = self.loader.refresh()
+
+        self.assertTrue(result.full_reload)
+        self.assertEqual([trade.trade_id for trade in self.loader.trades], [1, 2, 3, 2])
+
+    def test_append_changing_column_type(self):
+        """Tests that a fractional fee after whole-number fees doesn't look like an edit."""
+        self.loader.refresh()
+        new_row = {**self.rows[0], "trade_id": 6, "fees": 0.65}
+        pd.DataFrame(self.rows[:3] + [new_row]).to_excel(self.file_path, index=False)
+
+        result = self.loader.refresh()
+
+        self.assertFalse(result.full_reload)
+        self.assertEqual([trade.fees for trade in result.new_trades], [0.65])
+
+    def test_append_does_not_read_with_pandas(self):
+        """Tests that a refresh streams the workbook instead of reading it into a DataFrame."""
+        self.loader.refresh()
+        new_row = {**self.rows[0], "trade_id": 6}
+        pd.DataFrame(self.rows[:3] + [new_row]).to_excel(self.file_path, index=False)
+
+        with mock.patch("pandas.read_excel", side_effect=AssertionError("read_excel called")):
+            result = self.loader.refresh()
+
+        self.assertEqual([trade.trade_id for trade in result.new_trades], [6])
+
+    def test_reload_logs_one_reason(self):
+        """Tests that a fallback to a full reload is logged once, with its reason."""
+        self.loader.refresh()
+        new_row = {**self.rows[0], "trade_id": 2}
+        pd.DataFrame(self.rows[:3] + [new_row]).to_excel(self.file_path, index=False)
+
+        with self.assertLogs("trading_analytics.utilities.csv.incremental_loader", level="INFO") as logs:
+            self.loader.refresh()
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("not newer than trade_id 3", logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()